@@ -1,78 +1,174 @@
 from __future__ import annotations
 
-from typing import Optional
+import json
+from typing import AsyncIterator, Optional, Tuple
 
-from fastapi import APIRouter, File, Form, HTTPException, UploadFile, status
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 
 from app.core.config import get_settings
 from app.core.logging import get_logger
 from app.schemas.chat import ChatResponse
+from app.schemas.errors import ErrorBody, ErrorResponse
 from app.services.multimodal_chat import multimodal_chat_service
+from app.utils.uploads import (
+    FilePartLimits,
+    InvalidMultipart,
+    SpooledUpload,
+    UnsupportedUploadType,
+    UploadTooLarge,
+    read_multipart,
+)
 
 logger = get_logger(__name__)
 settings = get_settings()
 
 router = APIRouter(tags=["chat"])
 
+# The form is parsed from the request stream (see `_read_form`), so describe it here.
+_CHAT_FORM_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {
+                        "text": {"type": "string"},
+                        "audio": {"type": "string", "format": "binary"},
+                        "image": {"type": "string", "format": "binary"},
+                    },
+                }
+            }
+        },
+    }
+}
 
-@router.post("/chat", response_model=ChatResponse)
-async def chat(
-    text: Optional[str] = Form(default=None),
-    audio: Optional[UploadFile] = File(default=None),
-    image: Optional[UploadFile] = File(default=None),
-) -> ChatResponse:
+
+async def _read_form(request: Request) -> Tuple[Optional[str], Optional[SpooledUpload], Optional[SpooledUpload]]:
+    """Text, audio and image from the multipart body, each part capped as it streams in."""
+    content_type = request.headers.get("content-type", "")
+    if not content_type.startswith("multipart/"):
+        # Text-only clients may still post a urlencoded form.
+        form = await request.form() if content_type.startswith("application/x-www-form-urlencoded") else {}
+        text = form.get("text")
+        return (text if isinstance(text, str) and text else None), None, None
+    try:
+        fields, parts = await read_multipart(
+            content_type,
+            request.stream(),
+            files={
+                "audio": FilePartLimits(settings.max_audio_bytes, settings.allowed_audio_content_types_list),
+                "image": FilePartLimits(settings.max_image_bytes, settings.allowed_image_content_types_list),
+            },
+            max_field_bytes=settings.upload_form_overhead_bytes,
+            memory_limit=settings.upload_spool_memory_bytes,
+        )
+    except UnsupportedUploadType as exc:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Unsupported {exc.field} content type.",
+        )
+    except UploadTooLarge as exc:
+        kind = "file" if exc.field in ("audio", "image") else "field"
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"{exc.field.capitalize()} {kind} too large.",
+        )
+    except InvalidMultipart as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Malformed form body: {exc}")
+    return fields.get("text") or None, parts.get("audio"), parts.get("image")
+
+
+def _close_parts(*parts: Optional[SpooledUpload]) -> None:
+    for part in parts:
+        if part is not None:
+            part.close()
+
+
+def _require_input(text: Optional[str], audio: Optional[SpooledUpload], image: Optional[SpooledUpload]) -> None:
     if text is None and audio is None and image is None:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="At least one of text, audio, or image must be provided.",
         )
 
-    audio_bytes = None
-    audio_filename = None
-    audio_content_type = None
-    if audio is not None:
-        if audio.content_type and audio.content_type not in settings.allowed_audio_content_types_list:
-            raise HTTPException(
-                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
-                detail="Unsupported audio content type.",
-            )
-        audio_bytes = await audio.read()
-        if len(audio_bytes) > settings.max_audio_bytes:
-            raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail="Audio file too large.",
-            )
-        audio_filename = audio.filename or "audio"
-        audio_content_type = audio.content_type or "application/octet-stream"
-
-    image_bytes = None
-    image_filename = None
-    if image is not None:
-        if image.content_type and image.content_type not in settings.allowed_image_content_types_list:
-            raise HTTPException(
-                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
-                detail="Unsupported image content type.",
-            )
-        image_bytes = await image.read()
-        if len(image_bytes) > settings.max_image_bytes:
-            raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail="Image file too large.",
-            )
-        image_filename = image.filename or "image"
+
+def _sse(event: str, data: str) -> bytes:
+    return f"event: {event}\ndata: {data}\n\n".encode("utf-8")
+
+
+@router.post("/chat", response_model=ChatResponse, openapi_extra=_CHAT_FORM_OPENAPI)
+async def chat(request: Request) -> ChatResponse:
+    text, audio_part, image_part = await _read_form(request)
+    try:
+        _require_input(text, audio_part, image_part)
+    except HTTPException:
+        _close_parts(audio_part, image_part)
+        raise
 
     logger.info(
         "Chat request received",
         has_text=bool(text),
-        has_audio=audio is not None,
-        has_image=image is not None,
+        has_audio=audio_part is not None,
+        has_image=image_part is not None,
     )
 
-    return await multimodal_chat_service.chat(
-        text=text,
-        audio_bytes=audio_bytes,
-        audio_filename=audio_filename,
-        audio_content_type=audio_content_type,
-        image_bytes=image_bytes,
-        image_filename=image_filename,
+    try:
+        return await multimodal_chat_service.chat(text=text, audio=audio_part, image=image_part)
+    finally:
+        _close_parts(audio_part, image_part)
+
+
+@router.post("/chat/stream", openapi_extra=_CHAT_FORM_OPENAPI)
+async def chat_stream(request: Request) -> StreamingResponse:
+    """Server-Sent Events variant of `/chat`.
+
+    Emits `start` immediately, `token` events with `{"text": ...}` fragments of
+    the answer, and a terminal `done` event carrying the full `ChatResponse`.
+    """
+    text, audio_part, image_part = await _read_form(request)
+    try:
+        _require_input(text, audio_part, image_part)
+    except HTTPException:
+        _close_parts(audio_part, image_part)
+        raise
+
+    logger.info(
+        "Chat stream request received",
+        has_text=bool(text),
+        has_audio=audio_part is not None,
+        has_image=image_part is not None,
+    )
+    request_id = getattr(request.state, "request_id", None)
+
+    async def events() -> AsyncIterator[bytes]:
+        yield _sse("start", json.dumps({"request_id": request_id}))
+        try:
+            async for item in multimodal_chat_service.chat_stream(text=text, audio=audio_part, image=image_part):
+                if isinstance(item, ChatResponse):
+                    yield _sse("done", item.model_dump_json())
+                else:
+                    yield _sse("token", json.dumps({"text": item}, ensure_ascii=False))
+        except Exception as exc:
+            logger.exception("Chat stream failed", exc_info=exc, request_id=request_id)
+            payload = ErrorResponse(
+                error=ErrorBody(
+                    code="INTERNAL_ERROR",
+                    message="Internal server error",
+                    details=None,
+                    request_id=request_id,
+                )
+            )
+            yield _sse("error", payload.model_dump_json())
+        finally:
+            _close_parts(audio_part, image_part)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Covers clients that disconnect before the stream body is iterated.
+        background=BackgroundTask(_close_parts, audio_part, image_part),
     )
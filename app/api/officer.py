@@ -1,18 +1,204 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import hashlib
+import json
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Sequence, Tuple
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, TypeAdapter
 
 from app.api.dependencies.auth import require_role
+from app.core.config import get_settings
 from app.schemas.auth import UserRole
-from app.schemas.officer import EscalationRecord, OfficerVerifiedAdviceRequest
-from app.services.escalation_store import EscalationNotFound, escalation_store
+from app.schemas.officer import EscalationRecord, EscalationSummary, OfficerVerifiedAdviceRequest
+from app.services.escalation_events import EscalationEvent, FeedSignal, escalation_events
+from app.services.escalation_store import (
+    EscalationFilter,
+    EscalationNotFound,
+    EscalationTooLarge,
+    InvalidCursor,
+    escalation_store,
+)
+from app.services.verified_answers import verified_answer_index
+from app.utils.ttl_cache import TTLCache
+
+settings = get_settings()
 
 router = APIRouter(prefix="/officer", tags=["officer"])
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Rendered listing pages: (body, next cursor) keyed by store version and query.
+# Older versions are never requested again and age out through LRU.
+_pages: TTLCache[Tuple[Any, ...], Tuple[bytes, Optional[str]]] = TTLCache(
+    ttl_seconds=float(settings.chat_cache_ttl_seconds),
+    max_items=settings.escalation_response_cache_max_items,
+    lru=True,
+    max_bytes=settings.escalation_response_cache_max_bytes,
+    sizeof=lambda page: len(page[0]),
+)
+_not_modified = 0
+_records_adapter = TypeAdapter(list[EscalationRecord])
+_summaries_adapter = TypeAdapter(list[EscalationSummary])
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # Timestamps are stored in UTC; a bound without an offset is read as UTC too.
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
+def _filters(
+    verified: Optional[bool] = Query(default=None, description="Only verified (true) or pending (false) cases"),
+    since: Optional[datetime] = Query(default=None, description="Created at or after (ISO 8601; UTC if no offset)"),
+    until: Optional[datetime] = Query(default=None, description="Created before (ISO 8601; UTC if no offset)"),
+    language: Optional[str] = Query(default=None, description="Detected text or audio language"),
+    has_image: Optional[bool] = Query(default=None),
+) -> EscalationFilter:
+    return EscalationFilter(
+        verified=verified, since=_as_utc(since), until=_as_utc(until), language=language, has_image=has_image
+    )
+
+
+def _limit(
+    limit: Optional[int] = Query(default=None, ge=1, le=settings.escalation_list_max_items),
+) -> int:
+    return limit or settings.escalation_list_max_items
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # Weak comparison, as required for If-None-Match.
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+async def _conditional_page(
+    request: Request,
+    query: Tuple[Any, ...],
+    render: Callable[[], Tuple[Sequence[BaseModel], Optional[str]]],
+    adapter: TypeAdapter[Any],
+) -> Response:
+    """Serve a listing page with an ETag derived from the store version.
+
+    The version is read before the page is rendered, so a concurrent write can
+    only make the body newer than its tag, never older. The tag depends only on
+    the version and the query, so a matching `If-None-Match` is answered before
+    the page is looked up or rendered. Store reads run through
+    `escalation_store.run`, off the event loop for SQLite.
+    """
+    global _not_modified
+    version = await escalation_store.run(escalation_store.version)
+    digest = hashlib.sha1(repr(query).encode()).hexdigest()[:16]
+    headers: Dict[str, str] = {"ETag": f'"{version}-{digest}"', "Cache-Control": "private, no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        _not_modified += 1
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    key = (version, *query)
+    page = _pages.get(key)
+    if page is None:
+        try:
+            items, next_cursor = await escalation_store.run(render)
+        except InvalidCursor:
+            raise _invalid_cursor()
+        page = (adapter.dump_json(items), next_cursor)
+        _pages.set(key, page)
+    body, next_cursor = page
+    if next_cursor:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def listing_cache_stats() -> Dict[str, Any]:
+    return {**_pages.stats(), "not_modified": _not_modified}
+
 
 @router.get("/escalations", response_model=list[EscalationRecord])
-async def list_escalations(_user=Depends(require_role(UserRole.OFFICER))) -> list[EscalationRecord]:
-    return escalation_store.list_all()
+async def list_escalations(
+    request: Request,
+    filters: EscalationFilter = Depends(_filters),
+    limit: int = Depends(_limit),
+    cursor: Optional[str] = Query(default=None),
+    _user=Depends(require_role(UserRole.OFFICER)),
+) -> Response:
+    """Full escalation records, newest first.
+
+    The body stays a plain list; when more results exist the cursor for the
+    next page is returned in the `X-Next-Cursor` header. Responses carry an
+    `ETag`; a matching `If-None-Match` gets 304 Not Modified.
+    """
+    return await _conditional_page(
+        request,
+        ("records", filters, limit, cursor),
+        lambda: escalation_store.list_page(filters, limit=limit, cursor=cursor),
+        _records_adapter,
+    )
+
+
+@router.get("/escalations/summary", response_model=list[EscalationSummary])
+async def list_escalation_summaries(
+    request: Request,
+    filters: EscalationFilter = Depends(_filters),
+    limit: int = Query(default=settings.escalation_page_default_size, ge=1, le=settings.escalation_list_max_items),
+    cursor: Optional[str] = Query(default=None),
+    _user=Depends(require_role(UserRole.OFFICER)),
+) -> Response:
+    """Lightweight escalation listing without the request context, newest first (same caching)."""
+    return await _conditional_page(
+        request,
+        ("summaries", filters, limit, cursor),
+        lambda: escalation_store.list_summaries(filters, limit=limit, cursor=cursor),
+        _summaries_adapter,
+    )
+
+
+async def _sse(last_event_id: Optional[str]) -> AsyncIterator[str]:
+    yield "retry: 3000\n\n"
+    async for item in escalation_events.stream(last_event_id):
+        if isinstance(item, EscalationEvent):
+            data = item.escalation.model_dump_json()
+            yield f"id: {item.event_id}\nevent: {item.type}\ndata: {data}\n\n"
+        elif item is FeedSignal.RESET:
+            yield f"event: reset\ndata: {json.dumps({})}\n\n"
+        else:
+            yield ": keep-alive\n\n"
+
+
+@router.get("/escalations/stream")
+async def stream_escalations(
+    last_event_id: Optional[str] = Header(default=None, alias="Last-Event-ID"),
+    resume: Optional[str] = Query(default=None, alias="last_event_id"),
+    _user=Depends(require_role(UserRole.OFFICER)),
+) -> StreamingResponse:
+    """Server-sent events with escalation changes (`escalation.created`, `escalation.verified`).
+
+    Each event carries an `EscalationSummary`. Reconnect with the last seen
+    event id (`Last-Event-ID` header or `last_event_id` query) to receive only
+    the changes since; a `reset` event means those are no longer available and
+    the listing should be reloaded.
+    """
+    return StreamingResponse(
+        _sse(last_event_id or resume),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/escalations/{id}", response_model=EscalationRecord)
+async def get_escalation(id: str, _user=Depends(require_role(UserRole.OFFICER))) -> EscalationRecord:
+    try:
+        return await escalation_store.run(escalation_store.get, id)
+    except EscalationNotFound:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Escalation not found")
 
 
 @router.post("/respond/{id}", response_model=EscalationRecord)
@@ -22,6 +208,14 @@ async def respond(
     _user=Depends(require_role(UserRole.OFFICER)),
 ) -> EscalationRecord:
     try:
-        return escalation_store.respond(id, response_text=payload.response_text, citations=payload.citations)
+        record = await escalation_store.run(escalation_store.respond, id, payload.response_text, payload.citations)
     except EscalationNotFound:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Escalation not found")
+    except EscalationTooLarge:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Verified response too large to store; the escalation is unchanged.",
+        )
+    # Farmers asking the same question next get this answer without Gemini.
+    verified_answer_index.add(record)
+    return record
@@ -0,0 +1,46 @@
+"""
+Runtime metrics endpoints
+"""
+from typing import Any, Dict
+
+from fastapi import APIRouter
+
+from app.api.officer import listing_cache_stats
+from app.core.logging import get_logger
+from app.services.audit_log import audit_log
+from app.services.escalation_events import escalation_events
+from app.services.escalation_store import escalation_store
+from app.services.gemini_client import gemini_client
+from app.services.image_detection import crop_disease_detector
+from app.services.image_pipeline import image_pipeline
+from app.services.multimodal_chat import multimodal_chat_service
+from app.services.state_backend import state_backend
+from app.services.transcription import audio_transcription_service
+
+logger = get_logger(__name__)
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics")
+async def metrics() -> Dict[str, Any]:
+    """
+    In-process runtime counters
+
+    Returns:
+        Dict: Cache and upstream counters grouped by component
+    """
+    return {
+        "audit_log": audit_log.stats(),
+        # Both read the state database with STATE_BACKEND=sqlite.
+        "chat": await state_backend.run(multimodal_chat_service.stats),
+        "escalations": {
+            **escalation_store.stats(),
+            "feed": escalation_events.stats(),
+            "listing_cache": listing_cache_stats(),
+        },
+        "gemini": gemini_client.stats(),
+        "image_detection": {**crop_disease_detector.stats(), "pipeline": image_pipeline.stats()},
+        "state": await state_backend.run(state_backend.stats),
+        "transcription": audio_transcription_service.stats(),
+    }
@@ -1,6 +1,10 @@
 """
 FastAPI application factory and middleware
 """
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -10,18 +14,48 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 from app.api import api_router
 from app.api.auth import router as auth_router
 from app.api.chat import router as chat_router
-from app.api.officer import router as officer_router
+from app.api.officer import NEXT_CURSOR_HEADER, router as officer_router
 from app.core.config import get_settings
 from app.core.logging import get_logger
 from app.core.logging import setup_logging
-from app.middleware.rate_limit import InMemoryRateLimitMiddleware
+from app.middleware.body_limit import RequestBodyLimitMiddleware
+from app.middleware.rate_limit import RateLimitMiddleware
 from app.middleware.request_context import RequestContextMiddleware
 from app.schemas.errors import ErrorBody, ErrorResponse
+from app.services.audit_log import audit_log
+from app.services.escalation_store import escalation_store
+from app.services.http_clients import upstream_clients
+from app.services.image_detection import crop_disease_detector
+from app.services.image_pipeline import image_pipeline
+from app.services.transcription import audio_transcription_service
+from app.services.verified_answers import verified_answer_index
 
 logger = get_logger(__name__)
 settings = get_settings()
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Application startup and shutdown"""
+    setup_logging()
+    logger.info("Application startup")
+    await upstream_clients.start()
+    await audio_transcription_service.start()
+    await crop_disease_detector.start()
+    await verified_answer_index.start()
+    try:
+        yield
+    finally:
+        await verified_answer_index.aclose()
+        await crop_disease_detector.aclose()
+        await image_pipeline.aclose()
+        await audio_transcription_service.aclose()
+        await upstream_clients.aclose()
+        await asyncio.to_thread(audit_log.close)
+        await asyncio.to_thread(escalation_store.close)
+        logger.info("Application shutdown")
+
+
 def create_application() -> FastAPI:
     """Create and configure the FastAPI application"""
     app = FastAPI(
@@ -31,9 +65,11 @@ def create_application() -> FastAPI:
         docs_url="/api/docs",
         redoc_url="/api/redoc",
         openapi_url="/api/openapi.json",
+        lifespan=lifespan,
     )
 
-    app.add_middleware(InMemoryRateLimitMiddleware)
+    app.add_middleware(RequestBodyLimitMiddleware)
+    app.add_middleware(RateLimitMiddleware)
     app.add_middleware(RequestContextMiddleware)
 
     # Canonical versioned API
@@ -54,6 +90,7 @@ def create_application() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
     )
 
     # Add exception handlers
@@ -102,16 +139,6 @@ def create_application() -> FastAPI:
         ).model_dump()
         return JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content=payload)
 
-    # Add startup and shutdown event handlers
-    @app.on_event("startup")
-    async def startup_event() -> None:
-        setup_logging()
-        logger.info("Application startup")
-
-    @app.on_event("shutdown")
-    async def shutdown_event() -> None:
-        logger.info("Application shutdown")
-
     return app
 
 
@@ -2,7 +2,7 @@
 Application configuration settings using environment variables
 """
 from functools import lru_cache
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from pydantic import computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -24,20 +24,161 @@ class Settings(BaseSettings):
     # HTTP client
     http_timeout_seconds: float = 30.0
     http_retries: int = 2
+    http2_enabled: bool = True
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry_seconds: float = 60.0
+    http_prewarm_enabled: bool = True
+    http_prewarm_timeout_seconds: float = 5.0
 
     # Gemini
     gemini_api_key: Optional[str] = None
     gemini_base_url: str = "https://generativelanguage.googleapis.com/v1beta"
     gemini_model: str = "gemini-1.5-flash"
+    gemini_single_flight_enabled: bool = True
+    gemini_latency_window: int = 200
+
+    # Gemini circuit breaker and hedging
+    gemini_breaker_enabled: bool = True
+    gemini_breaker_window_size: int = 20
+    gemini_breaker_min_calls: int = 10
+    gemini_breaker_failure_ratio: float = 0.5
+    gemini_breaker_slow_call_seconds: float = 10.0
+    gemini_breaker_open_seconds: float = 30.0
+    gemini_hedge_enabled: bool = False
+    gemini_hedge_percentile: float = 0.95
+    gemini_hedge_min_samples: int = 20
+    gemini_hedge_min_delay_seconds: float = 0.5
 
     # Bhashini
     bhashini_base_url: Optional[str] = None
     bhashini_api_key: Optional[str] = None
 
-    # In-memory cache
+    # Transcription provider policy: "sequential" (Whisper only after Bhashini fails)
+    # or "race" (start Whisper when Bhashini exceeds its learned latency percentile)
+    transcription_policy: Literal["sequential", "race"] = "sequential"
+    transcription_race_percentile: float = 0.9
+    transcription_race_min_samples: int = 20
+    transcription_race_latency_window: int = 200
+    transcription_race_default_delay_seconds: float = 8.0
+    transcription_race_min_delay_seconds: float = 1.0
+
+    # Crop disease detector (ONNX Runtime on CPU; stub predictions when no model is set)
+    detector_model_path: Optional[str] = None
+    detector_labels_path: Optional[str] = None
+    detector_input_size: int = 224
+    detector_intra_op_threads: int = 0
+    detector_workers: int = 1
+    detector_batch_max_size: int = 16
+    detector_batch_max_wait_ms: int = 10
+    detector_top_k: int = 3
+    image_pipeline_workers: int = 2
+
+    # Near-duplicate prediction cache: perceptual hash ("dhash" or "phash") of the
+    # decoded image, matched within a Hamming distance
+    image_prediction_cache_enabled: bool = True
+    image_prediction_cache_algorithm: Literal["dhash", "phash"] = "dhash"
+    image_prediction_cache_max_distance: int = 6
+    image_prediction_cache_ttl_seconds: int = 3600
+    image_prediction_cache_max_items: int = 10000
+
+    # Local Whisper fallback (process pool, one resident model per worker)
+    whisper_enabled: bool = True
+    whisper_model: str = "base"
+    whisper_workers: int = 1
+    whisper_preload: bool = True
+    whisper_batch_enabled: bool = True
+    whisper_batch_max_size: int = 8
+    whisper_batch_max_wait_ms: int = 20
+
+    # Audio normalization before transcription (mono, 16 kHz, energy-VAD silence trim)
+    audio_normalization_enabled: bool = True
+    audio_vad_frame_ms: int = 30
+    audio_vad_padding_ms: int = 200
+    audio_vad_threshold_db: float = 12.0
+
+    # Long-audio chunking (split at silence, chunks transcribed concurrently)
+    audio_chunking_enabled: bool = True
+    audio_chunk_min_seconds: float = 15.0
+    audio_chunk_max_seconds: float = 28.0
+    audio_chunk_concurrency: int = 4
+
+    # Transcript cache (content-addressed by audio hash; optional disk persistence)
+    transcript_cache_enabled: bool = True
+    transcript_cache_ttl_seconds: int = 86400
+    transcript_cache_max_items: int = 10000
+    transcript_cache_dir: Optional[str] = None
+
+    # In-memory escalation cache (memory backend; budget is estimated bytes)
     chat_cache_ttl_seconds: int = 900
+    escalation_cache_max_bytes: int = 64 * 1024 * 1024
+
+    # Audit log of served advice: gzip JSONL files per process, written in
+    # batches off the request path and rotated by uncompressed size or age
+    audit_log_enabled: bool = True
+    audit_log_dir: str = "data/audit"
+    audit_log_queue_size: int = 10000
+    audit_log_batch_size: int = 256
+    audit_log_flush_interval_ms: int = 1000
+    audit_log_rotate_bytes: int = 64 * 1024 * 1024
+    audit_log_rotate_seconds: int = 24 * 3600
 
-    # Rate limiting (in-memory)
+    # Escalation store: "sqlite" (durable, WAL) or "memory" (TTL cache above)
+    escalation_store_backend: Literal["sqlite", "memory"] = "sqlite"
+    escalation_db_path: str = "data/escalations.db"
+    escalation_sqlite_batch_size: int = 256
+    escalation_sqlite_batch_wait_ms: int = 5
+    # Failed batch writes stay pending and are retried with exponential backoff
+    escalation_sqlite_retry_max_seconds: float = 5.0
+    escalation_sqlite_close_timeout_seconds: float = 30.0
+    escalation_list_max_items: int = 1000
+    escalation_page_default_size: int = 50
+    escalation_summary_preview_chars: int = 280
+    # Serialized listing bodies, keyed by store version and query (served with ETags)
+    escalation_response_cache_max_items: int = 256
+    escalation_response_cache_max_bytes: int = 16 * 1024 * 1024
+
+    # Officer escalation feed (server-sent events)
+    escalation_feed_buffer_size: int = 1000
+    escalation_feed_queue_size: int = 64
+    escalation_feed_heartbeat_seconds: float = 15.0
+
+    # Chat pipeline (per-stage budgets before calling Gemini)
+    chat_transcription_timeout_seconds: float = 60.0
+    chat_image_detection_timeout_seconds: float = 15.0
+    # Prompt Gemini once this many transcript characters are available (0 = wait for all)
+    chat_early_prompt_transcript_chars: int = 0
+
+    # Chat answer cache (read-through, keyed by canonical input fingerprint)
+    chat_answer_cache_enabled: bool = True
+    chat_answer_cache_ttl_seconds: int = 600
+    chat_answer_cache_max_items: int = 5000
+    chat_answer_cache_max_bytes: int = 32 * 1024 * 1024
+    # Photos whose best label is below this are keyed by their bytes, not by label
+    chat_answer_cache_min_image_confidence: float = 0.5
+
+    # Shared state for rate limits and the answer cache: "memory" (per worker
+    # process) or "sqlite" (one file shared by every worker on the host)
+    state_backend: Literal["memory", "sqlite"] = "memory"
+    state_db_path: str = "data/state.db"
+    # How long a state write waits for another worker's lock before failing
+    # open (the request is allowed, the cache lookup misses)
+    state_db_busy_timeout_ms: int = 200
+
+    # Officer-verified answer reuse: MinHash LSH over verified questions (text
+    # only; questions with an image always go to Gemini). A match also needs the
+    # same content words in the same order.
+    verified_answers_enabled: bool = True
+    verified_answers_min_similarity: float = 0.95
+    # How often each worker picks up answers verified through other workers
+    verified_answers_refresh_seconds: float = 10.0
+    verified_answers_min_question_chars: int = 12
+    verified_answers_max_items: int = 100_000
+    verified_answers_num_perm: int = 64
+    verified_answers_bands: int = 16
+    verified_answers_shingle_size: int = 4
+
+    # Rate limiting (fixed window per client IP and path, kept in the state backend)
     rate_limit_enabled: bool = True
     rate_limit_window_seconds: int = 60
     rate_limit_requests: int = 60
@@ -47,6 +188,8 @@ class Settings(BaseSettings):
     max_image_bytes: int = 10 * 1024 * 1024
     allowed_audio_content_types: str = "audio/wav,audio/x-wav,audio/mpeg,audio/mp3,audio/webm,application/octet-stream"
     allowed_image_content_types: str = "image/jpeg,image/png,image/webp"
+    upload_spool_memory_bytes: int = 256 * 1024
+    upload_form_overhead_bytes: int = 64 * 1024
 
     # Auth (JWT)
     jwt_secret_key: Optional[str] = None
@@ -73,6 +216,11 @@ class Settings(BaseSettings):
             return ["*"]
         return [s.strip() for s in raw.split(",") if s.strip()]
 
+    @computed_field
+    @property
+    def max_request_body_bytes(self) -> int:
+        return self.max_audio_bytes + self.max_image_bytes + self.upload_form_overhead_bytes
+
     @computed_field
     @property
     def allowed_audio_content_types_list(self) -> List[str]:
@@ -83,3 +83,14 @@ def setup_logging() -> None:
 def get_logger(name: Optional[str] = None) -> structlog.stdlib.BoundLogger:
     """Get a logger instance"""
     return structlog.get_logger(name or __name__)
+
+
+def get_thread_logger(name: Optional[str] = None) -> structlog.stdlib.BoundLogger:
+    """Get a synchronous logger for code running outside the event loop.
+
+    The default wrapper is `AsyncBoundLogger`, whose methods return coroutines
+    that nothing awaits on a background thread, so those events are lost.
+    """
+    return structlog.wrap_logger(
+        None, wrapper_class=structlog.stdlib.BoundLogger, logger_factory_args=(name or __name__,)
+    )
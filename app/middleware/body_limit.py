@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from fastapi import HTTPException, status
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_settings
+from app.schemas.errors import ErrorBody, ErrorResponse
+
+settings = get_settings()
+
+
+class RequestBodyLimitMiddleware:
+    """Reject oversized request bodies before they are buffered.
+
+    A declared Content-Length over the limit is refused without reading the
+    body; otherwise the body stream is counted as it is received and parsing
+    is aborted with 413 as soon as the limit is crossed.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limit = settings.max_request_body_bytes
+        declared = dict(scope.get("headers") or []).get(b"content-length")
+        if declared is not None and declared.isdigit() and int(declared) > limit:
+            request_id = (scope.get("state") or {}).get("request_id")
+            payload = ErrorResponse(
+                error=ErrorBody(
+                    code="HTTP_ERROR",
+                    message="Request body too large.",
+                    details={"limit_bytes": limit},
+                    request_id=request_id,
+                )
+            ).model_dump()
+            response = JSONResponse(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, content=payload)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Re-raised by FastAPI's body parsing and rendered by the HTTP error handler.
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail="Request body too large.",
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
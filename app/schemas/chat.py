@@ -21,6 +21,7 @@ class AudioTranscriptionResult(BaseModel):
     transcript: str
     provider: Literal["bhashini", "whisper", "unavailable"]
     language: Optional[str] = None
+    partial: bool = False
 
 
 class ChatResponse(BaseModel):
@@ -5,7 +5,7 @@ from typing import Any, Optional
 
 from pydantic import BaseModel, Field
 
-from app.schemas.chat import ChatResponse
+from app.schemas.chat import ChatConfidence, ChatResponse
 
 
 class EscalationRecord(BaseModel):
@@ -16,6 +16,22 @@ class EscalationRecord(BaseModel):
     verified_response: Optional[ChatResponse] = None
 
 
+class EscalationSummary(BaseModel):
+    """List projection of an escalation without the bulky request context."""
+
+    id: str
+    created_at: datetime
+    verified: bool
+    language: Optional[str] = None
+    has_image: bool = False
+    query_preview: str = ""
+    query_truncated: bool = False
+    image_filename: Optional[str] = None
+    ai_response_text: str = ""
+    confidence: Optional[ChatConfidence] = None
+    reason: Optional[str] = None
+
+
 class OfficerVerifiedAdviceRequest(BaseModel):
     response_text: str = Field(..., min_length=1)
     citations: list[Any] = Field(default_factory=list)
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import shutil
+import subprocess
+import wave
+from dataclasses import dataclass
+from typing import BinaryIO, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.utils.uploads import SpooledUpload
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+TARGET_SAMPLE_RATE = 16000
+
+# Hann-windowed sinc taps for the anti-aliasing low-pass applied before downsampling.
+_LOWPASS_TAPS = 63
+
+
+@dataclass(frozen=True)
+class NormalizedAudio:
+    """16 kHz mono int16 PCM plus what was removed to get there."""
+
+    samples: np.ndarray
+    sample_rate: int
+    original_seconds: float
+
+    @property
+    def duration_seconds(self) -> float:
+        return len(self.samples) / float(self.sample_rate)
+
+    def to_wav_bytes(self) -> bytes:
+        return encode_wav(self.samples, self.sample_rate)
+
+
+class AudioNormalizer:
+    """Decode, downmix to mono, resample to 16 kHz and trim leading/trailing silence.
+
+    PCM WAV is decoded with the stdlib; other containers (WebM, MP3, ...) go
+    through ffmpeg pipes when it is installed. Returns None when the input
+    cannot be decoded, in which case callers should send the original bytes.
+    """
+
+    def __init__(self) -> None:
+        self._ffmpeg = shutil.which("ffmpeg")
+
+    async def normalize_upload(self, audio: SpooledUpload) -> Optional[NormalizedAudio]:
+        return await asyncio.to_thread(self._normalize_upload_sync, audio)
+
+    def normalize(self, stream: BinaryIO) -> Optional[NormalizedAudio]:
+        decoded = self._decode(stream)
+        if decoded is None:
+            return None
+        samples, sample_rate = decoded
+        original_seconds = samples.shape[0] / float(sample_rate)
+
+        mono = samples.mean(axis=1) if samples.ndim == 2 else samples
+        mono = resample(mono, sample_rate, TARGET_SAMPLE_RATE)
+        mono = trim_silence(
+            mono,
+            TARGET_SAMPLE_RATE,
+            frame_ms=settings.audio_vad_frame_ms,
+            padding_ms=settings.audio_vad_padding_ms,
+            threshold_db=settings.audio_vad_threshold_db,
+        )
+        pcm = np.clip(np.round(mono * 32767.0), -32768, 32767).astype(np.int16)
+        return NormalizedAudio(samples=pcm, sample_rate=TARGET_SAMPLE_RATE, original_seconds=original_seconds)
+
+    def _normalize_upload_sync(self, audio: SpooledUpload) -> Optional[NormalizedAudio]:
+        try:
+            with audio.open() as stream:
+                return self.normalize(stream)
+        except Exception as exc:
+            logger.warning("Audio normalization failed", error=str(exc))
+            return None
+
+    def _decode(self, stream: BinaryIO) -> Optional[tuple[np.ndarray, int]]:
+        header = stream.read(12)
+        stream.seek(0)
+        if header[:4] == b"RIFF" and header[8:12] == b"WAVE":
+            try:
+                return _decode_wav(stream)
+            except (wave.Error, ValueError):
+                pass
+        if self._ffmpeg is None:
+            return None
+        return self._decode_ffmpeg(stream)
+
+    def _decode_ffmpeg(self, stream: BinaryIO) -> Optional[tuple[np.ndarray, int]]:
+        # ffmpeg downmixes and resamples itself; the NumPy stages become no-ops.
+        cmd = [
+            self._ffmpeg or "ffmpeg",
+            "-loglevel", "error",
+            "-i", "pipe:0",
+            "-f", "s16le",
+            "-ac", "1",
+            "-ar", str(TARGET_SAMPLE_RATE),
+            "pipe:1",
+        ]
+        try:
+            stream.fileno()
+        except (AttributeError, io.UnsupportedOperation):
+            proc = subprocess.run(cmd, input=stream.read(), capture_output=True)
+        else:
+            # Disk-spooled uploads are piped straight from the file descriptor.
+            proc = subprocess.run(cmd, stdin=stream, capture_output=True)
+        if proc.returncode != 0 or not proc.stdout:
+            return None
+        samples = np.frombuffer(proc.stdout, dtype="<i2").astype(np.float32) / 32768.0
+        return samples, TARGET_SAMPLE_RATE
+
+
+def encode_wav(samples: np.ndarray, sample_rate: int) -> bytes:
+    """Mono 16-bit PCM WAV container for int16 `samples`."""
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(samples.astype("<i2").tobytes())
+    return buf.getvalue()
+
+
+def _decode_wav(stream: BinaryIO) -> Optional[tuple[np.ndarray, int]]:
+    with wave.open(stream, "rb") as w:
+        channels = w.getnchannels()
+        width = w.getsampwidth()
+        sample_rate = w.getframerate()
+        raw = w.readframes(w.getnframes())
+
+    if width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif width == 2:
+        samples = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+    elif width == 3:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        ints = b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)
+        ints = np.where(ints & 0x800000, ints - 0x1000000, ints)
+        samples = ints.astype(np.float32) / 8388608.0
+    elif width == 4:
+        samples = np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648.0
+    else:
+        return None
+    return samples.reshape(-1, channels), sample_rate
+
+
+def resample(samples: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
+    """Band-limit then linearly interpolate onto the target sample grid."""
+    if source_rate == target_rate or samples.size == 0:
+        return samples.astype(np.float32, copy=False)
+
+    if target_rate < source_rate:
+        cutoff = 0.5 * target_rate / source_rate  # cycles/sample
+        n = np.arange(_LOWPASS_TAPS) - (_LOWPASS_TAPS - 1) / 2
+        taps = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hanning(_LOWPASS_TAPS)
+        samples = np.convolve(samples, taps / taps.sum(), mode="same")
+
+    duration = samples.size / float(source_rate)
+    out_len = int(round(duration * target_rate))
+    positions = np.arange(out_len) * (source_rate / float(target_rate))
+    return np.interp(positions, np.arange(samples.size), samples).astype(np.float32)
+
+
+def frame_energy_db(samples: np.ndarray, frame: int) -> np.ndarray:
+    """Per-frame RMS level in dBFS (vectorized over non-overlapping frames)."""
+    n_frames = samples.size // frame
+    if n_frames == 0:
+        return np.empty(0, dtype=np.float32)
+    frames = samples[: n_frames * frame].reshape(n_frames, frame)
+    rms = np.sqrt(np.mean(np.square(frames, dtype=np.float64), axis=1))
+    return (20.0 * np.log10(rms + 1e-10)).astype(np.float32)
+
+
+def speech_frames(energy_db: np.ndarray, threshold_db: float) -> np.ndarray:
+    """Energy VAD: frames `threshold_db` above the noise floor (and not far below the peak)."""
+    if energy_db.size == 0:
+        return np.zeros(0, dtype=bool)
+    noise_floor = float(np.percentile(energy_db, 10))
+    peak = float(energy_db.max())
+    threshold = max(noise_floor + threshold_db, peak - 45.0, -60.0)
+    return energy_db > threshold
+
+
+def trim_silence(
+    samples: np.ndarray,
+    sample_rate: int,
+    frame_ms: int = 30,
+    padding_ms: int = 200,
+    threshold_db: float = 12.0,
+) -> np.ndarray:
+    """Drop leading and trailing non-speech; a clip with no detected speech is returned as is."""
+    frame = max(1, sample_rate * frame_ms // 1000)
+    voiced = np.flatnonzero(speech_frames(frame_energy_db(samples, frame), threshold_db))
+    if voiced.size == 0:
+        return samples
+    pad = sample_rate * padding_ms // 1000
+    start = max(0, int(voiced[0]) * frame - pad)
+    end = min(samples.size, (int(voiced[-1]) + 1) * frame + pad)
+    return samples[start:end]
+
+
+def split_at_silence(
+    samples: np.ndarray,
+    sample_rate: int,
+    min_chunk_seconds: float,
+    max_chunk_seconds: float,
+    frame_ms: int = 30,
+) -> List[Tuple[int, int]]:
+    """Split into [start, end) sample spans no longer than `max_chunk_seconds`.
+
+    Each cut is placed at the quietest frame between `min_chunk_seconds` and
+    `max_chunk_seconds` after the previous cut, so words are not split.
+    """
+    total = int(samples.size)
+    max_len = int(max_chunk_seconds * sample_rate)
+    min_len = min(int(min_chunk_seconds * sample_rate), max_len)
+    if total <= max_len:
+        return [(0, total)]
+
+    frame = max(1, sample_rate * frame_ms // 1000)
+    energy = frame_energy_db(samples, frame)
+    spans: List[Tuple[int, int]] = []
+    start = 0
+    while total - start > max_len:
+        lo = (start + min_len) // frame
+        hi = (start + max_len) // frame
+        window = energy[lo:hi]
+        cut = start + max_len if window.size == 0 else (lo + int(np.argmin(window))) * frame + frame // 2
+        cut = min(max(cut, start + 1), start + max_len)
+        spans.append((start, cut))
+        start = cut
+    spans.append((start, total))
+    return spans
+
+
+audio_normalizer = AudioNormalizer()
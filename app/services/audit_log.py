@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional
+
+from app.core.config import get_settings
+from app.core.logging import get_logger, get_thread_logger
+from app.schemas.chat import ChatResponse
+
+logger = get_logger(__name__)
+thread_logger = get_thread_logger(__name__)
+settings = get_settings()
+
+
+class AuditLog:
+    """Append-only trail of served advice in rotated, gzip-compressed JSONL files.
+
+    `record` serializes the entry on the spot (so later changes to the request
+    context cannot leak in) and puts the line on a bounded queue; a background
+    thread compresses entries in batches of up to `AUDIT_LOG_BATCH_SIZE` (or whatever
+    arrived within `AUDIT_LOG_FLUSH_INTERVAL_MS`) and appends each batch as one
+    gzip member, so a file is readable up to the last flushed batch even after
+    a crash. When the queue is full new entries are dropped and counted rather
+    than slowing requests down. Each process writes its own files (the pid is
+    in the name), rotated by uncompressed size or age; `close` flushes
+    everything still queued.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self._directory = Path(directory)
+        self._queue: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=settings.audit_log_queue_size)
+        self._lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+        self._file: Optional[BinaryIO] = None
+        self._file_path: Optional[Path] = None
+        self._file_bytes = 0
+        self._file_opened_at = 0.0
+        self._recorded = 0
+        self._dropped = 0
+        self._written = 0
+        self._batches = 0
+        self._errors = 0
+        self._files = 0
+
+    @property
+    def enabled(self) -> bool:
+        return settings.audit_log_enabled
+
+    def record(self, context: Dict[str, Any], response: ChatResponse, cached: bool = False) -> None:
+        if not self.enabled:
+            return
+        try:
+            line = _serialize(datetime.now(timezone.utc), context, response, cached)
+        except (TypeError, ValueError) as exc:
+            with self._lock:
+                self._errors += 1
+            logger.warning("Audit log entry not serializable", error=str(exc))
+            return
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run_writer, name="audit-log-writer", daemon=True)
+                self._writer.start()
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+                dropped = self._dropped
+            if dropped == 1 or dropped % 1000 == 0:
+                logger.warning("Audit log queue full; dropping entries", dropped=dropped)
+            return
+        with self._lock:
+            self._recorded += 1
+
+    def close(self) -> None:
+        """Flush queued entries, close the current file and stop the writer thread."""
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._queue.put(None)
+            writer.join()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "directory": str(self._directory),
+                "queued": self._queue.qsize(),
+                "recorded": self._recorded,
+                "dropped": self._dropped,
+                "written": self._written,
+                "batches": self._batches,
+                "errors": self._errors,
+                "files": self._files,
+                "current_file": str(self._file_path) if self._file_path else None,
+            }
+
+    def _run_writer(self) -> None:
+        max_batch = max(1, settings.audit_log_batch_size)
+        max_wait = settings.audit_log_flush_interval_ms / 1000.0
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch = [first]
+            deadline = time.monotonic() + max_wait
+            while len(batch) < max_batch:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._write(batch)
+        self._close_file()
+
+    def _write(self, batch: List[bytes]) -> None:
+        payload = b"".join(batch)
+        written, errors = len(batch), 0
+        try:
+            fh = self._current_file(len(payload))
+            fh.write(gzip.compress(payload, compresslevel=6))
+            fh.flush()
+            self._file_bytes += len(payload)
+        except OSError as exc:
+            written, errors = 0, len(batch)
+            thread_logger.error("Audit log write failed", error=str(exc), size=len(batch))
+            self._close_file()
+        with self._lock:
+            self._batches += 1
+            self._written += written
+            self._errors += errors
+
+    def _current_file(self, incoming: int) -> BinaryIO:
+        now = time.monotonic()
+        if self._file is not None and (
+            self._file_bytes + incoming > settings.audit_log_rotate_bytes
+            or now - self._file_opened_at >= settings.audit_log_rotate_seconds
+        ):
+            self._close_file()
+        if self._file is None:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+            self._file_path = self._directory / f"audit-{stamp}-{os.getpid()}.jsonl.gz"
+            self._file = open(self._file_path, "ab")
+            self._file_bytes = 0
+            self._file_opened_at = now
+            with self._lock:
+                self._files += 1
+        return self._file
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError as exc:
+                thread_logger.error("Audit log close failed", error=str(exc))
+            self._file = None
+
+
+def _serialize(timestamp: datetime, context: Dict[str, Any], response: ChatResponse, cached: bool) -> bytes:
+    record = {
+        "timestamp": timestamp.isoformat(),
+        "cached": cached,
+        "request": context,
+        "response": response.model_dump(mode="json"),
+    }
+    return json.dumps(record, ensure_ascii=False, default=str).encode("utf-8") + b"\n"
+
+
+audit_log = AuditLog(settings.audit_log_dir)
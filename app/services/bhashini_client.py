@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import BinaryIO, Optional, Union
 
 import httpx
 
 from app.core.config import get_settings
 from app.core.logging import get_logger
+from app.services.http_clients import UpstreamClientsClosed, upstream_clients
 
 logger = get_logger(__name__)
 settings = get_settings()
@@ -25,18 +26,15 @@ class BhashiniClient:
     simple and expects a transcribe endpoint accepting multipart file upload.
     """
 
-    def __init__(self) -> None:
-        self._timeout = httpx.Timeout(settings.http_timeout_seconds)
-        self._retries = settings.http_retries
-        self._client = httpx.AsyncClient(
-            timeout=self._timeout,
-            transport=httpx.AsyncHTTPTransport(retries=self._retries),
-        )
-
-    async def aclose(self) -> None:
-        await self._client.aclose()
+    @property
+    def _client(self) -> httpx.AsyncClient:
+        try:
+            return upstream_clients.get("bhashini")
+        except UpstreamClientsClosed as exc:
+            raise BhashiniClientError("Bhashini client is shut down") from exc
 
-    async def transcribe(self, audio_bytes: bytes, filename: str, content_type: str) -> str:
+    async def transcribe(self, audio: Union[bytes, BinaryIO], filename: str, content_type: str) -> str:
+        """Transcribe `audio`; a file object is streamed into the upload in chunks."""
         if not settings.bhashini_base_url:
             raise BhashiniClientError("BHASHINI_BASE_URL is not configured")
 
@@ -45,7 +43,7 @@ class BhashiniClient:
         if settings.bhashini_api_key:
             headers["Authorization"] = f"Bearer {settings.bhashini_api_key}"
 
-        files = {"audio": (filename, audio_bytes, content_type)}
+        files = {"audio": (filename, audio, content_type)}
 
         try:
             resp = await self._client.post(url, files=files, headers=headers)
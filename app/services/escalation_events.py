@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import asyncio
+import enum
+import threading
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set, Union
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.schemas.officer import EscalationSummary
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+ESCALATION_CREATED = "escalation.created"
+ESCALATION_VERIFIED = "escalation.verified"
+
+
+class FeedSignal(str, enum.Enum):
+    HEARTBEAT = "heartbeat"
+    # The subscriber missed events that are no longer buffered and must reload.
+    RESET = "reset"
+
+
+@dataclass(frozen=True)
+class EscalationEvent:
+    seq: int
+    type: str
+    escalation: EscalationSummary
+    event_id: str
+
+
+FeedItem = Union[EscalationEvent, FeedSignal]
+
+
+class _Subscription:
+    def __init__(self, loop: asyncio.AbstractEventLoop, last_seq: int) -> None:
+        self.loop = loop
+        self.queue: "asyncio.Queue[EscalationEvent]" = asyncio.Queue(maxsize=settings.escalation_feed_queue_size)
+        self.last_seq = last_seq
+        self.lagged = False
+
+    def offer(self, event: EscalationEvent) -> bool:
+        """Runs on the subscriber's loop. Returns False when the queue overflowed."""
+        if self.lagged:
+            return True
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            # Drop the backlog; the consumer catches up from the shared buffer.
+            self.lagged = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            return False
+
+
+class EscalationBroadcaster:
+    """In-process fan-out of escalation changes to officer feeds.
+
+    Every event gets a sequence number and is kept in a ring buffer of the last
+    `ESCALATION_FEED_BUFFER_SIZE` events. Subscribers have small bounded
+    queues; one that falls behind has its queue dropped and is replayed from
+    the ring buffer instead, so a slow client never holds more than its queue
+    in memory. Reconnecting clients resume after their `Last-Event-ID`; if that
+    event has left the buffer (or the process restarted, which changes the
+    epoch in every id) they get a reset and reload.
+    """
+
+    def __init__(self) -> None:
+        self._epoch = uuid.uuid4().hex[:8]
+        self._seq = 0
+        self._buffer: Deque[EscalationEvent] = deque(maxlen=settings.escalation_feed_buffer_size)
+        self._subscribers: Set[_Subscription] = set()
+        self._lock = threading.Lock()
+        self._published = 0
+        self._overflows = 0
+        self._resets = 0
+
+    def publish(self, event_type: str, escalation: EscalationSummary) -> None:
+        """Thread-safe; delivery happens on each subscriber's event loop."""
+        with self._lock:
+            self._seq += 1
+            event = EscalationEvent(
+                seq=self._seq,
+                type=event_type,
+                escalation=escalation,
+                event_id=f"{self._epoch}-{self._seq}",
+            )
+            self._buffer.append(event)
+            self._published += 1
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(self._deliver, subscription, event)
+            except RuntimeError:
+                # The subscriber's loop is closed; its stream is gone.
+                self._unsubscribe(subscription)
+
+    async def stream(self, last_event_id: Optional[str] = None) -> AsyncIterator[FeedItem]:
+        """Events after `last_event_id` (or from now), with periodic heartbeats."""
+        subscription, replay = self._subscribe(last_event_id)
+        try:
+            if replay is None:
+                logger.info("Escalation feed resume point unavailable", last_event_id=last_event_id)
+                yield FeedSignal.RESET
+            else:
+                for event in replay:
+                    yield event
+            while True:
+                if subscription.lagged:
+                    subscription.lagged = False
+                    catch_up = self._after(subscription.last_seq)
+                    if catch_up is None:
+                        logger.info("Escalation feed subscriber fell behind the buffer", last_seq=subscription.last_seq)
+                        subscription.last_seq = self._seq
+                        yield FeedSignal.RESET
+                    else:
+                        for event in catch_up:
+                            subscription.last_seq = event.seq
+                            yield event
+                    continue
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.queue.get(), timeout=settings.escalation_feed_heartbeat_seconds
+                    )
+                except asyncio.TimeoutError:
+                    yield FeedSignal.HEARTBEAT
+                    continue
+                if event.seq <= subscription.last_seq:
+                    continue  # already delivered by a replay
+                subscription.last_seq = event.seq
+                yield event
+        finally:
+            self._unsubscribe(subscription)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "subscribers": len(self._subscribers),
+                "published": self._published,
+                "buffered": len(self._buffer),
+                "overflows": self._overflows,
+                "resets": self._resets,
+            }
+
+    def _subscribe(self, last_event_id: Optional[str]) -> "tuple[_Subscription, Optional[List[EscalationEvent]]]":
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            replay: Optional[List[EscalationEvent]] = []
+            if last_event_id:
+                replay = self._after_locked(self._parse(last_event_id))
+            if replay is None:
+                self._resets += 1
+            subscription = _Subscription(loop, last_seq=replay[-1].seq if replay else self._seq)
+            self._subscribers.add(subscription)
+        return subscription, replay
+
+    def _unsubscribe(self, subscription: _Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def _deliver(self, subscription: _Subscription, event: EscalationEvent) -> None:
+        if not subscription.offer(event):
+            with self._lock:
+                self._overflows += 1
+
+    def _after(self, seq: int) -> Optional[List[EscalationEvent]]:
+        with self._lock:
+            replay = self._after_locked(seq)
+            if replay is None:
+                self._resets += 1
+            return replay
+
+    def _after_locked(self, seq: Optional[int]) -> Optional[List[EscalationEvent]]:
+        """Buffered events after `seq`, or None if some of them were already dropped."""
+        if seq is None or seq > self._seq:
+            return None
+        oldest = self._buffer[0].seq if self._buffer else self._seq + 1
+        if seq < oldest - 1:
+            return None
+        return [event for event in self._buffer if event.seq > seq]
+
+    def _parse(self, event_id: str) -> Optional[int]:
+        epoch, _, seq = event_id.partition("-")
+        if epoch != self._epoch or not seq.isdigit():
+            return None
+        return int(seq)
+
+
+escalation_events = EscalationBroadcaster()
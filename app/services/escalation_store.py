@@ -1,45 +1,171 @@
 from __future__ import annotations
 
+import asyncio
+import base64
+import binascii
+import json
+import queue
+import sqlite3
+import threading
+import time
+import uuid
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from pathlib import Path
 from threading import RLock
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar, Union
 
+from app.core.config import get_settings
+from app.core.logging import get_thread_logger
 from app.schemas.chat import ChatConfidence, ChatResponse
-from app.schemas.officer import EscalationRecord
+from app.schemas.officer import EscalationRecord, EscalationSummary
+from app.services.escalation_events import ESCALATION_CREATED, ESCALATION_VERIFIED, escalation_events
 from app.utils.ttl_cache import TTLCache
-from app.core.config import get_settings
 
+# Only the SQLite writer thread logs.
+logger = get_thread_logger(__name__)
 settings = get_settings()
 
+ItemT = TypeVar("ItemT", EscalationRecord, EscalationSummary)
+T = TypeVar("T")
+Page = Tuple[List[ItemT], Optional[str]]
+
 
 @dataclass(frozen=True)
 class EscalationNotFound(Exception):
     escalation_id: str
 
 
+@dataclass(frozen=True)
+class EscalationTooLarge(Exception):
+    escalation_id: str
+    limit: int
+
+
+@dataclass(frozen=True)
+class InvalidCursor(Exception):
+    cursor: str
+
+
+@dataclass(frozen=True)
+class EscalationFilter:
+    """Listing filters; `None` means "any". `since` is inclusive, `until` exclusive."""
+
+    verified: Optional[bool] = None
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    language: Optional[str] = None
+    has_image: Optional[bool] = None
+
+    def matches(self, record: EscalationRecord) -> bool:
+        if self.verified is not None and (record.verified_response is not None) != self.verified:
+            return False
+        if self.since is not None and record.created_at < self.since:
+            return False
+        if self.until is not None and record.created_at >= self.until:
+            return False
+        if self.language is not None and _language(record) != self.language:
+            return False
+        if self.has_image is not None and (_image_filename(record) is not None) != self.has_image:
+            return False
+        return True
+
+
+# Pages are ordered newest first by (created_at, id); a cursor is the key of the
+# last item returned, so later inserts never shift the pages that follow.
+def encode_cursor(item: Union[EscalationRecord, EscalationSummary]) -> str:
+    raw = json.dumps([item.created_at.timestamp(), item.id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        created_at, escalation_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return float(created_at), str(escalation_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise InvalidCursor(cursor)
+
+
+def _sort_key(item: Union[EscalationRecord, EscalationSummary]) -> Tuple[float, str]:
+    return (item.created_at.timestamp(), item.id)
+
+
+def _inputs(record: EscalationRecord) -> Dict[str, Any]:
+    inputs = record.context.get("inputs")
+    return inputs if isinstance(inputs, dict) else {}
+
+
+def _language(record: EscalationRecord) -> Optional[str]:
+    inputs = _inputs(record)
+    return inputs.get("text_language") or inputs.get("audio_language")
+
+
+def _image_filename(record: EscalationRecord) -> Optional[str]:
+    return _inputs(record).get("image_filename") or None
+
+
+def summarize(record: EscalationRecord) -> EscalationSummary:
+    inputs = _inputs(record)
+    query = inputs.get("text") or inputs.get("audio_transcript") or ""
+    limit = settings.escalation_summary_preview_chars
+    return EscalationSummary(
+        id=record.id,
+        created_at=record.created_at,
+        verified=record.verified_response is not None,
+        language=_language(record),
+        has_image=_image_filename(record) is not None,
+        query_preview=query[:limit],
+        query_truncated=len(query) > limit,
+        image_filename=_image_filename(record),
+        ai_response_text=record.ai_response.response_text,
+        confidence=record.ai_response.confidence,
+        reason=record.ai_response.reason,
+    )
+
+
+def _paginate(
+    items: Sequence[ItemT],
+    limit: int,
+    after: Optional[Tuple[float, str]],
+    more: bool = False,
+) -> Page[ItemT]:
+    """Newest-first page of `items` strictly after `after`, with the next cursor if any remain."""
+    ordered = sorted(
+        (item for item in items if after is None or _sort_key(item) < after),
+        key=_sort_key,
+        reverse=True,
+    )
+    page = ordered[:limit]
+    more = more or len(ordered) > limit
+    return page, (encode_cursor(page[-1]) if more and page else None)
+
+
 class EscalationStore:
     """In-memory escalation store for officer review."""
 
     def __init__(self) -> None:
         self._lock = RLock()
+        self._epoch = uuid.uuid4().hex[:8]
         self._cache: TTLCache[str, Dict[str, Any]] = TTLCache(
             ttl_seconds=float(settings.chat_cache_ttl_seconds),
             max_items=1000,
+            max_bytes=settings.escalation_cache_max_bytes,
         )
 
     def add(self, escalation_id: str, context: Dict[str, Any], ai_response: ChatResponse) -> None:
+        item = {
+            "id": escalation_id,
+            "created_at": datetime.now(timezone.utc),
+            "context": context,
+            "ai_response": ai_response,
+            "verified_response": None,
+        }
         with self._lock:
-            self._cache.set(
-                escalation_id,
-                {
-                    "id": escalation_id,
-                    "created_at": datetime.now(timezone.utc),
-                    "context": context,
-                    "ai_response": ai_response,
-                    "verified_response": None,
-                },
-            )
+            stored = self._cache.set(escalation_id, item)
+        if not stored:
+            # Never drop an escalation silently; the caller tells the farmer.
+            raise EscalationTooLarge(escalation_id, settings.escalation_cache_max_bytes)
+        escalation_events.publish(ESCALATION_CREATED, summarize(EscalationRecord(**item)))
 
     def list_all(self) -> List[EscalationRecord]:
         with self._lock:
@@ -58,6 +184,19 @@ class EscalationStore:
         records.sort(key=lambda r: r.created_at, reverse=True)
         return records
 
+    def list_page(
+        self, filters: EscalationFilter, limit: int, cursor: Optional[str] = None
+    ) -> Page[EscalationRecord]:
+        after = decode_cursor(cursor) if cursor else None
+        records = [record for record in self.list_all() if filters.matches(record)]
+        return _paginate(records, limit, after)
+
+    def list_summaries(
+        self, filters: EscalationFilter, limit: int, cursor: Optional[str] = None
+    ) -> Page[EscalationSummary]:
+        records, next_cursor = self.list_page(filters, limit, cursor)
+        return [summarize(record) for record in records], next_cursor
+
     def get(self, escalation_id: str) -> EscalationRecord:
         item = self._cache.get(escalation_id)
         if not item:
@@ -85,13 +224,478 @@ class EscalationStore:
             audio_output_url="",
         )
 
+        # Build the verified item aside so the stored one survives a rejected write.
+        updated = dict(item)
         if isinstance(item.get("context"), dict) and original_ai is not None:
-            item["context"]["ai_response_original"] = getattr(original_ai, "model_dump", lambda: original_ai)()
+            updated["context"] = {
+                **item["context"],
+                "ai_response_original": getattr(original_ai, "model_dump", lambda: original_ai)(),
+            }
+
+        updated["ai_response"] = verified
+        updated["verified_response"] = verified
+        with self._lock:
+            if not self._cache.set(escalation_id, updated):
+                self._cache.set(escalation_id, item)
+                raise EscalationTooLarge(escalation_id, settings.escalation_cache_max_bytes)
+        record = self.get(escalation_id)
+        escalation_events.publish(ESCALATION_VERIFIED, summarize(record))
+        return record
+
+    def verification_cursor(self) -> int:
+        return 0
+
+    def verified_since(self, cursor: int, limit: int = 500) -> Tuple[List[EscalationRecord], int]:
+        """Nothing to catch up on: this store lives in one process, whose responses are seen directly."""
+        return [], cursor
+
+    def version(self) -> str:
+        """Changes whenever any listing could change (add, respond, expiry or eviction)."""
+        return f"{self._epoch}-{self._cache.version()}"
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Call a store operation from the event loop; the in-memory store never blocks."""
+        return fn(*args)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "memory", **self._cache.stats()}
+
+    def close(self) -> None:
+        pass
+
+
+# Every statement is idempotent, so opening an existing database is a no-op and
+# there is no migration step. Filter columns are denormalized out of `context`.
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS escalations (
+        id TEXT PRIMARY KEY,
+        created_at REAL NOT NULL,
+        verified INTEGER NOT NULL DEFAULT 0,
+        language TEXT,
+        has_image INTEGER NOT NULL DEFAULT 0,
+        context TEXT NOT NULL,
+        ai_response TEXT NOT NULL,
+        verified_response TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_escalations_created_at_id ON escalations (created_at DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_escalations_verified_created_at_id ON escalations (verified, created_at DESC, id DESC)",
+    # Bumped in every write transaction; shared by all processes using the file.
+    "CREATE TABLE IF NOT EXISTS escalation_meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+    "INSERT OR IGNORE INTO escalation_meta (name, value) VALUES ('version', 0)",
+    # One row per officer response, in commit order, so other processes can
+    # pick up new verified answers (see `verified_since`).
+    "CREATE TABLE IF NOT EXISTS escalation_verifications (seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT NOT NULL)",
+)
+
+_RETRY_INITIAL_SECONDS = 0.05
+
+_LOG_VERIFICATION = "INSERT INTO escalation_verifications (id) VALUES (?)"
+
+_BUMP_VERSION = "UPDATE escalation_meta SET value = value + 1 WHERE name = 'version'"
+
+_UPSERT = """
+    INSERT INTO escalations (id, created_at, verified, language, has_image, context, ai_response, verified_response)
+    VALUES (:id, :created_at, :verified, :language, :has_image, :context, :ai_response, :verified_response)
+    ON CONFLICT (id) DO UPDATE SET
+        verified = excluded.verified,
+        context = excluded.context,
+        ai_response = excluded.ai_response,
+        verified_response = excluded.verified_response
+"""
+
+_COLUMNS = "id, created_at, context, ai_response, verified_response"
+
+# Summary columns are pulled out of the JSON by SQLite, so listing never
+# deserializes full contexts in Python.
+_SUMMARY_COLUMNS = """
+    id, created_at, verified, language, has_image,
+    coalesce(nullif(json_extract(context, '$.inputs.text'), ''), json_extract(context, '$.inputs.audio_transcript'), ''),
+    json_extract(context, '$.inputs.image_filename'),
+    json_extract(ai_response, '$.response_text'),
+    json_extract(ai_response, '$.confidence'),
+    json_extract(ai_response, '$.reason')
+"""
+
+
+@dataclass(frozen=True, eq=False)
+class _Write:
+    record: EscalationRecord
+    verification: bool = False
+
+
+def _row_params(record: EscalationRecord) -> Dict[str, Any]:
+    return {
+        "id": record.id,
+        "created_at": record.created_at.timestamp(),
+        "verified": int(record.verified_response is not None),
+        "language": _language(record),
+        "has_image": int(_image_filename(record) is not None),
+        "context": json.dumps(record.context, ensure_ascii=False, default=str),
+        "ai_response": record.ai_response.model_dump_json(),
+        "verified_response": (
+            record.verified_response.model_dump_json() if record.verified_response is not None else None
+        ),
+    }
+
+
+def _record_from_row(row: Tuple[Any, ...]) -> EscalationRecord:
+    escalation_id, created_at, context, ai_response, verified_response = row
+    return EscalationRecord(
+        id=escalation_id,
+        created_at=datetime.fromtimestamp(created_at, tz=timezone.utc),
+        context=json.loads(context),
+        ai_response=ChatResponse.model_validate_json(ai_response),
+        verified_response=(
+            ChatResponse.model_validate_json(verified_response) if verified_response is not None else None
+        ),
+    )
+
+
+def _summary_from_row(row: Tuple[Any, ...]) -> EscalationSummary:
+    (escalation_id, created_at, verified, language, has_image, query, image_filename, text, confidence, reason) = row
+    limit = settings.escalation_summary_preview_chars
+    return EscalationSummary(
+        id=escalation_id,
+        created_at=datetime.fromtimestamp(created_at, tz=timezone.utc),
+        verified=bool(verified),
+        language=language,
+        has_image=bool(has_image),
+        query_preview=query[:limit],
+        query_truncated=len(query) > limit,
+        image_filename=image_filename or None,
+        ai_response_text=text or "",
+        confidence=confidence,
+        reason=reason,
+    )
+
+
+def _where(filters: EscalationFilter, after: Optional[Tuple[float, str]]) -> Tuple[str, List[Any]]:
+    clauses: List[str] = []
+    params: List[Any] = []
+    if filters.verified is not None:
+        clauses.append("verified = ?")
+        params.append(int(filters.verified))
+    if filters.since is not None:
+        clauses.append("created_at >= ?")
+        params.append(filters.since.timestamp())
+    if filters.until is not None:
+        clauses.append("created_at < ?")
+        params.append(filters.until.timestamp())
+    if filters.language is not None:
+        clauses.append("language = ?")
+        params.append(filters.language)
+    if filters.has_image is not None:
+        clauses.append("has_image = ?")
+        params.append(int(filters.has_image))
+    if after is not None:
+        clauses.append("(created_at, id) < (?, ?)")
+        params.extend(after)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+class SqliteEscalationStore:
+    """Durable escalation store on SQLite in WAL mode (stdlib only).
+
+    Writes are queued to a single writer thread that commits them in batches
+    of up to `ESCALATION_SQLITE_BATCH_SIZE`, so callers on the event loop never
+    wait on disk. Until its batch commits, a record is served from an
+    in-memory overlay, which gives read-your-writes. Reads use one connection
+    per thread; WAL lets them proceed while the writer commits. Listing is
+    an index range scan over `created_at`, capped at
+    `ESCALATION_LIST_MAX_ITEMS`, so its cost does not grow with the table.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._local = threading.local()
+        self._lock = threading.RLock()
+        self._pending: Dict[str, _Write] = {}
+        self._queue: "queue.Queue[Optional[_Write]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._epoch = uuid.uuid4().hex[:8]
+        self._version = 0
+        self._batches = 0
+        self._writes = 0
+        self._write_errors = 0
+        self._lost_writes = 0
+        self._close_deadline: Optional[float] = None
+
+    def add(self, escalation_id: str, context: Dict[str, Any], ai_response: ChatResponse) -> None:
+        record = EscalationRecord(
+            id=escalation_id,
+            created_at=datetime.now(timezone.utc),
+            context=context,
+            ai_response=ai_response,
+            verified_response=None,
+        )
+        self._enqueue(record)
+        escalation_events.publish(ESCALATION_CREATED, summarize(record))
+
+    def list_all(self) -> List[EscalationRecord]:
+        limit = settings.escalation_list_max_items
+        rows = self._read().execute(
+            f"SELECT {_COLUMNS} FROM escalations ORDER BY created_at DESC LIMIT ?", (limit,)
+        ).fetchall()
+        records = {record.id: record for record in map(_record_from_row, rows)}
+        with self._lock:
+            records.update((write.record.id, write.record) for write in self._pending.values())
+        return sorted(records.values(), key=lambda r: r.created_at, reverse=True)[:limit]
+
+    def list_page(
+        self, filters: EscalationFilter, limit: int, cursor: Optional[str] = None
+    ) -> Page[EscalationRecord]:
+        return self._query_page(_COLUMNS, _record_from_row, lambda record: record, filters, limit, cursor)
+
+    def list_summaries(
+        self, filters: EscalationFilter, limit: int, cursor: Optional[str] = None
+    ) -> Page[EscalationSummary]:
+        return self._query_page(_SUMMARY_COLUMNS, _summary_from_row, summarize, filters, limit, cursor)
+
+    def get(self, escalation_id: str) -> EscalationRecord:
+        with self._lock:
+            write = self._pending.get(escalation_id)
+        if write is not None:
+            return write.record
+        row = self._read().execute(f"SELECT {_COLUMNS} FROM escalations WHERE id = ?", (escalation_id,)).fetchone()
+        if row is None:
+            raise EscalationNotFound(escalation_id)
+        return _record_from_row(row)
+
+    def respond(self, escalation_id: str, response_text: str, citations: list[Any]) -> EscalationRecord:
+        record = self.get(escalation_id)
+        verified = ChatResponse(
+            response_text=response_text,
+            confidence=ChatConfidence.HIGH,
+            citations=citations,
+            escalate=False,
+            reason="Verified by officer",
+            audio_output_url="",
+        )
+
+        context = dict(record.context)
+        context["ai_response_original"] = record.ai_response.model_dump()
+        updated = record.model_copy(
+            update={"context": context, "ai_response": verified, "verified_response": verified}
+        )
+        self._enqueue(updated, verification=True)
+        escalation_events.publish(ESCALATION_VERIFIED, summarize(updated))
+        return updated
+
+    def verification_cursor(self) -> int:
+        """Position of the latest committed officer response, for `verified_since`."""
+        (seq,) = self._read().execute("SELECT coalesce(max(seq), 0) FROM escalation_verifications").fetchone()
+        return seq
+
+    def verified_since(self, cursor: int, limit: int = 500) -> Tuple[List[EscalationRecord], int]:
+        """Escalations verified after `cursor`, by any process, in commit order; and the new cursor."""
+        rows = self._read().execute(
+            """
+            SELECT v.seq, e.id, e.created_at, e.context, e.ai_response, e.verified_response
+            FROM escalation_verifications v JOIN escalations e ON e.id = v.id
+            WHERE v.seq > ? ORDER BY v.seq LIMIT ?
+            """,
+            (cursor, limit),
+        ).fetchall()
+        if not rows:
+            return [], cursor
+        return [_record_from_row(row[1:]) for row in rows], rows[-1][0]
+
+    def version(self) -> str:
+        """Changes whenever any listing could change.
+
+        With no local writes pending, listings depend only on the committed
+        table, so the shared committed version is used on its own and every
+        worker serving the file reports the same version for the same data.
+        Pending writes are visible to this process only, so they add a
+        process-local part.
+        """
+        with self._lock:
+            pending = bool(self._pending)
+            local = self._version
+        (committed,) = self._read().execute("SELECT value FROM escalation_meta WHERE name = 'version'").fetchone()
+        if not pending:
+            return str(committed)
+        return f"{committed}-{self._epoch}-{local}"
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Call a store operation from the event loop without blocking it on SQLite reads."""
+        return await asyncio.to_thread(fn, *args)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "backend": "sqlite",
+            "path": self._path,
+            "pending_writes": pending,
+            "writes": self._writes,
+            "batches": self._batches,
+            "avg_batch_size": (self._writes / self._batches) if self._batches else 0.0,
+            "write_errors": self._write_errors,
+            "lost_writes": self._lost_writes,
+        }
+
+    def close(self) -> None:
+        """Flush queued writes and stop the writer thread.
+
+        A batch that keeps failing is retried until
+        `ESCALATION_SQLITE_CLOSE_TIMEOUT_SECONDS` after close, then counted
+        under `lost_writes`.
+        """
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            self._close_deadline = time.monotonic() + settings.escalation_sqlite_close_timeout_seconds
+            self._queue.put(None)
+            writer.join()
+
+    def _query_page(
+        self,
+        columns: str,
+        from_row: Callable[[Tuple[Any, ...]], ItemT],
+        project: Callable[[EscalationRecord], ItemT],
+        filters: EscalationFilter,
+        limit: int,
+        cursor: Optional[str],
+    ) -> Page[ItemT]:
+        after = decode_cursor(cursor) if cursor else None
+        where, params = _where(filters, after)
+        rows = self._read().execute(
+            f"SELECT {columns} FROM escalations{where} ORDER BY created_at DESC, id DESC LIMIT ?",
+            (*params, limit + 1),
+        ).fetchall()
+        items = {item.id: item for item in map(from_row, rows)}
+        # Uncommitted writes supersede their rows (and may no longer match).
+        with self._lock:
+            pending = [write.record for write in self._pending.values()]
+        for record in pending:
+            items.pop(record.id, None)
+            if filters.matches(record):
+                items[record.id] = project(record)
+        return _paginate(list(items.values()), limit, after, more=len(rows) > limit)
+
+    def _enqueue(self, record: EscalationRecord, verification: bool = False) -> None:
+        write = _Write(record=record, verification=verification)
+        with self._lock:
+            self._pending[record.id] = write
+            self._version += 1
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run_writer, name="escalation-writer", daemon=True)
+                self._writer.start()
+        self._queue.put(write)
+
+    def _connect(self) -> sqlite3.Connection:
+        Path(self._path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self._path, timeout=30.0, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            conn.execute(statement)
+        conn.commit()
+        return conn
+
+    def _read(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def _run_writer(self) -> None:
+        conn: Optional[sqlite3.Connection] = None
+        max_batch = max(1, settings.escalation_sqlite_batch_size)
+        max_wait = settings.escalation_sqlite_batch_wait_ms / 1000.0
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch = [first]
+            deadline = time.monotonic() + max_wait
+            while len(batch) < max_batch:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            try:
+                conn = self._write(conn, batch)
+            except Exception:
+                # The writer must outlive any one batch, or nothing is persisted again.
+                logger.exception("Escalation writer failed on a batch", size=len(batch))
+        if conn is not None:
+            conn.close()
+
+    def _write(self, conn: Optional[sqlite3.Connection], batch: List[_Write]) -> Optional[sqlite3.Connection]:
+        try:
+            return self._commit(conn, batch)
+        except Exception:
+            # Not a database error (e.g. a record that does not serialize), so
+            # retrying the batch cannot help. Write its records one at a time
+            # so that only the offending ones are lost.
+            if len(batch) > 1:
+                for write in batch:
+                    conn = self._write(conn, [write])
+                return conn
+            self._write_errors += 1
+            self._lost_writes += 1
+            logger.exception("Escalation write failed; record lost", id=batch[0].record.id)
+            self._release(batch)
+            return conn
+
+    def _commit(self, conn: Optional[sqlite3.Connection], batch: List[_Write]) -> Optional[sqlite3.Connection]:
+        """Write `batch`, retrying with backoff; records stay in the overlay until written.
+
+        A farmer already holds the escalation id, so a failed write (e.g.
+        "database is locked" under contention between workers) is retried
+        rather than dropped.
+        """
+        delay = _RETRY_INITIAL_SECONDS
+        while True:
+            try:
+                if conn is None:
+                    conn = self._connect()
+                with conn:
+                    conn.executemany(_UPSERT, [_row_params(write.record) for write in batch])
+                    conn.executemany(_LOG_VERIFICATION, [(write.record.id,) for write in batch if write.verification])
+                    conn.execute(_BUMP_VERSION)
+                self._batches += 1
+                self._writes += len(batch)
+                break
+            except sqlite3.Error as exc:
+                self._write_errors += 1
+                deadline = self._close_deadline
+                if deadline is not None and time.monotonic() + delay > deadline:
+                    self._lost_writes += len(batch)
+                    logger.error(
+                        "Escalation batch write failed at shutdown; records lost",
+                        error=str(exc),
+                        ids=[write.record.id for write in batch],
+                    )
+                    break
+                logger.warning(
+                    "Escalation batch write failed; retrying", error=str(exc), size=len(batch), retry_in=delay
+                )
+                time.sleep(delay)
+                delay = min(delay * 2, settings.escalation_sqlite_retry_max_seconds)
+        self._release(batch)
+        return conn
+
+    def _release(self, batch: List[_Write]) -> None:
+        with self._lock:
+            for write in batch:
+                # A newer write for the same id keeps its overlay entry.
+                if self._pending.get(write.record.id) is write:
+                    del self._pending[write.record.id]
+
 
-        item["ai_response"] = verified
-        item["verified_response"] = verified
-        self._cache.set(escalation_id, item)
-        return self.get(escalation_id)
+def _create_store() -> Union[EscalationStore, SqliteEscalationStore]:
+    if settings.escalation_store_backend == "sqlite":
+        return SqliteEscalationStore(settings.escalation_db_path)
+    return EscalationStore()
 
 
-escalation_store = EscalationStore()
+escalation_store = _create_store()
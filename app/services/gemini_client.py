@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import re
+import time
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 import httpx
 
@@ -11,6 +13,9 @@ from app.core.config import get_settings
 from app.core.logging import get_logger
 from app.prompts.gemini import build_gemini_prompt
 from app.schemas.gemini import GeminiStructuredResponse
+from app.services.http_clients import UpstreamClientsClosed, upstream_clients
+from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState
+from app.utils.latency import LatencyTracker
 
 logger = get_logger(__name__)
 settings = get_settings()
@@ -22,35 +27,314 @@ class GeminiClientError(Exception):
     status_code: Optional[int] = None
 
 
-class GeminiClient:
-    """Portable Gemini HTTP client (no SDK assumptions)."""
+@dataclass(frozen=True)
+class GeminiStreamChunk:
+    """One step of a streamed generation.
+
+    `answer_delta` carries newly decoded text of the `answer` field; the last
+    chunk carries the fully validated `result`.
+    """
+
+    answer_delta: str = ""
+    result: Optional[GeminiStructuredResponse] = None
+
+
+_ANSWER_KEY = re.compile(r'"answer"\s*:\s*"')
+_JSON_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class _AnswerFieldExtractor:
+    """Incrementally decode the `answer` string from partial JSON text."""
 
     def __init__(self) -> None:
-        self._timeout = httpx.Timeout(settings.http_timeout_seconds)
-        self._retries = settings.http_retries
+        self._buf = ""
+        self._pos = -1
+        self._done = False
+
+    def feed(self, text: str) -> str:
+        self._buf += text
+        if self._done:
+            return ""
+        if self._pos < 0:
+            match = _ANSWER_KEY.search(self._buf)
+            if not match:
+                return ""
+            self._pos = match.end()
+
+        out: List[str] = []
+        buf = self._buf
+        i = self._pos
+        while i < len(buf):
+            ch = buf[i]
+            if ch == '"':
+                self._done = True
+                i += 1
+                break
+            if ch != "\\":
+                out.append(ch)
+                i += 1
+                continue
+            if i + 1 >= len(buf):
+                break
+            esc = buf[i + 1]
+            if esc != "u":
+                out.append(_JSON_ESCAPES.get(esc, esc))
+                i += 2
+                continue
+            if i + 6 > len(buf):
+                break
+            code = int(buf[i + 2 : i + 6], 16)
+            if 0xD800 <= code <= 0xDBFF:
+                # High surrogate: wait for the low half before emitting.
+                if i + 12 > len(buf):
+                    break
+                low = int(buf[i + 8 : i + 12], 16)
+                out.append(chr(0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)))
+                i += 12
+                continue
+            out.append(chr(code))
+            i += 6
+        self._pos = i
+        return "".join(out)
+
+    @property
+    def text(self) -> str:
+        return self._buf
 
-        self._client = httpx.AsyncClient(
-            timeout=self._timeout,
-            transport=httpx.AsyncHTTPTransport(retries=self._retries),
-            headers={"Content-Type": "application/json"},
+
+class GeminiClient:
+    """Portable Gemini HTTP client (no SDK assumptions).
+
+    Calls go through a circuit breaker so a degraded upstream fails fast into the
+    caller's fallback path. Optionally, a request still pending after the tracked
+    latency percentile is hedged with a second identical request.
+    """
+
+    def __init__(self) -> None:
+        self._breaker = CircuitBreaker(
+            "gemini",
+            window_size=settings.gemini_breaker_window_size,
+            min_calls=settings.gemini_breaker_min_calls,
+            failure_ratio=settings.gemini_breaker_failure_ratio,
+            slow_call_seconds=settings.gemini_breaker_slow_call_seconds,
+            open_seconds=settings.gemini_breaker_open_seconds,
+        )
+        self._latency = LatencyTracker(
+            window=settings.gemini_latency_window,
+            min_samples=settings.gemini_hedge_min_samples,
         )
+        self._hedges_fired = 0
+        self._hedges_won = 0
 
-    async def aclose(self) -> None:
-        await self._client.aclose()
+    @property
+    def _client(self) -> httpx.AsyncClient:
+        try:
+            return upstream_clients.get("gemini")
+        except UpstreamClientsClosed as exc:
+            # Shutting down, not an upstream failure: nothing is recorded.
+            raise GeminiClientError("Gemini client is shut down") from exc
 
     async def generate_structured(self, context: Dict[str, Any]) -> GeminiStructuredResponse:
         api_key = settings.gemini_api_key
         if not api_key:
             raise GeminiClientError("GEMINI_API_KEY is not configured")
 
-        prompt = build_gemini_prompt(context)
-
         url = (
             f"{settings.gemini_base_url}/models/{settings.gemini_model}:generateContent"
             f"?key={api_key}"
         )
+        payload = self._build_payload(context)
 
-        payload: Dict[str, Any] = {
+        self._check_breaker()
+        resp, duration = await self._send(url, payload)
+
+        if resp.status_code >= 400:
+            logger.warning(
+                "Gemini error response",
+                status_code=resp.status_code,
+                body=resp.text[:2000],
+            )
+            raise GeminiClientError("Gemini returned an error", status_code=resp.status_code)
+
+        try:
+            try:
+                data = resp.json()
+            except ValueError as exc:
+                raise GeminiClientError("Gemini returned non-JSON response") from exc
+
+            text = (
+                data.get("candidates", [{}])[0]
+                .get("content", {})
+                .get("parts", [{}])[0]
+                .get("text", "")
+            )
+            result = self._validate(text)
+        except GeminiClientError:
+            # A 200 carrying unusable output is an upstream failure too.
+            self._breaker.record_failure(duration)
+            raise
+        self._breaker.record_success(duration)
+        return result
+
+    async def stream_structured(self, context: Dict[str, Any]) -> AsyncIterator[GeminiStreamChunk]:
+        """Stream a generation via `streamGenerateContent` (SSE).
+
+        Yields answer text as soon as it is decoded, then a final chunk with the
+        validated structured response.
+        """
+        api_key = settings.gemini_api_key
+        if not api_key:
+            raise GeminiClientError("GEMINI_API_KEY is not configured")
+
+        url = (
+            f"{settings.gemini_base_url}/models/{settings.gemini_model}:streamGenerateContent"
+            f"?alt=sse&key={api_key}"
+        )
+        payload = self._build_payload(context)
+        extractor = _AnswerFieldExtractor()
+        client = self._client
+
+        self._check_breaker()
+        start = time.monotonic()
+        # Recorded however the call ends; None (e.g. a timeout or invalid output) is a failure.
+        healthy: Optional[bool] = None
+        answered = False
+        try:
+            async with client.stream("POST", url, json=payload) as resp:
+                if resp.status_code >= 400:
+                    healthy = self._is_healthy_status(resp.status_code)
+                    body = await resp.aread()
+                    logger.warning(
+                        "Gemini error response",
+                        status_code=resp.status_code,
+                        body=body[:2000].decode("utf-8", errors="replace"),
+                    )
+                    raise GeminiClientError("Gemini returned an error", status_code=resp.status_code)
+
+                answered = True
+                async for line in resp.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    try:
+                        event = json.loads(line[5:].strip())
+                    except ValueError as exc:
+                        raise GeminiClientError("Gemini returned non-JSON stream event") from exc
+                    parts = event.get("candidates", [{}])[0].get("content", {}).get("parts", [])
+                    delta = extractor.feed("".join(str(p.get("text", "")) for p in parts))
+                    if delta:
+                        yield GeminiStreamChunk(answer_delta=delta)
+            result = self._validate(extractor.text)
+            healthy = True
+        except (GeneratorExit, asyncio.CancelledError):
+            # The consumer stopped reading; once Gemini was answering, that is not its failure.
+            healthy = answered
+            raise
+        except httpx.TimeoutException as exc:
+            raise GeminiClientError("Gemini request timed out") from exc
+        except httpx.RequestError as exc:
+            raise GeminiClientError("Gemini request failed") from exc
+        finally:
+            # Full generation time says nothing about request latency; keep it out of the percentile.
+            self._record(bool(healthy), start, track_latency=False)
+
+        yield GeminiStreamChunk(result=result)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "breaker": {"enabled": settings.gemini_breaker_enabled, **self._breaker.stats()},
+            "hedging": {
+                "enabled": settings.gemini_hedge_enabled,
+                "fired": self._hedges_fired,
+                "won": self._hedges_won,
+                "delay_seconds": self._hedge_delay(),
+            },
+            "latency_samples": len(self._latency),
+        }
+
+    def _check_breaker(self) -> None:
+        if not settings.gemini_breaker_enabled:
+            return
+        try:
+            self._breaker.allow()
+        except CircuitOpenError as exc:
+            raise GeminiClientError("Gemini circuit breaker is open") from exc
+
+    async def _send(self, url: str, payload: Dict[str, Any]) -> Tuple[httpx.Response, float]:
+        delay = self._hedge_delay()
+        primary = asyncio.ensure_future(self._post(url, payload))
+        pending = {primary}
+        try:
+            if delay is None:
+                return await primary
+
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return primary.result()
+
+            self._hedges_fired += 1
+            hedge = asyncio.ensure_future(self._post(url, payload))
+            pending.add(hedge)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self._hedges_won += 1
+                        return task.result()
+                    error = task.exception()
+            assert error is not None
+            raise error
+        finally:
+            for task in pending:
+                if not task.done():
+                    task.cancel()
+
+    async def _post(self, url: str, payload: Dict[str, Any]) -> Tuple[httpx.Response, float]:
+        """The response and its duration. Error statuses are recorded here; the
+        outcome of a 2xx waits until its body validates (see `generate_structured`).
+        """
+        start = time.monotonic()
+        try:
+            resp = await self._client.post(url, json=payload)
+        except httpx.TimeoutException as exc:
+            self._record(False, start)
+            raise GeminiClientError("Gemini request timed out") from exc
+        except httpx.RequestError as exc:
+            self._record(False, start)
+            raise GeminiClientError("Gemini request failed") from exc
+        duration = time.monotonic() - start
+        if resp.status_code >= 400:
+            self._record(self._is_healthy_status(resp.status_code), start)
+        else:
+            self._latency.record(duration)
+        return resp, duration
+
+    def _record(self, ok: bool, start: float, track_latency: bool = True) -> None:
+        duration = time.monotonic() - start
+        if not ok:
+            self._breaker.record_failure(duration)
+            return
+        self._breaker.record_success(duration)
+        if track_latency:
+            self._latency.record(duration)
+
+    def _hedge_delay(self) -> Optional[float]:
+        if not settings.gemini_hedge_enabled or self._breaker.state != CircuitState.CLOSED:
+            return None
+        threshold = self._latency.percentile(settings.gemini_hedge_percentile)
+        if threshold is None:
+            return None
+        return max(threshold, settings.gemini_hedge_min_delay_seconds)
+
+    @staticmethod
+    def _is_healthy_status(status_code: int) -> bool:
+        # Client errors are our fault, not a sign of upstream degradation.
+        return status_code < 500 and status_code != 429
+
+    def _build_payload(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        prompt = build_gemini_prompt(context)
+        return {
             "contents": [
                 {
                     "role": "user",
@@ -65,33 +349,7 @@ class GeminiClient:
             },
         }
 
-        try:
-            resp = await self._client.post(url, json=payload)
-        except httpx.TimeoutException as exc:
-            raise GeminiClientError("Gemini request timed out") from exc
-        except httpx.RequestError as exc:
-            raise GeminiClientError("Gemini request failed") from exc
-
-        if resp.status_code >= 400:
-            logger.warning(
-                "Gemini error response",
-                status_code=resp.status_code,
-                body=resp.text[:2000],
-            )
-            raise GeminiClientError("Gemini returned an error", status_code=resp.status_code)
-
-        try:
-            data = resp.json()
-        except ValueError as exc:
-            raise GeminiClientError("Gemini returned non-JSON response") from exc
-
-        text = (
-            data.get("candidates", [{}])[0]
-            .get("content", {})
-            .get("parts", [{}])[0]
-            .get("text", "")
-        )
-
+    def _validate(self, text: str) -> GeminiStructuredResponse:
         parsed = self._parse_strict_json(text)
         try:
             return GeminiStructuredResponse.model_validate(parsed)
@@ -107,7 +365,10 @@ class GeminiClient:
             match = re.search(r"\{.*\}", raw, re.DOTALL)
             if not match:
                 raise GeminiClientError("Gemini response was not JSON")
-            return json.loads(match.group(0))
+            try:
+                return json.loads(match.group(0))
+            except json.JSONDecodeError as exc:
+                raise GeminiClientError("Gemini response was not JSON") from exc
 
 
 gemini_client = GeminiClient()
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import importlib.util
+from typing import Dict
+
+import httpx
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+
+class UpstreamClientsClosed(Exception):
+    pass
+
+
+class UpstreamClients:
+    """Shared, pooled HTTP clients for upstream APIs.
+
+    One `httpx.AsyncClient` per upstream, configured from `Settings` (pool
+    limits, keepalive, HTTP/2). `start()` runs in the application lifespan and
+    pre-warms connections so TLS handshakes happen before the first request;
+    `aclose()` drains the pools on shutdown. Clients requested before
+    `start()` (scripts, tests) are created lazily; after `aclose()`, `get`
+    raises `UpstreamClientsClosed` until the next `start()`, so no client is
+    created that nothing would close.
+    """
+
+    def __init__(self) -> None:
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._closed = False
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        if self._closed:
+            raise UpstreamClientsClosed(name)
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._build_client()
+            self._clients[name] = client
+        return client
+
+    async def start(self) -> None:
+        self._closed = False
+        upstreams = {"gemini": settings.gemini_base_url, "bhashini": settings.bhashini_base_url}
+        for name, base_url in upstreams.items():
+            client = self.get(name)
+            if settings.http_prewarm_enabled and base_url:
+                await self._prewarm(name, client, base_url)
+
+    async def aclose(self) -> None:
+        self._closed = True
+        clients = list(self._clients.items())
+        self._clients.clear()
+        for name, client in clients:
+            try:
+                await client.aclose()
+            except Exception as exc:
+                logger.warning("Failed to close upstream client", upstream=name, error=str(exc))
+
+    def _build_client(self) -> httpx.AsyncClient:
+        http2 = settings.http2_enabled
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+            http2 = False
+
+        limits = httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry_seconds,
+        )
+        # Pool limits and HTTP/2 must be set on the transport: a custom transport
+        # ignores the client-level `limits`/`http2` arguments.
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.http_timeout_seconds),
+            transport=httpx.AsyncHTTPTransport(
+                retries=settings.http_retries,
+                http2=http2,
+                limits=limits,
+            ),
+        )
+
+    async def _prewarm(self, name: str, client: httpx.AsyncClient, base_url: str) -> None:
+        # Any response (even 404) leaves an established TLS connection in the pool.
+        try:
+            resp = await client.head(base_url, timeout=settings.http_prewarm_timeout_seconds)
+            logger.info("Upstream connection pre-warmed", upstream=name, http_version=resp.http_version)
+        except httpx.HTTPError as exc:
+            logger.warning("Upstream pre-warm failed", upstream=name, error=str(exc))
+
+
+upstream_clients = UpstreamClients()
@@ -1,20 +1,142 @@
 from __future__ import annotations
 
-from typing import List
+import asyncio
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 
+import numpy as np
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
 from app.schemas.chat import DiseasePrediction
+from app.services.image_pipeline import image_pipeline
+from app.services.onnx_classifier import OnnxClassifier
+from app.services.prediction_cache import prediction_cache
+from app.utils.micro_batch import MicroBatcher
+from app.utils.uploads import SpooledUpload
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+_STUB_PREDICTION = DiseasePrediction(label="unclassified", confidence=0.10)
 
 
 class CropDiseaseDetector:
-    """Stub detector.
+    """Crop disease classifier served by ONNX Runtime on CPU.
 
-    Swap this implementation with YOLOv8 / EfficientNet later.
+    The model named by `DETECTOR_MODEL_PATH` is loaded once at startup.
+    Uploads are decoded straight to the model resolution by the image
+    pipeline, then concurrent requests are micro-batched and inferred in a
+    thread pool off the event loop. Without a configured model (or without
+    `onnxruntime`/`Pillow`) it keeps the stub behaviour.
     """
 
-    async def detect(self, image_bytes: bytes, filename: str) -> List[DiseasePrediction]:
-        if not image_bytes:
+    def __init__(self) -> None:
+        self._classifier: Optional[OnnxClassifier] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._installed = all(importlib.util.find_spec(name) is not None for name in ("onnxruntime", "PIL"))
+        self._batcher: MicroBatcher[np.ndarray, List[DiseasePrediction]] = MicroBatcher(
+            self._detect_batch,
+            max_batch_size=settings.detector_batch_max_size,
+            max_wait_seconds=settings.detector_batch_max_wait_ms / 1000.0,
+            max_concurrent_batches=settings.detector_workers,
+        )
+        self._failures = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(settings.detector_model_path) and self._installed
+
+    async def start(self) -> None:
+        if not self.enabled or self._classifier is not None:
+            return
+        try:
+            self._classifier = await asyncio.to_thread(
+                OnnxClassifier,
+                settings.detector_model_path,
+                labels_path=settings.detector_labels_path,
+                input_size=settings.detector_input_size,
+                intra_op_threads=settings.detector_intra_op_threads,
+            )
+        except Exception as exc:
+            logger.warning("Crop disease model failed to load", path=settings.detector_model_path, error=str(exc))
+            return
+        self._executor = ThreadPoolExecutor(max_workers=settings.detector_workers, thread_name_prefix="detector")
+        logger.info(
+            "Crop disease model loaded",
+            path=settings.detector_model_path,
+            input_size=self._classifier.input_size,
+            classes=len(self._classifier.labels),
+        )
+
+    async def aclose(self) -> None:
+        await self._batcher.aclose()
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+        self._classifier = None
+
+    async def detect(self, image: SpooledUpload) -> List[DiseasePrediction]:
+        """Classify an uploaded image.
+
+        Takes ownership of `image`: its spool is released as soon as it has
+        been decoded, before inference is queued.
+        """
+        if image.size == 0:
             return []
-        return [DiseasePrediction(label="unclassified", confidence=0.10)]
+        if self._classifier is None:
+            return [_STUB_PREDICTION]
+
+        try:
+            pixels = await image_pipeline.prepare(image, self._classifier.input_size)
+        except Exception as exc:
+            logger.warning("Image could not be decoded", filename=image.filename, error=str(exc))
+            return [_STUB_PREDICTION]
+        finally:
+            image.close()
+
+        cache_key: Optional[int] = None
+        if prediction_cache.enabled:
+            # Sub-millisecond on a model-sized thumbnail; fine on the loop.
+            cache_key = prediction_cache.key(pixels)
+            cached = prediction_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        try:
+            predictions = await self._batcher.submit(pixels)
+        except Exception as exc:
+            self._failures += 1
+            logger.warning("Crop disease inference failed", filename=image.filename, error=str(exc))
+            return [_STUB_PREDICTION]
+        if cache_key is not None:
+            prediction_cache.set(cache_key, predictions)
+        return predictions
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "loaded": self._classifier is not None,
+            "failures": self._failures,
+            "batching": self._batcher.stats(),
+            "cache": prediction_cache.stats(),
+        }
+
+    async def _detect_batch(self, images: List[np.ndarray]) -> List[List[DiseasePrediction]]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._classify, images)
+
+    def _classify(self, images: List[np.ndarray]) -> List[List[DiseasePrediction]]:
+        classifier = self._classifier
+        assert classifier is not None
+        return [
+            [
+                DiseasePrediction(label=label, confidence=min(1.0, max(0.0, confidence)))
+                for label, confidence in ranked
+            ]
+            for ranked in classifier.classify(images, settings.detector_top_k)
+        ]
 
 
 crop_disease_detector = CropDiseaseDetector()
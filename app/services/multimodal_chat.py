@@ -1,54 +1,200 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
+import re
 import uuid
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, TypeVar, Union
 
 from app.core.config import get_settings
 from app.core.logging import get_logger
-from app.schemas.chat import ChatConfidence, ChatResponse
-from app.services.escalation_store import EscalationNotFound, escalation_store
+from app.schemas.chat import AudioTranscriptionResult, ChatConfidence, ChatResponse, DiseasePrediction
+from app.schemas.gemini import GeminiStructuredResponse
+from app.services.audit_log import audit_log
+from app.services.escalation_store import EscalationNotFound, EscalationTooLarge, escalation_store
 from app.services.gemini_client import GeminiClientError, gemini_client
 from app.services.image_detection import crop_disease_detector
+from app.services.state_backend import StateCache, state_backend
 from app.services.text_processing import text_processor
 from app.services.transcription import audio_transcription_service
-from app.utils.ttl_cache import TTLCache
+from app.services.verified_answers import verified_answer_index
+from app.utils.single_flight import SingleFlight
+from app.utils.uploads import SpooledUpload
 
 logger = get_logger(__name__)
 settings = get_settings()
 
+T = TypeVar("T")
+
+_TRAILING_PUNCTUATION = re.compile(r"[\s.?!।,;:]+$")
+
+
+async def _resolved(value: T) -> T:
+    return value
+
+
+def _canonical_text(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    cleaned = re.sub(r"\s+", " ", value).strip().casefold()
+    cleaned = _TRAILING_PUNCTUATION.sub("", cleaned)
+    return cleaned or None
+
+
+def _context_fingerprint(context: Dict[str, Any]) -> str:
+    """Stable hash of the inputs that determine the Gemini answer.
+
+    Volatile fields (timestamp, filenames, providers, raw prediction scores)
+    are excluded so repeated questions map to the same key. A photo is keyed
+    by its confident labels; without one (e.g. the placeholder detector's
+    "unclassified") the label says nothing about the photo, so its SHA-256
+    is used instead and only the same upload shares an answer.
+    """
+    inputs = context.get("inputs") or {}
+    labels = {
+        p.get("label")
+        for p in inputs.get("image_predictions") or []
+        if p.get("label") and (p.get("confidence") or 0.0) >= settings.chat_answer_cache_min_image_confidence
+    }
+    canonical = {
+        "text": _canonical_text(inputs.get("text")),
+        "text_language": inputs.get("text_language"),
+        "audio_transcript": _canonical_text(inputs.get("audio_transcript")),
+        "audio_language": inputs.get("audio_language"),
+        "image_labels": sorted(labels),
+        "image_sha256": None if labels else inputs.get("image_sha256"),
+    }
+    raw = json.dumps(canonical, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
 
 class MultimodalChatService:
     def __init__(self) -> None:
-        self._cache: TTLCache[str, Dict[str, Any]] = TTLCache(
-            ttl_seconds=float(settings.chat_cache_ttl_seconds),
-            max_items=1000,
+        # Shared by all workers when STATE_BACKEND=sqlite.
+        self._answer_cache: StateCache = state_backend.cache(
+            "chat_answers",
+            ttl_seconds=float(settings.chat_answer_cache_ttl_seconds),
+            max_items=settings.chat_answer_cache_max_items,
+            max_bytes=settings.chat_answer_cache_max_bytes,
+            # Popular questions keep their answers; one-off ones age out first.
+            lru=True,
         )
+        self._answer_cache_hits = 0
+        self._answer_cache_misses = 0
+        self._gemini_flight: SingleFlight[str, GeminiStructuredResponse] = SingleFlight()
 
     async def chat(
         self,
         text: Optional[str],
-        audio_bytes: Optional[bytes],
-        audio_filename: Optional[str],
-        audio_content_type: Optional[str],
-        image_bytes: Optional[bytes],
-        image_filename: Optional[str],
+        audio: Optional[SpooledUpload],
+        image: Optional[SpooledUpload],
     ) -> ChatResponse:
+        context = await self._build_context(text=text, audio=audio, image=image)
+
+        verified = verified_answer_index.match(context)
+        if verified is not None:
+            audit_log.record(context, verified, cached=True)
+            return verified
+
+        fingerprint = _context_fingerprint(context)
+        cached = await self._cached_answer(fingerprint, context)
+        if cached is not None:
+            audit_log.record(context, cached, cached=True)
+            return cached
+
+        try:
+            gemini_resp = await self._generate(fingerprint, context)
+            response = self._response_from_gemini(gemini_resp)
+            await self._store_answer(fingerprint, context, response)
+        except GeminiClientError as exc:
+            logger.warning("Gemini unavailable", message=exc.message, status_code=exc.status_code)
+            response = self._fallback_response()
+
+        return await self._finalize(context, response)
+
+    async def chat_stream(
+        self,
+        text: Optional[str],
+        audio: Optional[SpooledUpload],
+        image: Optional[SpooledUpload],
+    ) -> AsyncIterator[Union[str, ChatResponse]]:
+        """Streaming variant of `chat`.
+
+        Yields answer text fragments as Gemini produces them, then exactly one
+        final `ChatResponse`. The final response is authoritative: if the
+        streamed output fails validation it carries the fallback answer instead.
+        """
+        context = await self._build_context(text=text, audio=audio, image=image)
+
+        verified = verified_answer_index.match(context)
+        if verified is not None:
+            audit_log.record(context, verified, cached=True)
+            yield verified.response_text
+            yield verified
+            return
+
+        fingerprint = _context_fingerprint(context)
+        cached = await self._cached_answer(fingerprint, context)
+        if cached is not None:
+            audit_log.record(context, cached, cached=True)
+            yield cached.response_text
+            yield cached
+            return
+
+        try:
+            gemini_resp: Optional[GeminiStructuredResponse] = None
+            async for chunk in gemini_client.stream_structured(context=context):
+                if chunk.answer_delta:
+                    yield chunk.answer_delta
+                if chunk.result is not None:
+                    gemini_resp = chunk.result
+            if gemini_resp is None:
+                raise GeminiClientError("Gemini stream ended without a response")
+            response = self._response_from_gemini(gemini_resp)
+            await self._store_answer(fingerprint, context, response)
+        except GeminiClientError as exc:
+            logger.warning("Gemini unavailable", message=exc.message, status_code=exc.status_code)
+            response = self._fallback_response()
+
+        yield await self._finalize(context, response)
+
+    async def _build_context(
+        self,
+        text: Optional[str],
+        audio: Optional[SpooledUpload],
+        image: Optional[SpooledUpload],
+    ) -> Dict[str, Any]:
         text_signals = text_processor.process(text)
 
-        transcription = None
-        if audio_bytes is not None and audio_filename and audio_content_type:
-            transcription = await audio_transcription_service.transcribe(
-                audio_bytes=audio_bytes,
-                filename=audio_filename,
-                content_type=audio_content_type,
+        # Audio and image stages are independent: run them concurrently so a
+        # request with both pays max(latencies), not the sum.
+        transcription_stage: Awaitable[Optional[AudioTranscriptionResult]]
+        if audio is not None:
+            transcription_stage = self._run_stage(
+                "transcription",
+                self._transcribe(audio),
+                timeout=settings.chat_transcription_timeout_seconds,
+                default=None,
             )
+        else:
+            transcription_stage = _resolved(None)
 
-        predictions = []
-        if image_bytes is not None and image_filename:
-            predictions = await crop_disease_detector.detect(image_bytes=image_bytes, filename=image_filename)
+        detection_stage: Awaitable[List[DiseasePrediction]]
+        if image is not None:
+            detection_stage = self._run_stage(
+                "image_detection",
+                self._detect(image),
+                timeout=settings.chat_image_detection_timeout_seconds,
+                default=[],
+            )
+        else:
+            detection_stage = _resolved([])
 
-        context: Dict[str, Any] = {
+        transcription, predictions = await asyncio.gather(transcription_stage, detection_stage)
+
+        return {
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "inputs": {
                 "text": (text_signals.normalized_text if text_signals else None),
@@ -56,63 +202,132 @@ class MultimodalChatService:
                 "audio_transcript": (transcription.transcript if transcription else None),
                 "audio_provider": (transcription.provider if transcription else None),
                 "audio_language": (transcription.language if transcription else None),
-                "image_filename": image_filename,
+                "audio_transcript_partial": (transcription.partial if transcription else False),
+                "image_filename": (image.filename if image else None),
+                "image_sha256": (image.sha256 if image else None),
                 "image_predictions": [p.model_dump() for p in predictions],
             },
         }
 
-        try:
-            gemini_resp = await gemini_client.generate_structured(context=context)
-            confidence = ChatConfidence(gemini_resp.confidence.value)
-            escalate, reason = self._escalation(confidence=confidence, uncertainty=gemini_resp.uncertainty)
-            response = ChatResponse(
-                response_text=gemini_resp.answer,
-                confidence=confidence,
-                citations=gemini_resp.citations,
-                escalate=escalate,
-                reason=reason,
-                audio_output_url="",
-            )
-        except GeminiClientError as exc:
-            logger.warning("Gemini unavailable", message=exc.message, status_code=exc.status_code)
-            response = ChatResponse(
-                response_text=(
-                    "I can't generate a reliable advisory response right now. "
-                    "Please try again shortly or contact an agriculture officer."
-                ),
-                confidence=ChatConfidence.LOW,
-                citations=[],
-                escalate=True,
-                reason="AI reasoning service is unavailable or returned an invalid response.",
-                audio_output_url="",
+    async def _transcribe(self, audio: SpooledUpload) -> AudioTranscriptionResult:
+        if settings.chat_early_prompt_transcript_chars > 0:
+            return await audio_transcription_service.transcribe_early(
+                audio, min_chars=settings.chat_early_prompt_transcript_chars
             )
+        return await audio_transcription_service.transcribe(audio)
+
+    async def _detect(self, image: SpooledUpload) -> List[DiseasePrediction]:
+        # Nothing else reads the image part, so the detector may release it once decoded.
+        return await crop_disease_detector.detect(image)
+
+    async def _run_stage(self, name: str, stage: Awaitable[T], timeout: float, default: T) -> T:
+        """Await one pre-Gemini stage, degrading to `default` on timeout or error."""
+        try:
+            return await asyncio.wait_for(stage, timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Chat stage timed out", stage=name, timeout_seconds=timeout)
+        except Exception as exc:
+            logger.warning("Chat stage failed", stage=name, error=str(exc))
+        return default
+
+    def _response_from_gemini(self, gemini_resp: GeminiStructuredResponse) -> ChatResponse:
+        confidence = ChatConfidence(gemini_resp.confidence.value)
+        escalate, reason = self._escalation(confidence=confidence, uncertainty=gemini_resp.uncertainty)
+        return ChatResponse(
+            response_text=gemini_resp.answer,
+            confidence=confidence,
+            citations=gemini_resp.citations,
+            escalate=escalate,
+            reason=reason,
+            audio_output_url="",
+        )
+
+    def _fallback_response(self) -> ChatResponse:
+        return ChatResponse(
+            response_text=(
+                "I can't generate a reliable advisory response right now. "
+                "Please try again shortly or contact an agriculture officer."
+            ),
+            confidence=ChatConfidence.LOW,
+            citations=[],
+            escalate=True,
+            reason="AI reasoning service is unavailable or returned an invalid response.",
+            audio_output_url="",
+        )
 
+    async def _finalize(self, context: Dict[str, Any], response: ChatResponse) -> ChatResponse:
         escalation_id = None
         if response.escalate:
             escalation_id = str(uuid.uuid4())
-            escalation_store.add(
-                escalation_id=escalation_id,
-                context=context,
-                ai_response=response,
-            )
+            try:
+                escalation_store.add(
+                    escalation_id=escalation_id,
+                    context=context,
+                    ai_response=response,
+                )
+            except EscalationTooLarge as exc:
+                logger.error("Escalation too large to store", escalation_id=escalation_id, limit_bytes=exc.limit)
+                response.reason = f"{response.reason} This question could not be queued for an officer; please contact one directly."
+                audit_log.record(context, response)
+                return response
             response.escalation_id = escalation_id
 
             try:
-                record = escalation_store.get(escalation_id)
+                record = await escalation_store.run(escalation_store.get, escalation_id)
                 if record.verified_response is not None:
+                    audit_log.record(context, record.verified_response)
                     return record.verified_response
             except EscalationNotFound:
                 pass
 
-        request_id = str(uuid.uuid4())
-        self._cache.set(
-            request_id,
-            {
-                "request": context,
-                "response": response.model_dump(),
+        audit_log.record(context, response)
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._answer_cache_hits + self._answer_cache_misses
+        return {
+            "answer_cache": {
+                "enabled": settings.chat_answer_cache_enabled,
+                "hits": self._answer_cache_hits,
+                "misses": self._answer_cache_misses,
+                "hit_rate": (self._answer_cache_hits / lookups) if lookups else 0.0,
+                "store": self._answer_cache.stats(),
             },
+            "gemini_single_flight": self._gemini_flight.stats(),
+            "verified_answers": verified_answer_index.stats(),
+        }
+
+    async def _generate(self, fingerprint: str, context: Dict[str, Any]) -> GeminiStructuredResponse:
+        # Identical questions arriving together share one upstream call.
+        if not settings.gemini_single_flight_enabled:
+            return await gemini_client.generate_structured(context=context)
+        return await self._gemini_flight.do(
+            fingerprint,
+            lambda: gemini_client.generate_structured(context=context),
         )
-        return response
+
+    async def _cached_answer(self, fingerprint: str, context: Dict[str, Any]) -> Optional[ChatResponse]:
+        if not self._answer_cacheable(context):
+            return None
+        cached = await state_backend.run(self._answer_cache.get, fingerprint)
+        if cached is None:
+            self._answer_cache_misses += 1
+            return None
+        self._answer_cache_hits += 1
+        return ChatResponse.model_validate(cached)
+
+    async def _store_answer(self, fingerprint: str, context: Dict[str, Any], response: ChatResponse) -> None:
+        # Escalated or Low-confidence answers must go through an officer every time.
+        if not self._answer_cacheable(context):
+            return
+        if response.escalate or response.confidence == ChatConfidence.LOW:
+            return
+        await state_backend.run(self._answer_cache.set, fingerprint, response.model_dump(mode="json"))
+
+    def _answer_cacheable(self, context: Dict[str, Any]) -> bool:
+        # An answer to a partial transcript must not be served for the full question.
+        partial = bool((context.get("inputs") or {}).get("audio_transcript_partial"))
+        return settings.chat_answer_cache_enabled and not partial
 
     def _escalation(self, confidence: ChatConfidence, uncertainty: bool) -> tuple[bool, str]:
         if confidence == ChatConfidence.LOW:
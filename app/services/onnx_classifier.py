@@ -0,0 +1,94 @@
+"""ONNX Runtime image classifier used by the crop disease detector.
+
+Kept free of app imports so benchmarks can drive it directly. Requires
+`onnxruntime`, which is imported lazily.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+IMAGENET_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+IMAGENET_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+
+
+def load_labels(path: Optional[str], count: Optional[int]) -> List[str]:
+    """One label per line; with a known class `count`, short files are padded with `class_<i>`."""
+    labels: List[str] = []
+    if path:
+        labels = [line.strip() for line in Path(path).read_text(encoding="utf-8").splitlines() if line.strip()]
+    if count is None:
+        return labels
+    return labels[:count] + [f"class_{i}" for i in range(len(labels), count)]
+
+
+def preprocess_batch(images: Sequence[np.ndarray], channels_first: bool = True) -> np.ndarray:
+    """Stack uint8 HWC images into one normalized float32 batch in a single pass."""
+    batch = np.stack(images).astype(np.float32)
+    batch *= 1.0 / 255.0
+    batch -= IMAGENET_MEAN
+    batch /= IMAGENET_STD
+    if channels_first:
+        batch = batch.transpose(0, 3, 1, 2)
+    return np.ascontiguousarray(batch)
+
+
+def softmax(scores: np.ndarray) -> np.ndarray:
+    shifted = scores - scores.max(axis=1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+class OnnxClassifier:
+    """CPU inference session for an NCHW or NHWC float32 classification model.
+
+    `InferenceSession.run` is thread-safe, so one instance serves every worker
+    thread. Outputs that are not already probabilities are softmaxed.
+    """
+
+    def __init__(
+        self,
+        model_path: str,
+        labels_path: Optional[str] = None,
+        input_size: int = 224,
+        intra_op_threads: int = 0,
+    ) -> None:
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads > 0:
+            options.intra_op_num_threads = intra_op_threads
+        self._session = ort.InferenceSession(model_path, sess_options=options, providers=["CPUExecutionProvider"])
+
+        model_input = self._session.get_inputs()[0]
+        self._input_name = model_input.name
+        shape = list(model_input.shape)
+        self.channels_first = len(shape) == 4 and shape[1] == 3
+        spatial = shape[2] if self.channels_first else (shape[1] if len(shape) == 4 else None)
+        self.input_size = spatial if isinstance(spatial, int) and spatial > 0 else input_size
+
+        output_shape = self._session.get_outputs()[0].shape
+        classes = output_shape[-1] if output_shape and isinstance(output_shape[-1], int) else None
+        self.labels = load_labels(labels_path, classes)
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        """Class probabilities, shape (N, classes)."""
+        (scores,) = self._session.run(None, {self._input_name: batch})[:1]
+        scores = np.asarray(scores, dtype=np.float32).reshape(batch.shape[0], -1)
+        sums = scores.sum(axis=1)
+        if scores.min() < 0 or not np.allclose(sums, 1.0, atol=1e-3):
+            scores = softmax(scores)
+        return scores
+
+    def classify(self, images: Sequence[np.ndarray], top_k: int) -> List[List[Tuple[str, float]]]:
+        """Top-k `(label, probability)` pairs for each uint8 HWC image."""
+        probs = self.predict(preprocess_batch(images, self.channels_first))
+        k = max(1, min(top_k, probs.shape[1]))
+        top = np.argsort(-probs, axis=1)[:, :k]
+        return [[(self._label(int(i)), float(row[i])) for i in idx] for row, idx in zip(probs, top)]
+
+    def _label(self, index: int) -> str:
+        return self.labels[index] if index < len(self.labels) else f"class_{index}"
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from threading import RLock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.schemas.chat import DiseasePrediction
+from app.utils.perceptual_hash import HammingIndex, dhash, phash
+
+settings = get_settings()
+
+_HASHERS: Dict[str, Callable[[np.ndarray], int]] = {"dhash": dhash, "phash": phash}
+
+
+class PredictionCache:
+    """Near-duplicate cache for crop disease predictions.
+
+    Messaging apps recompress forwarded photos, so byte hashes differ between
+    copies of the same picture. Entries are keyed by a 64-bit perceptual hash
+    of the decoded pixels instead and looked up by Hamming distance (at most
+    `IMAGE_PREDICTION_CACHE_MAX_DISTANCE` bits). Entries share one TTL, so
+    insertion order is expiry order and pruning only looks at the oldest end.
+    """
+
+    def __init__(self) -> None:
+        self._hasher = _HASHERS[settings.image_prediction_cache_algorithm]
+        self._ttl_seconds = float(settings.image_prediction_cache_ttl_seconds)
+        self._max_items = settings.image_prediction_cache_max_items
+        self._entries: "OrderedDict[int, Tuple[float, List[DiseasePrediction]]]" = OrderedDict()
+        self._index: HammingIndex[int] = HammingIndex(settings.image_prediction_cache_max_distance)
+        self._lock = RLock()
+        self._hits = 0
+        self._exact_hits = 0
+        self._hit_distance_total = 0
+        self._misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return settings.image_prediction_cache_enabled
+
+    def key(self, pixels: np.ndarray) -> int:
+        return self._hasher(pixels)
+
+    def get(self, key: int) -> Optional[List[DiseasePrediction]]:
+        now = time.monotonic()
+        with self._lock:
+            self._prune_locked(now)
+            match = self._index.nearest(key)
+            if match is None:
+                self._misses += 1
+                return None
+            matched_key, distance = match
+            self._hits += 1
+            self._exact_hits += int(distance == 0)
+            self._hit_distance_total += distance
+            return list(self._entries[matched_key][1])
+
+    def set(self, key: int, predictions: List[DiseasePrediction]) -> None:
+        if not predictions:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (now + self._ttl_seconds, list(predictions))
+            self._index.add(key, key)
+            self._prune_locked(now)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "algorithm": settings.image_prediction_cache_algorithm,
+                "max_distance": self._index.max_distance,
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "exact_hits": self._exact_hits,
+                "misses": self._misses,
+                "hit_rate": (self._hits / lookups) if lookups else 0.0,
+                "avg_hit_distance": (self._hit_distance_total / self._hits) if self._hits else 0.0,
+            }
+
+    def _prune_locked(self, now: float) -> None:
+        while self._entries:
+            oldest, (expires_at, _) = next(iter(self._entries.items()))
+            if expires_at > now and len(self._entries) <= self._max_items:
+                return
+            self._entries.popitem(last=False)
+            self._index.remove(oldest)
+
+
+prediction_cache = PredictionCache()
@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from threading import RLock
+from typing import Any, Callable, Dict, Optional, TypeVar, Union
+
+from app.core.config import get_settings
+from app.core.logging import get_thread_logger
+from app.utils.ttl_cache import TTLCache
+
+# SQLite state calls run on worker threads (see `SqliteStateBackend.run`).
+logger = get_thread_logger(__name__)
+settings = get_settings()
+
+T = TypeVar("T")
+
+# Expired counters and cache rows are swept every this many writes.
+_SWEEP_EVERY = 1024
+
+
+@dataclass
+class _Window:
+    start: float
+    count: int
+
+
+class InProcessStateBackend:
+    """State local to this worker process (the default).
+
+    Counters are fixed windows in a dict and caches are `TTLCache`s, so
+    nothing leaves the process; with several uvicorn workers each one keeps
+    its own rate limits and caches.
+    """
+
+    def __init__(self) -> None:
+        self._lock = RLock()
+        self._windows: Dict[str, _Window] = {}
+        self._writes = 0
+
+    def incr(self, key: str, window_seconds: float) -> int:
+        """Count a hit in `key`'s current fixed window and return the count so far."""
+        now = time.monotonic()
+        with self._lock:
+            current = self._windows.get(key)
+            if current is None or (now - current.start) >= window_seconds:
+                current = self._windows[key] = _Window(start=now, count=0)
+            current.count += 1
+            self._writes += 1
+            if self._writes % _SWEEP_EVERY == 0:
+                self._windows = {
+                    k: w for k, w in self._windows.items() if (now - w.start) < window_seconds
+                }
+            return current.count
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Call a state operation from the event loop; in-process state never blocks."""
+        return fn(*args)
+
+    def cache(
+        self,
+        namespace: str,
+        ttl_seconds: float,
+        max_items: int,
+        max_bytes: Optional[int] = None,
+        lru: bool = False,
+    ) -> TTLCache[str, Any]:
+        return TTLCache(ttl_seconds=ttl_seconds, max_items=max_items, lru=lru, max_bytes=max_bytes)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"backend": "memory", "counters": len(self._windows)}
+
+
+class SqliteStateCache:
+    """A TTL cache in the shared state database; values must be JSON-serializable.
+
+    Same `get`/`set`/`stats` surface as `TTLCache`. Entries live on disk, so
+    there is no byte budget and no LRU order: `max_items` is enforced by
+    dropping the entries closest to expiry when rows are swept, and a hit
+    does not extend an entry's life.
+    """
+
+    def __init__(self, backend: SqliteStateBackend, namespace: str, ttl_seconds: float, max_items: int) -> None:
+        self._backend = backend
+        self._namespace = namespace
+        self._ttl_seconds = ttl_seconds
+        self._max_items = max_items
+        self._lock = RLock()
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            row = self._backend.connection().execute(
+                "SELECT value FROM state_cache WHERE namespace = ? AND key = ? AND expires_at > ?",
+                (self._namespace, key, time.time()),
+            ).fetchone()
+        except sqlite3.Error as exc:
+            self._backend.failed("cache get", exc)
+            row = None
+        with self._lock:
+            if row is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        now = time.time()
+        try:
+            conn = self._backend.connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO state_cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                    (self._namespace, key, json.dumps(value, default=str), now + self._ttl_seconds),
+                )
+            with self._lock:
+                self._writes += 1
+                sweep = self._writes % _SWEEP_EVERY == 0
+            if sweep:
+                self._sweep(conn, now)
+        except sqlite3.Error as exc:
+            # A skipped cache write only costs a later miss.
+            self._backend.failed("cache set", exc)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for this worker; `entries` is None while the database is unavailable."""
+        entries: Optional[int] = None
+        try:
+            (entries,) = self._backend.connection().execute(
+                "SELECT count(*) FROM state_cache WHERE namespace = ?", (self._namespace,)
+            ).fetchone()
+        except sqlite3.Error as exc:
+            self._backend.failed("cache stats", exc)
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": entries,
+                "max_items": self._max_items,
+                "policy": "shared",
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": (self._hits / lookups) if lookups else 0.0,
+            }
+
+    def _sweep(self, conn: sqlite3.Connection, now: float) -> None:
+        with conn:
+            conn.execute(
+                "DELETE FROM state_cache WHERE namespace = ? AND expires_at <= ?", (self._namespace, now)
+            )
+            conn.execute(
+                """
+                DELETE FROM state_cache WHERE namespace = ? AND key IN (
+                    SELECT key FROM state_cache WHERE namespace = ?
+                    ORDER BY expires_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self._namespace, self._namespace, self._max_items),
+            )
+
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS state_counters (
+        key TEXT PRIMARY KEY,
+        window_start REAL NOT NULL,
+        expires_at REAL NOT NULL,
+        count INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS state_cache (
+        namespace TEXT NOT NULL,
+        key TEXT NOT NULL,
+        value TEXT NOT NULL,
+        expires_at REAL NOT NULL,
+        PRIMARY KEY (namespace, key)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_state_cache_expires_at ON state_cache (namespace, expires_at)",
+)
+
+# Fixed windows keyed by wall-clock time, since workers share no monotonic clock.
+_INCR = """
+    INSERT INTO state_counters (key, window_start, expires_at, count) VALUES (:key, :now, :now + :window, 1)
+    ON CONFLICT (key) DO UPDATE SET
+        count = CASE WHEN :now >= expires_at THEN 1 ELSE count + 1 END,
+        window_start = CASE WHEN :now >= expires_at THEN :now ELSE window_start END,
+        expires_at = CASE WHEN :now >= expires_at THEN :now + :window ELSE expires_at END
+    RETURNING count
+"""
+
+
+class SqliteStateBackend:
+    """State shared by every worker process on this host, in one SQLite file.
+
+    Counter increments are single upserts (`RETURNING` the new count), so they
+    are atomic across processes; WAL keeps readers off the writers' lock and
+    `synchronous=NORMAL` keeps commits off fsync. Each thread uses its own
+    connection.
+
+    Calls from the event loop go through `run`, which moves them to a worker
+    thread. A write waits at most `STATE_DB_BUSY_TIMEOUT_MS` for another
+    worker's lock and then fails open: the hit is not counted (`incr` returns
+    0) or the cache lookup misses, and the failure is counted in `errors`.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._local = threading.local()
+        self._lock = RLock()
+        self._writes = 0
+        self._errors = 0
+
+    def incr(self, key: str, window_seconds: float) -> int:
+        """Count a hit in `key`'s current fixed window and return the count so far (0 if it failed)."""
+        now = time.time()
+        try:
+            conn = self.connection()
+            with conn:
+                (count,) = conn.execute(_INCR, {"key": key, "now": now, "window": window_seconds}).fetchone()
+            with self._lock:
+                self._writes += 1
+                sweep = self._writes % _SWEEP_EVERY == 0
+            if sweep:
+                with conn:
+                    conn.execute("DELETE FROM state_counters WHERE expires_at <= ?", (now,))
+        except sqlite3.Error as exc:
+            self.failed("incr", exc)
+            return 0
+        return count
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Call a state operation from the event loop without blocking it on SQLite."""
+        return await asyncio.to_thread(fn, *args)
+
+    def failed(self, operation: str, exc: sqlite3.Error) -> None:
+        with self._lock:
+            self._errors += 1
+            errors = self._errors
+        if errors == 1 or errors % 1000 == 0:
+            logger.warning("State database unavailable; failing open", operation=operation, error=str(exc), errors=errors)
+
+    def cache(
+        self,
+        namespace: str,
+        ttl_seconds: float,
+        max_items: int,
+        max_bytes: Optional[int] = None,
+        lru: bool = False,
+    ) -> SqliteStateCache:
+        """A shared cache bounded by `max_items` only.
+
+        `max_bytes` and `lru` are accepted so callers can size either backend
+        the same way, but do not apply on disk (see `SqliteStateCache`).
+        """
+        return SqliteStateCache(self, namespace, ttl_seconds=ttl_seconds, max_items=max_items)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for this worker; `counters` is None while the database is unavailable."""
+        counters: Optional[int] = None
+        try:
+            (counters,) = self.connection().execute("SELECT count(*) FROM state_counters").fetchone()
+        except sqlite3.Error as exc:
+            self.failed("stats", exc)
+        with self._lock:
+            errors = self._errors
+        return {"backend": "sqlite", "path": self._path, "counters": counters, "errors": errors}
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            Path(self._path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self._path, timeout=settings.state_db_busy_timeout_ms / 1000.0, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            conn.commit()
+            self._local.conn = conn
+        return conn
+
+
+StateCache = Union[TTLCache[str, Any], SqliteStateCache]
+
+
+def _create_backend() -> Union[InProcessStateBackend, SqliteStateBackend]:
+    if settings.state_backend == "sqlite":
+        return SqliteStateBackend(settings.state_db_path)
+    return InProcessStateBackend()
+
+
+state_backend = _create_backend()
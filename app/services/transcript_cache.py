@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.schemas.chat import AudioTranscriptionResult
+from app.utils.ttl_cache import TTLCache
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+
+class TranscriptCache:
+    """Content-addressed transcript cache.
+
+    Keys are SHA-256 hex digests of the raw audio bytes, so a forwarded voice note
+    is transcribed once no matter who uploads it. Entries (transcript, provider,
+    language) live in a bounded in-memory TTL cache and, when
+    `TRANSCRIPT_CACHE_DIR` is set, are also persisted as small JSON files.
+    """
+
+    def __init__(self) -> None:
+        self._memory: TTLCache[str, AudioTranscriptionResult] = TTLCache(
+            ttl_seconds=float(settings.transcript_cache_ttl_seconds),
+            max_items=settings.transcript_cache_max_items,
+        )
+        self._dir = Path(settings.transcript_cache_dir) if settings.transcript_cache_dir else None
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return settings.transcript_cache_enabled
+
+    async def get(self, key: str) -> Optional[AudioTranscriptionResult]:
+        result = self._memory.get(key)
+        if result is None and self._dir is not None:
+            result = await asyncio.to_thread(self._read, key)
+            if result is not None:
+                self._disk_hits += 1
+                self._memory.set(key, result)
+        if result is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        return result
+
+    async def set(self, key: str, result: AudioTranscriptionResult) -> None:
+        # Failures, empty transcripts and transcripts with gaps from failed
+        # chunks should be retried next time, not remembered.
+        if result.provider == "unavailable" or not result.transcript or result.partial:
+            return
+        self._memory.set(key, result)
+        if self._dir is not None:
+            try:
+                await asyncio.to_thread(self._write, key, result)
+            except OSError as exc:
+                logger.warning("Transcript cache write failed", error=str(exc))
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._hits + self._misses
+        return {
+            "enabled": self.enabled,
+            "persistent": self._dir is not None,
+            "hits": self._hits,
+            "disk_hits": self._disk_hits,
+            "misses": self._misses,
+            "hit_rate": (self._hits / lookups) if lookups else 0.0,
+        }
+
+    def _path(self, key: str) -> Path:
+        assert self._dir is not None
+        return self._dir / key[:2] / f"{key}.json"
+
+    def _read(self, key: str) -> Optional[AudioTranscriptionResult]:
+        try:
+            raw = self._path(key).read_text(encoding="utf-8")
+            return AudioTranscriptionResult.model_validate_json(raw)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning("Transcript cache entry unreadable", key=key, error=str(exc))
+            return None
+
+    def _write(self, key: str, result: AudioTranscriptionResult) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(result.model_dump(), ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+transcript_cache = TranscriptCache()
@@ -1,61 +1,418 @@
 from __future__ import annotations
 
-from typing import Optional
+import asyncio
+import importlib.util
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Union
 
+import numpy as np
+
+from app.core.config import get_settings
 from app.core.logging import get_logger
 from app.schemas.chat import AudioTranscriptionResult
+from app.services import whisper_worker
+from app.services.audio_preprocessing import NormalizedAudio, audio_normalizer, encode_wav, split_at_silence
 from app.services.bhashini_client import BhashiniClientError, bhashini_client
+from app.services.transcript_cache import transcript_cache
+from app.utils.latency import LatencyTracker
+from app.utils.micro_batch import MicroBatcher
+from app.utils.uploads import SpooledUpload
 
 logger = get_logger(__name__)
+settings = get_settings()
+
+# Encoded audio bytes, or 16 kHz mono int16 samples from the normalizer.
+WhisperInput = Union[bytes, np.ndarray]
+
+_WAV_HEADER_BYTES = 44
 
 
 class WhisperTranscriber:
-    """Local Whisper fallback.
+    """Local Whisper fallback served from a process pool.
 
-    Uses `whisper` if installed. If not installed, returns unavailable.
+    Each worker process loads the model once (eagerly at startup when
+    `WHISPER_PRELOAD` is set) and inference runs off the event loop. Returns
+    unavailable when `whisper` is not installed or the pool fails.
     """
 
-    async def transcribe(self, audio_bytes: bytes) -> AudioTranscriptionResult:
-        try:
-            import tempfile
+    def __init__(self) -> None:
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._installed = importlib.util.find_spec("whisper") is not None
+        # Concurrent fallbacks are collected for a few milliseconds and decoded
+        # together; one batch in flight per worker keeps every worker busy.
+        self._batcher: MicroBatcher[WhisperInput, Dict[str, Any]] = MicroBatcher(
+            self._transcribe_batch,
+            max_batch_size=settings.whisper_batch_max_size,
+            max_wait_seconds=settings.whisper_batch_max_wait_ms / 1000.0,
+            max_concurrent_batches=settings.whisper_workers,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return settings.whisper_enabled and self._installed
+
+    async def start(self) -> None:
+        if not self.enabled or self._pool is not None:
+            return
+        # Spawn rather than fork: the parent has a running event loop and threads.
+        self._pool = ProcessPoolExecutor(
+            max_workers=settings.whisper_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=whisper_worker.init_worker,
+            initargs=(settings.whisper_model,),
+        )
+        if settings.whisper_preload:
+            loop = asyncio.get_running_loop()
+            try:
+                await asyncio.gather(
+                    *(loop.run_in_executor(self._pool, whisper_worker.ping) for _ in range(settings.whisper_workers))
+                )
+                logger.info("Whisper workers ready", model=settings.whisper_model, workers=settings.whisper_workers)
+            except Exception as exc:
+                logger.warning("Whisper workers failed to start", error=str(exc))
 
-            import whisper  # type: ignore
-        except Exception:
+    async def aclose(self) -> None:
+        await self._batcher.aclose()
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            await asyncio.to_thread(pool.shutdown, wait=True, cancel_futures=True)
+
+    async def transcribe(self, audio: WhisperInput) -> AudioTranscriptionResult:
+        """Transcribe encoded audio bytes or normalized 16 kHz int16 samples."""
+        if not self.enabled:
+            return AudioTranscriptionResult(transcript="", provider="unavailable", language=None)
+        if self._pool is None:
+            await self.start()
+
+        try:
+            if settings.whisper_batch_enabled:
+                result = await self._batcher.submit(audio)
+            else:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(self._pool, whisper_worker.transcribe, audio)
+        except Exception as exc:
+            logger.warning("Whisper transcription failed", error=str(exc))
             return AudioTranscriptionResult(transcript="", provider="unavailable", language=None)
+        return AudioTranscriptionResult(transcript=result["text"], provider="whisper", language=result["language"])
 
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=True) as tmp:
-            tmp.write(audio_bytes)
-            tmp.flush()
-            model = whisper.load_model("base")
-            result = model.transcribe(tmp.name)
-            text = (result or {}).get("text") or ""
-            lang = (result or {}).get("language")
-            return AudioTranscriptionResult(transcript=str(text).strip(), provider="whisper", language=lang)
+    def stats(self) -> Dict[str, Any]:
+        return {"enabled": self.enabled, "batching": self._batcher.stats()}
+
+    async def _transcribe_batch(self, items: List[WhisperInput]) -> List[Dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, whisper_worker.transcribe_batch, items)
 
 
 class AudioTranscriptionService:
     def __init__(self) -> None:
         self._whisper = WhisperTranscriber()
+        self._normalized_clips = 0
+        self._normalized_input_bytes = 0
+        self._normalized_output_bytes = 0
+        self._trimmed_seconds = 0.0
+        self._chunked_clips = 0
+        self._chunks = 0
+        # Whole clips and silence-split chunks take different times, so each
+        # learns its own race delay.
+        self._bhashini_latency = {
+            kind: LatencyTracker(
+                window=settings.transcription_race_latency_window,
+                min_samples=settings.transcription_race_min_samples,
+            )
+            for kind in ("clip", "chunk")
+        }
+        self._races = 0
+        self._race_wins = {"bhashini": 0, "whisper": 0}
+        self._race_saved_seconds = 0.0
+        self._background: Set["asyncio.Task[None]"] = set()
 
-    async def transcribe(
-        self,
-        audio_bytes: bytes,
-        filename: str,
-        content_type: str,
-    ) -> AudioTranscriptionResult:
-        if not audio_bytes:
+    async def start(self) -> None:
+        await self._whisper.start()
+
+    async def aclose(self) -> None:
+        for task in list(self._background):
+            task.cancel()
+        await self._whisper.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "cache": transcript_cache.stats(),
+            "normalization": {
+                "enabled": settings.audio_normalization_enabled,
+                "clips": self._normalized_clips,
+                "input_bytes": self._normalized_input_bytes,
+                "output_bytes": self._normalized_output_bytes,
+                "trimmed_seconds": round(self._trimmed_seconds, 3),
+            },
+            "chunking": {
+                "enabled": settings.audio_chunking_enabled,
+                "clips": self._chunked_clips,
+                "chunks": self._chunks,
+            },
+            "race": {
+                "policy": settings.transcription_policy,
+                "delay_seconds": {kind: self._race_delay(kind) for kind in self._bhashini_latency},
+                "races": self._races,
+                "bhashini_wins": self._race_wins["bhashini"],
+                "whisper_wins": self._race_wins["whisper"],
+                "latency_saved_seconds_min": round(self._race_saved_seconds, 3),
+            },
+            "whisper": self._whisper.stats(),
+        }
+
+    async def transcribe(self, audio: SpooledUpload) -> AudioTranscriptionResult:
+        if not audio.size:
+            return AudioTranscriptionResult(transcript="", provider="unavailable", language=None)
+
+        cached = await self._cached(audio)
+        if cached is not None:
+            return cached
+        result = _join_parts([part async for part in self._iter_transcript(audio)])
+        await self._store(audio, result)
+        return result
+
+    async def transcribe_early(self, audio: SpooledUpload, min_chars: int) -> AudioTranscriptionResult:
+        """Return as soon as the in-order transcript prefix reaches `min_chars`.
+
+        The remaining chunks keep transcribing in the background and the full
+        transcript still lands in the transcript cache (unless a chunk failed).
+        A result cut short, by the early return or by an error, is marked
+        `partial=True`.
+        """
+        if not audio.size:
             return AudioTranscriptionResult(transcript="", provider="unavailable", language=None)
 
+        cached = await self._cached(audio)
+        if cached is not None:
+            return cached
+
+        parts: List[AudioTranscriptionResult] = []
+        prefix_ready = asyncio.Event()
+        finished = False
+
+        async def run() -> None:
+            nonlocal finished
+            try:
+                async for part in self._iter_transcript(audio):
+                    parts.append(part)
+                    if len(_join_parts(parts).transcript) >= min_chars:
+                        prefix_ready.set()
+                finished = True
+                await self._store(audio, _join_parts(parts))
+            except Exception as exc:
+                # Nobody awaits this task; whatever was transcribed so far is partial.
+                logger.exception("Background transcription failed", exc_info=exc, chunks=len(parts))
+            finally:
+                prefix_ready.set()
+
+        task = asyncio.create_task(run())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        await prefix_ready.wait()
+
+        result = _join_parts(list(parts))
+        if not finished:
+            result = result.model_copy(update={"partial": True})
+        return result
+
+    async def _cached(self, audio: SpooledUpload) -> Optional[AudioTranscriptionResult]:
+        if not transcript_cache.enabled:
+            return None
+        # The upload pipeline already hashed the bytes on the way in.
+        return await transcript_cache.get(audio.sha256)
+
+    async def _store(self, audio: SpooledUpload, result: AudioTranscriptionResult) -> None:
+        if transcript_cache.enabled:
+            await transcript_cache.set(audio.sha256, result)
+
+    async def _iter_transcript(self, audio: SpooledUpload) -> AsyncIterator[AudioTranscriptionResult]:
+        """Yield transcript pieces in audio order.
+
+        Long normalized clips are split at silence and their chunks transcribed
+        concurrently, so each piece is yielded as soon as it and all earlier
+        pieces are done.
+        """
+        normalized = None
+        if settings.audio_normalization_enabled:
+            normalized = await audio_normalizer.normalize_upload(audio)
+        if normalized is None:
+            yield await self._transcribe_raw(audio)
+            return
+        self._record_normalization(audio, normalized)
+
+        stem = Path(audio.filename).stem or "audio"
+        spans = [(0, len(normalized.samples))]
+        if settings.audio_chunking_enabled:
+            spans = split_at_silence(
+                normalized.samples,
+                normalized.sample_rate,
+                min_chunk_seconds=settings.audio_chunk_min_seconds,
+                max_chunk_seconds=settings.audio_chunk_max_seconds,
+                frame_ms=settings.audio_vad_frame_ms,
+            )
+        if len(spans) == 1:
+            yield await self._transcribe_samples(normalized.samples, normalized.sample_rate, f"{stem}.wav", "clip")
+            return
+
+        self._chunked_clips += 1
+        self._chunks += len(spans)
+        semaphore = asyncio.Semaphore(settings.audio_chunk_concurrency)
+
+        async def run(index: int, begin: int, end: int) -> AudioTranscriptionResult:
+            async with semaphore:
+                return await self._transcribe_samples(
+                    normalized.samples[begin:end], normalized.sample_rate, f"{stem}-{index:03d}.wav", "chunk"
+                )
+
+        tasks = [asyncio.create_task(run(i, begin, end)) for i, (begin, end) in enumerate(spans)]
         try:
-            transcript = await bhashini_client.transcribe(
-                audio_bytes=audio_bytes,
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _transcribe_samples(
+        self, samples: np.ndarray, sample_rate: int, filename: str, kind: str
+    ) -> AudioTranscriptionResult:
+        async def bhashini() -> str:
+            return await bhashini_client.transcribe(
+                audio=encode_wav(samples, sample_rate),
                 filename=filename,
-                content_type=content_type,
+                content_type="audio/wav",
             )
+
+        return await self._race(bhashini, lambda: self._whisper.transcribe(samples), kind)
+
+    async def _transcribe_raw(self, audio: SpooledUpload) -> AudioTranscriptionResult:
+        async def bhashini() -> str:
+            # Stream the spooled part into the multipart request instead of materializing it.
+            with audio.open() as stream:
+                return await bhashini_client.transcribe(
+                    audio=stream,
+                    filename=audio.filename,
+                    content_type=audio.content_type,
+                )
+
+        async def whisper() -> AudioTranscriptionResult:
+            return await self._whisper.transcribe(await audio.read_bytes())
+
+        return await self._race(bhashini, whisper, "clip")
+
+    async def _race(
+        self,
+        bhashini: Callable[[], Awaitable[str]],
+        whisper: Callable[[], Awaitable[AudioTranscriptionResult]],
+        kind: str,
+    ) -> AudioTranscriptionResult:
+        """Bhashini first, Whisper as fallback or, under the race policy, as a hedge.
+
+        With `TRANSCRIPTION_POLICY=race`, Whisper is started alongside Bhashini
+        once Bhashini has been pending for longer than its learned latency
+        percentile (learned separately for whole clips and chunks, `kind`);
+        the first usable transcript wins and the other is cancelled. Reported
+        savings are lower bounds: had we waited, the sequential path would
+        have cost at least the Whisper time on top.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        latency = self._bhashini_latency[kind]
+
+        async def call_bhashini() -> AudioTranscriptionResult:
+            try:
+                transcript = await bhashini()
+            finally:
+                # Calls that fail or lose the race count at their elapsed time,
+                # a lower bound; leaving them out would bias the percentile low.
+                latency.record(loop.time() - started)
             return AudioTranscriptionResult(transcript=transcript, provider="bhashini", language=None)
-        except BhashiniClientError as exc:
-            logger.warning("Bhashini unavailable, falling back to Whisper", message=exc.message)
-            return await self._whisper.transcribe(audio_bytes)
+
+        bhashini_task = asyncio.ensure_future(call_bhashini())
+        pending: Set["asyncio.Future[AudioTranscriptionResult]"] = {bhashini_task}
+        try:
+            delay = self._race_delay(kind)
+            if delay is not None:
+                done, _ = await asyncio.wait(pending, timeout=delay)
+                if not done:
+                    return await self._run_race(bhashini_task, whisper, pending)
+            try:
+                return await bhashini_task
+            except BhashiniClientError as exc:
+                logger.warning("Bhashini unavailable, falling back to Whisper", message=exc.message)
+                return await whisper()
+        finally:
+            for task in pending:
+                if not task.done():
+                    task.cancel()
+
+    async def _run_race(
+        self,
+        bhashini_task: "asyncio.Future[AudioTranscriptionResult]",
+        whisper: Callable[[], Awaitable[AudioTranscriptionResult]],
+        pending: Set["asyncio.Future[AudioTranscriptionResult]"],
+    ) -> AudioTranscriptionResult:
+        loop = asyncio.get_running_loop()
+        whisper_started = loop.time()
+        whisper_task = asyncio.ensure_future(whisper())
+        pending.add(whisper_task)
+        self._races += 1
+
+        fallback: Optional[AudioTranscriptionResult] = None
+        # Whisper's head start when Bhashini failed first; only a saving if Whisper delivers.
+        head_start = 0.0
+        while bhashini_task in pending or whisper_task in pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            pending.difference_update(done)
+            if bhashini_task in done:
+                exc = bhashini_task.exception()
+                if exc is None:
+                    self._race_wins["bhashini"] += 1
+                    return bhashini_task.result()
+                logger.warning("Bhashini failed during race", message=getattr(exc, "message", str(exc)))
+                if not isinstance(exc, BhashiniClientError):
+                    raise exc
+                head_start = loop.time() - whisper_started
+            if whisper_task in done:
+                result = whisper_task.result()
+                if result.provider != "unavailable" or bhashini_task not in pending:
+                    if result.provider != "unavailable":
+                        self._race_wins["whisper"] += 1
+                        self._race_saved_seconds += (
+                            loop.time() - whisper_started if bhashini_task in pending else head_start
+                        )
+                    return result
+                fallback = result
+        assert fallback is not None
+        return fallback
+
+    def _race_delay(self, kind: str) -> Optional[float]:
+        if settings.transcription_policy != "race" or not self._whisper.enabled:
+            return None
+        learned = self._bhashini_latency[kind].percentile(settings.transcription_race_percentile)
+        if learned is None:
+            return settings.transcription_race_default_delay_seconds
+        return max(learned, settings.transcription_race_min_delay_seconds)
+
+    def _record_normalization(self, audio: SpooledUpload, normalized: NormalizedAudio) -> None:
+        self._normalized_clips += 1
+        self._normalized_input_bytes += audio.size
+        self._normalized_output_bytes += normalized.samples.nbytes + _WAV_HEADER_BYTES
+        self._trimmed_seconds += max(0.0, normalized.original_seconds - normalized.duration_seconds)
+
+
+def _join_parts(parts: List[AudioTranscriptionResult]) -> AudioTranscriptionResult:
+    """Concatenate chunk transcripts in order; a failed chunk leaves a gap, so the result is partial."""
+    texts = [p.transcript.strip() for p in parts if p.transcript.strip()]
+    providers = [p.provider for p in parts if p.provider != "unavailable"]
+    languages = [p.language for p in parts if p.language]
+    return AudioTranscriptionResult(
+        transcript=" ".join(texts),
+        provider=providers[0] if providers else "unavailable",
+        language=languages[0] if languages else None,
+        partial=bool(providers) and len(providers) < len(parts),
+    )
 
 
 audio_transcription_service = AudioTranscriptionService()
@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from threading import RLock
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.core.logging import get_logger, get_thread_logger
+from app.schemas.chat import ChatConfidence, ChatResponse
+from app.schemas.officer import EscalationRecord
+from app.services.escalation_store import EscalationFilter, escalation_store
+from app.utils.minhash import MinHasher, MinHashLSHIndex, normalize_text
+
+logger = get_logger(__name__)
+thread_logger = get_thread_logger(__name__)
+settings = get_settings()
+
+# Words that never change what is being asked. Negations, numbers, crops and
+# question words are all content.
+_FILLER_WORDS = frozenset(
+    "a an the i me my we our you your is are am was were be been please kindly sir madam".split()
+)
+
+
+@dataclass(frozen=True)
+class VerifiedAnswer:
+    escalation_id: str
+    created_at: datetime
+    question: str
+    content: Tuple[str, ...]
+    response_text: str
+    citations: Tuple[Any, ...]
+
+
+def _question(inputs: Dict[str, Any]) -> Optional[str]:
+    """The farmer's question, if the answer can depend on it alone."""
+    if inputs.get("image_filename") or inputs.get("image_predictions"):
+        return None
+    if inputs.get("audio_transcript_partial"):
+        return None
+    # A farmer may type part of the question and say the rest; both count.
+    pieces = (inputs.get("text"), inputs.get("audio_transcript"))
+    question = " ".join(piece.strip() for piece in pieces if piece and piece.strip())
+    if len(question) < settings.verified_answers_min_question_chars:
+        return None
+    return question
+
+
+def _content_words(question: str) -> Tuple[str, ...]:
+    """The question's words in order, casefolded, without punctuation or filler words."""
+    return tuple(word for word in normalize_text(question).split() if word not in _FILLER_WORDS)
+
+
+class VerifiedAnswerIndex:
+    """Officer-verified answers, looked up by near-duplicate question text.
+
+    Questions are indexed by MinHash signatures of their character shingles
+    (`app/utils/minhash.py`). A query matches a verified question only when
+    the estimated Jaccard similarity reaches `VERIFIED_ANSWERS_MIN_SIMILARITY`
+    and both have the same content words in the same order, so "tomato" vs
+    "potato" or an added "not" never match however similar the text. The
+    question is the typed text and the audio transcript together. The answer
+    is returned as the officer wrote it, at Medium confidence, with the
+    question it was verified for in `reason`. Questions with an image are
+    never indexed or matched, since the answer depends on the photo.
+
+    The index is filled from the escalation store at startup, as officers
+    respond through this process, and every `VERIFIED_ANSWERS_REFRESH_SECONDS`
+    from the store's verification log (answers given through other workers).
+    Only the newest answer among matching questions is kept; the oldest
+    answers are dropped beyond `VERIFIED_ANSWERS_MAX_ITEMS`.
+    """
+
+    def __init__(self) -> None:
+        self._hasher = MinHasher(
+            num_perm=settings.verified_answers_num_perm,
+            shingle_size=settings.verified_answers_shingle_size,
+        )
+        self._index: MinHashLSHIndex[str] = MinHashLSHIndex(
+            num_perm=settings.verified_answers_num_perm,
+            bands=settings.verified_answers_bands,
+        )
+        self._answers: "OrderedDict[str, VerifiedAnswer]" = OrderedDict()
+        self._lock = RLock()
+        self._loader: Optional[asyncio.Task[None]] = None
+        self._cursor = 0
+        self._refreshed = 0
+        self._lookups = 0
+        self._hits = 0
+
+    @property
+    def enabled(self) -> bool:
+        return settings.verified_answers_enabled
+
+    async def start(self) -> None:
+        """Load verified escalations, then keep refreshing, in the background; lookups work meanwhile."""
+        if self.enabled and self._loader is None:
+            self._loader = asyncio.create_task(self._run())
+
+    async def aclose(self) -> None:
+        loader, self._loader = self._loader, None
+        if loader is not None:
+            loader.cancel()
+            await asyncio.gather(loader, return_exceptions=True)
+
+    async def _run(self) -> None:
+        await asyncio.to_thread(self.rebuild)
+        while True:
+            await asyncio.sleep(settings.verified_answers_refresh_seconds)
+            await asyncio.to_thread(self.refresh)
+
+    def rebuild(self) -> int:
+        """Index the newest verified, image-free escalations in the store."""
+        filters = EscalationFilter(verified=True, has_image=False)
+        prepared: List[Tuple[VerifiedAnswer, np.ndarray]] = []
+        page: Optional[str] = None
+        try:
+            # Anything verified from here on is picked up by `refresh`.
+            self._cursor = escalation_store.verification_cursor()
+            while len(prepared) < settings.verified_answers_max_items:
+                records, page = escalation_store.list_page(filters, limit=500, cursor=page)
+                prepared.extend(item for item in map(self._prepare, records) if item is not None)
+                if not page:
+                    break
+        except Exception as exc:
+            thread_logger.warning("Verified answer index rebuild failed", error=str(exc), loaded=len(prepared))
+        # Pages are newest first; insert oldest first so eviction order holds.
+        # Answers indexed live while this ran are kept.
+        loaded = 0
+        for answer, signature in reversed(prepared[: settings.verified_answers_max_items]):
+            loaded += self._insert(answer, signature, replace=False)
+        return loaded
+
+    def refresh(self) -> int:
+        """Index answers verified since the last refresh, including through other workers."""
+        added = 0
+        try:
+            while True:
+                records, cursor = escalation_store.verified_since(self._cursor, limit=500)
+                if not records:
+                    break
+                self._cursor = cursor
+                added += sum(self.add(record) for record in records)
+        except Exception as exc:
+            thread_logger.warning("Verified answer index refresh failed", error=str(exc))
+        with self._lock:
+            self._refreshed += added
+        return added
+
+    def add(self, record: EscalationRecord) -> bool:
+        """Index an officer-verified escalation. Returns False if it cannot be reused."""
+        prepared = self._prepare(record)
+        return prepared is not None and self._insert(*prepared, replace=True)
+
+    def _prepare(self, record: EscalationRecord) -> Optional[Tuple[VerifiedAnswer, np.ndarray]]:
+        verified = record.verified_response
+        inputs = record.context.get("inputs") if isinstance(record.context, dict) else None
+        question = _question(inputs) if isinstance(inputs, dict) else None
+        if verified is None or question is None:
+            return None
+        signature = self._hasher.signature(question)
+        if signature is None:
+            return None
+        answer = VerifiedAnswer(
+            escalation_id=record.id,
+            created_at=record.created_at,
+            question=question,
+            content=_content_words(question),
+            response_text=verified.response_text,
+            citations=tuple(verified.citations),
+        )
+        return answer, signature
+
+    def _insert(self, answer: VerifiedAnswer, signature: np.ndarray, replace: bool) -> bool:
+        with self._lock:
+            if not replace and answer.escalation_id in self._answers:
+                return False
+            # One answer per question: the answer to the most recent of
+            # matching questions wins, which also keeps LSH buckets small.
+            duplicate = self._find(signature, answer.content)
+            if duplicate is not None and duplicate[0].escalation_id != answer.escalation_id:
+                if duplicate[0].created_at > answer.created_at:
+                    return False
+                del self._answers[duplicate[0].escalation_id]
+                self._index.remove(duplicate[0].escalation_id)
+            self._answers[answer.escalation_id] = answer
+            self._answers.move_to_end(answer.escalation_id)
+            self._index.add(answer.escalation_id, signature)
+            while len(self._answers) > settings.verified_answers_max_items:
+                oldest, _ = self._answers.popitem(last=False)
+                self._index.remove(oldest)
+        return True
+
+    def _find(self, signature: np.ndarray, content: Tuple[str, ...]) -> Optional[Tuple[VerifiedAnswer, float]]:
+        for escalation_id, similarity in self._index.candidates(signature, settings.verified_answers_min_similarity):
+            answer = self._answers[escalation_id]
+            if answer.content == content:
+                return answer, similarity
+        return None
+
+    def match(self, context: Dict[str, Any]) -> Optional[ChatResponse]:
+        """A verified answer to the same question, at Medium confidence."""
+        if not self.enabled:
+            return None
+        inputs = context.get("inputs") or {}
+        question = _question(inputs)
+        if question is None:
+            return None
+        signature = self._hasher.signature(question)
+        if signature is None:
+            return None
+        with self._lock:
+            self._lookups += 1
+            found = self._find(signature, _content_words(question))
+            if found is None:
+                return None
+            answer, similarity = found
+            self._hits += 1
+        return ChatResponse(
+            # Left as the officer wrote it, in the farmer's language.
+            response_text=answer.response_text,
+            # The officer verified the answer, not that this farmer asked the same thing.
+            confidence=ChatConfidence.MEDIUM,
+            citations=list(answer.citations),
+            escalate=False,
+            reason=f'Officer-verified answer to "{answer.question}" (similarity {similarity:.2f})',
+            audio_output_url="",
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._answers),
+                "lookups": self._lookups,
+                "hits": self._hits,
+                "hit_rate": (self._hits / self._lookups) if self._lookups else 0.0,
+                "refreshed": self._refreshed,
+            }
+
+
+verified_answer_index = VerifiedAnswerIndex()
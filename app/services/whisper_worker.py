@@ -0,0 +1,135 @@
+"""Entry points executed inside Whisper worker processes.
+
+Kept free of application imports so that spawned workers start quickly and
+load nothing but the model.
+"""
+from __future__ import annotations
+
+import subprocess
+from typing import Any, Dict, List, Optional, Union
+
+SAMPLE_RATE = 16000
+
+_model: Optional[Any] = None
+
+
+def init_worker(model_name: str) -> None:
+    """Process-pool initializer: load the model once per worker."""
+    global _model
+    import whisper  # type: ignore
+
+    _model = whisper.load_model(model_name)
+
+
+def ping() -> bool:
+    return _model is not None
+
+
+def decode_audio(audio_bytes: bytes) -> Any:
+    """Decode any ffmpeg-readable audio to 16 kHz mono float32 via pipes (no temp files)."""
+    import numpy as np
+
+    cmd = [
+        "ffmpeg",
+        "-loglevel", "error",
+        "-i", "pipe:0",
+        "-f", "s16le",
+        "-ac", "1",
+        "-ar", str(SAMPLE_RATE),
+        "pipe:1",
+    ]
+    proc = subprocess.run(cmd, input=audio_bytes, capture_output=True, check=True)
+    return np.frombuffer(proc.stdout, np.int16).astype(np.float32) / 32768.0
+
+
+def load_audio(audio: Union[bytes, Any]) -> Any:
+    """Float32 samples from encoded bytes or from pre-normalized 16 kHz int16 PCM."""
+    if isinstance(audio, (bytes, bytearray)):
+        return decode_audio(bytes(audio))
+    import numpy as np
+
+    return np.asarray(audio, dtype=np.float32) / 32768.0
+
+
+# `model.transcribe` defaults, applied to batched windows too, so a clip's
+# transcript does not depend on whether it happened to be batched.
+TEMPERATURES = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+COMPRESSION_RATIO_THRESHOLD = 2.4
+LOGPROB_THRESHOLD = -1.0
+NO_SPEECH_THRESHOLD = 0.6
+
+
+def transcribe(audio: Union[bytes, Any]) -> Dict[str, Any]:
+    if _model is None:
+        raise RuntimeError("Whisper worker is not initialized")
+    result = _model.transcribe(
+        load_audio(audio),
+        fp16=False,
+        temperature=TEMPERATURES,
+        compression_ratio_threshold=COMPRESSION_RATIO_THRESHOLD,
+        logprob_threshold=LOGPROB_THRESHOLD,
+        no_speech_threshold=NO_SPEECH_THRESHOLD,
+    ) or {}
+    return {"text": str(result.get("text") or "").strip(), "language": result.get("language")}
+
+
+def transcribe_batch(items: List[Union[bytes, Any]]) -> List[Dict[str, Any]]:
+    """Transcribe several clips with batched decoder passes.
+
+    Clips that fit in Whisper's 30 s window are stacked into a single mel batch
+    and decoded together, with the same temperature fallback and silence
+    handling as `transcribe`: clips whose output looks degenerate (compression
+    ratio or average log-probability past the thresholds) are decoded again,
+    as a smaller batch, at the next temperature. A batch of one and clips
+    longer than 30 s go through `transcribe`.
+    """
+    if _model is None:
+        raise RuntimeError("Whisper worker is not initialized")
+    if len(items) == 1:
+        return [transcribe(items[0])]
+    import torch
+    import whisper  # type: ignore
+
+    audios = [load_audio(item) for item in items]
+    results: List[Dict[str, Any]] = [{} for _ in items]
+
+    short = [i for i, audio in enumerate(audios) if len(audio) <= whisper.audio.N_SAMPLES]
+    for i, audio in enumerate(audios):
+        if i not in short:
+            results[i] = transcribe(items[i])
+
+    if short:
+        mels = torch.stack(
+            [
+                whisper.log_mel_spectrogram(whisper.pad_or_trim(audios[i]), n_mels=_model.dims.n_mels)
+                for i in short
+            ]
+        ).to(_model.device)
+        for i, d in zip(short, _decode_with_fallback(whisper, mels)):
+            silent = d.no_speech_prob > NO_SPEECH_THRESHOLD and d.avg_logprob <= LOGPROB_THRESHOLD
+            results[i] = {"text": "" if silent else d.text.strip(), "language": d.language}
+    return results
+
+
+def _decode_with_fallback(whisper: Any, mels: Any) -> List[Any]:
+    """`whisper.decode` over a mel batch, retrying degenerate rows at higher temperatures."""
+    decoded: List[Any] = [None] * len(mels)
+    remaining = list(range(len(mels)))
+    for temperature in TEMPERATURES:
+        options = whisper.DecodingOptions(fp16=False, temperature=temperature)
+        retry: List[int] = []
+        for i, d in zip(remaining, whisper.decode(_model, mels[remaining], options)):
+            decoded[i] = d
+            if _needs_fallback(d):
+                retry.append(i)
+        remaining = retry
+        if not remaining:
+            break
+    return decoded
+
+
+def _needs_fallback(d: Any) -> bool:
+    # As in `whisper.transcribe`: silence is not retried, degenerate text is.
+    if d.no_speech_prob > NO_SPEECH_THRESHOLD and d.avg_logprob < LOGPROB_THRESHOLD:
+        return False
+    return d.compression_ratio > COMPRESSION_RATIO_THRESHOLD or d.avg_logprob < LOGPROB_THRESHOLD
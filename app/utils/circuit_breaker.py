@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from threading import RLock
+from typing import Any, Deque, Dict
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True)
+class CircuitOpenError(Exception):
+    name: str
+    retry_after_seconds: float
+
+
+class CircuitBreaker:
+    """Count-based circuit breaker.
+
+    The outcome of the last `window_size` calls is kept; a call is "bad" when it
+    failed or took longer than `slow_call_seconds`. Once at least `min_calls`
+    outcomes exist and the bad ratio reaches `failure_ratio` the circuit opens
+    and `allow()` fails fast for `open_seconds`. After that a single trial call
+    is let through (half-open): a fast success closes the circuit, anything else
+    re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window_size: int = 20,
+        min_calls: int = 10,
+        failure_ratio: float = 0.5,
+        slow_call_seconds: float = 10.0,
+        open_seconds: float = 30.0,
+    ) -> None:
+        self._name = name
+        self._min_calls = min_calls
+        self._failure_ratio = failure_ratio
+        self._slow_call_seconds = slow_call_seconds
+        self._open_seconds = open_seconds
+        self._outcomes: Deque[bool] = deque(maxlen=window_size)
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._trial_started_at = 0.0
+        self._lock = RLock()
+        self._rejected = 0
+        self._times_opened = 0
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            self._maybe_half_open_locked(time.monotonic())
+            return self._state
+
+    def allow(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._maybe_half_open_locked(now)
+            if self._state == CircuitState.CLOSED:
+                return
+            if self._state == CircuitState.HALF_OPEN and (
+                # A trial that never reported back (e.g. cancelled) must not wedge the circuit.
+                not self._trial_in_flight or now - self._trial_started_at >= self._open_seconds
+            ):
+                self._trial_in_flight = True
+                self._trial_started_at = now
+                return
+            self._rejected += 1
+            retry_after = max(0.0, self._opened_at + self._open_seconds - now)
+            raise CircuitOpenError(self._name, retry_after)
+
+    def record_success(self, duration_seconds: float) -> None:
+        slow = duration_seconds >= self._slow_call_seconds
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN:
+                self._trial_in_flight = False
+                if slow:
+                    self._open_locked()
+                else:
+                    self._state = CircuitState.CLOSED
+                    self._outcomes.clear()
+                return
+            self._record_locked(bad=slow)
+
+    def record_failure(self, duration_seconds: float) -> None:
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN:
+                self._trial_in_flight = False
+                self._open_locked()
+                return
+            self._record_locked(bad=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._maybe_half_open_locked(time.monotonic())
+            bad = sum(1 for o in self._outcomes if o)
+            return {
+                "state": self._state.value,
+                "window_calls": len(self._outcomes),
+                "window_bad_calls": bad,
+                "times_opened": self._times_opened,
+                "rejected": self._rejected,
+            }
+
+    def _record_locked(self, bad: bool) -> None:
+        self._outcomes.append(bad)
+        if self._state != CircuitState.CLOSED or len(self._outcomes) < self._min_calls:
+            return
+        bad_ratio = sum(1 for o in self._outcomes if o) / len(self._outcomes)
+        if bad_ratio >= self._failure_ratio:
+            self._open_locked()
+
+    def _open_locked(self) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self._times_opened += 1
+        self._outcomes.clear()
+
+    def _maybe_half_open_locked(self, now: float) -> None:
+        if self._state == CircuitState.OPEN and now - self._opened_at >= self._open_seconds:
+            self._state = CircuitState.HALF_OPEN
+            self._trial_in_flight = False
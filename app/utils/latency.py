@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import math
+from collections import deque
+from threading import RLock
+from typing import Deque, Optional
+
+
+class LatencyTracker:
+    """Rolling window of recent latencies (seconds) with percentile lookup."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20) -> None:
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._min_samples = min_samples
+        self._lock = RLock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Nearest-rank percentile for `q` in [0, 1]; None until enough samples exist."""
+        with self._lock:
+            if len(self._samples) < self._min_samples:
+                return None
+            ordered = sorted(self._samples)
+        rank = max(1, math.ceil(q * len(ordered)))
+        return ordered[rank - 1]
+
+    def __len__(self) -> int:
+        return len(self._samples)
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Generic, List, Optional, Set, Tuple, TypeVar
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """Group concurrent submissions into small batches.
+
+    The first pending item opens a batch window of `max_wait_seconds`; the batch
+    is dispatched when the window closes or `max_batch_size` items are pending.
+    `process_batch` receives the items in submission order and must return one
+    result per item. Up to `max_concurrent_batches` batches run at once.
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[T]], Awaitable[List[R]]],
+        max_batch_size: int = 8,
+        max_wait_seconds: float = 0.02,
+        max_concurrent_batches: int = 1,
+    ) -> None:
+        self._process_batch = process_batch
+        self._max_batch_size = max(1, max_batch_size)
+        self._max_wait_seconds = max_wait_seconds
+        self._max_concurrent_batches = max(1, max_concurrent_batches)
+        self._queue: Optional["asyncio.Queue[Tuple[T, asyncio.Future[R]]]"] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._runner: Optional["asyncio.Task[None]"] = None
+        self._dispatching: Set["asyncio.Task[None]"] = set()
+        self._batches = 0
+        self._items = 0
+
+    async def submit(self, item: T) -> R:
+        self._ensure_runner()
+        assert self._queue is not None
+        future: asyncio.Future[R] = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def aclose(self) -> None:
+        runner, self._runner = self._runner, None
+        if runner is not None:
+            runner.cancel()
+            try:
+                await runner
+            except asyncio.CancelledError:
+                pass
+        self._queue = None
+        self._semaphore = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self._batches,
+            "items": self._items,
+            "avg_batch_size": (self._items / self._batches) if self._batches else 0.0,
+        }
+
+    def _ensure_runner(self) -> None:
+        if self._runner is None or self._runner.done():
+            self._queue = asyncio.Queue()
+            self._semaphore = asyncio.Semaphore(self._max_concurrent_batches)
+            self._runner = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        assert self._queue is not None and self._semaphore is not None
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._max_wait_seconds
+            while len(batch) < self._max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+            await self._semaphore.acquire()
+            task = asyncio.create_task(self._dispatch(batch))
+            self._dispatching.add(task)
+            task.add_done_callback(self._dispatching.discard)
+
+    async def _dispatch(self, batch: List[Tuple[T, "asyncio.Future[R]"]]) -> None:
+        assert self._semaphore is not None
+        semaphore = self._semaphore
+        try:
+            # Callers that went away while queued do not cost inference time.
+            live = [(item, fut) for item, fut in batch if not fut.done()]
+            if not live:
+                return
+            self._batches += 1
+            self._items += len(live)
+            try:
+                results = await self._process_batch([item for item, _ in live])
+                if len(results) != len(live):
+                    raise RuntimeError("Batch processor returned a mismatched number of results")
+            except Exception as exc:
+                for _, fut in live:
+                    if not fut.done():
+                        fut.set_exception(exc)
+                return
+            for (_, fut), result in zip(live, results):
+                if not fut.done():
+                    fut.set_result(result)
+        finally:
+            semaphore.release()
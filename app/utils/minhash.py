@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import re
+from threading import RLock
+from typing import Dict, Generic, List, Optional, Set, Tuple, TypeVar
+
+import numpy as np
+
+K = TypeVar("K")
+
+_SHIFT = np.uint64(32)
+_SHINGLE_BASE = np.uint32(0x01000193)
+
+_SEPARATORS = re.compile(r"[\s.,;:!?।॥\"'()\[\]\-]+")
+
+
+def normalize_text(text: str) -> str:
+    """Casefold and collapse whitespace and punctuation to single spaces."""
+    return _SEPARATORS.sub(" ", text.casefold()).strip()
+
+
+def shingle_hashes(text: str, size: int) -> np.ndarray:
+    """Distinct 32-bit hashes of the character `size`-grams of `text` (already normalized).
+
+    Texts shorter than `size` hash as a single shingle.
+    """
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    if codes.size == 0:
+        return codes
+    size = min(size, codes.size)
+    count = codes.size - size + 1
+    hashes = np.zeros(count, dtype=np.uint32)
+    for offset in range(size):
+        # Polynomial rolling hash over code points, wrapping at 32 bits.
+        hashes = hashes * _SHINGLE_BASE + codes[offset : offset + count]
+    return np.unique(hashes)
+
+
+class MinHasher:
+    """Fixed-length MinHash signatures of character shingle sets.
+
+    The fraction of equal positions in two signatures estimates the Jaccard
+    similarity of the shingle sets (standard error about `1 / sqrt(num_perm)`).
+    """
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 4, seed: int = 1) -> None:
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        # Multiply-add-shift: the high 32 bits of (a * h + b) mod 2**64, with odd
+        # a, are a universal hash of 32-bit h and need no modulo.
+        self._a = rng.integers(0, 1 << 63, size=(num_perm, 1), dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.integers(0, 1 << 63, size=(num_perm, 1), dtype=np.uint64)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """Signature of `text`, or None when it has no content after normalization."""
+        hashes = shingle_hashes(normalize_text(text), self.shingle_size)
+        if hashes.size == 0:
+            return None
+        permuted = (self._a * hashes.astype(np.uint64)[None, :] + self._b) >> _SHIFT
+        return permuted.min(axis=1).astype(np.uint32)
+
+
+class MinHashLSHIndex(Generic[K]):
+    """Near-duplicate lookup over MinHash signatures with LSH banding.
+
+    Signatures are split into `bands` bands of `num_perm / bands` rows, and
+    keys are bucketed by each band's exact values; two texts with Jaccard
+    similarity s share at least one bucket with probability
+    1 - (1 - s**rows)**bands. Candidates from the query's buckets are then
+    scored against the stored signatures in one vectorized comparison.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self._rows = num_perm // bands
+        self._tables: List[Dict[bytes, Set[int]]] = [{} for _ in range(bands)]
+        self._signatures = np.zeros((64, num_perm), dtype=np.uint32)
+        self._slots: Dict[K, int] = {}
+        self._keys: List[Optional[K]] = []
+        self._free: List[int] = []
+        self._lock = RLock()
+
+    def add(self, key: K, signature: np.ndarray) -> None:
+        with self._lock:
+            self.remove(key)
+            slot = self._free.pop() if self._free else self._allocate()
+            self._signatures[slot] = signature
+            self._keys[slot] = key
+            self._slots[key] = slot
+            for table, band in zip(self._tables, self._band_keys(signature)):
+                table.setdefault(band, set()).add(slot)
+
+    def remove(self, key: K) -> None:
+        with self._lock:
+            slot = self._slots.pop(key, None)
+            if slot is None:
+                return
+            for table, band in zip(self._tables, self._band_keys(self._signatures[slot])):
+                bucket = table.get(band)
+                if bucket is not None:
+                    bucket.discard(slot)
+                    if not bucket:
+                        del table[band]
+            self._keys[slot] = None
+            self._free.append(slot)
+
+    def nearest(self, signature: np.ndarray, min_similarity: float) -> Optional[Tuple[K, float]]:
+        """Most similar key with estimated Jaccard similarity of at least `min_similarity`."""
+        matches = self.candidates(signature, min_similarity)
+        return matches[0] if matches else None
+
+    def candidates(self, signature: np.ndarray, min_similarity: float) -> List[Tuple[K, float]]:
+        """Keys with estimated Jaccard similarity of at least `min_similarity`, most similar first."""
+        with self._lock:
+            slots_seen: Set[int] = set()
+            for table, band in zip(self._tables, self._band_keys(signature)):
+                slots_seen.update(table.get(band, ()))
+            if not slots_seen:
+                return []
+            slots = np.fromiter(slots_seen, dtype=np.intp, count=len(slots_seen))
+            similarities = (self._signatures[slots] == signature).mean(axis=1)
+            keep = np.flatnonzero(similarities >= min_similarity)
+            ranked = keep[np.argsort(-similarities[keep], kind="stable")]
+            matches: List[Tuple[K, float]] = []
+            for i in ranked:
+                key = self._keys[int(slots[i])]
+                if key is not None:
+                    matches.append((key, float(similarities[i])))
+            return matches
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def _allocate(self) -> int:
+        slot = len(self._keys)
+        if slot == self._signatures.shape[0]:
+            grown = np.zeros((slot * 2, self.num_perm), dtype=np.uint32)
+            grown[:slot] = self._signatures
+            self._signatures = grown
+        self._keys.append(None)
+        return slot
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        rows = self._rows
+        return [signature[i : i + rows].tobytes() for i in range(0, self.num_perm, rows)]
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from threading import RLock
+from typing import Dict, Generic, List, Optional, Set, Tuple, TypeVar
+
+import numpy as np
+
+K = TypeVar("K")
+
+HASH_BITS = 64
+
+_LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def _grayscale(pixels: np.ndarray) -> np.ndarray:
+    if pixels.ndim == 2:
+        return pixels.astype(np.float32)
+    return pixels[..., :3].astype(np.float32) @ _LUMA
+
+
+def _block_mean(gray: np.ndarray, rows: int, cols: int) -> np.ndarray:
+    """Area-average `gray` down to `rows` x `cols` (box filter over near-equal bins)."""
+    row_edges = np.linspace(0, gray.shape[0], rows + 1).astype(int)[:-1]
+    col_edges = np.linspace(0, gray.shape[1], cols + 1).astype(int)[:-1]
+    sums = np.add.reduceat(np.add.reduceat(gray, row_edges, axis=0), col_edges, axis=1)
+    counts = np.outer(np.diff(np.append(row_edges, gray.shape[0])), np.diff(np.append(col_edges, gray.shape[1])))
+    return sums / counts
+
+
+def _pack(bits: np.ndarray) -> int:
+    return int.from_bytes(np.packbits(bits.astype(np.uint8).ravel()).tobytes(), "big")
+
+
+def dhash(pixels: np.ndarray) -> int:
+    """64-bit difference hash: sign of horizontal gradients on a 9x8 thumbnail."""
+    small = _block_mean(_grayscale(pixels), 8, 9)
+    return _pack(small[:, 1:] > small[:, :-1])
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    matrix = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+    matrix[0] /= np.sqrt(2.0)
+    return matrix
+
+
+_DCT32 = _dct_matrix(32)
+
+
+def phash(pixels: np.ndarray) -> int:
+    """64-bit DCT hash: low-frequency 8x8 coefficients of a 32x32 thumbnail vs their median."""
+    small = _block_mean(_grayscale(pixels), 32, 32)
+    low = (_DCT32 @ small @ _DCT32.T)[:8, :8]
+    return _pack(low > np.median(low.ravel()[1:]))
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class HammingIndex(Generic[K]):
+    """Near-neighbour lookup over 64-bit hashes within a fixed Hamming radius.
+
+    Pigeonhole banding: hashes are split into `max_distance + 1` bit bands, and
+    any two hashes within `max_distance` bits agree exactly on at least one
+    band. Lookups therefore only compare against keys sharing a band value
+    instead of scanning every entry.
+    """
+
+    def __init__(self, max_distance: int) -> None:
+        self.max_distance = max(0, min(max_distance, HASH_BITS - 1))
+        bands = self.max_distance + 1
+        edges = np.linspace(0, HASH_BITS, bands + 1).astype(int)
+        self._bands: List[Tuple[int, int]] = [
+            (int(lo), (1 << int(hi - lo)) - 1) for lo, hi in zip(edges[:-1], edges[1:])
+        ]
+        self._tables: List[Dict[int, Set[K]]] = [{} for _ in self._bands]
+        self._hashes: Dict[K, int] = {}
+        self._lock = RLock()
+
+    def add(self, key: K, value: int) -> None:
+        with self._lock:
+            self.remove(key)
+            self._hashes[key] = value
+            for table, band in zip(self._tables, self._band_values(value)):
+                table.setdefault(band, set()).add(key)
+
+    def remove(self, key: K) -> None:
+        with self._lock:
+            value = self._hashes.pop(key, None)
+            if value is None:
+                return
+            for table, band in zip(self._tables, self._band_values(value)):
+                bucket = table.get(band)
+                if bucket is not None:
+                    bucket.discard(key)
+                    if not bucket:
+                        del table[band]
+
+    def nearest(self, value: int) -> Optional[Tuple[K, int]]:
+        """Closest key within `max_distance`, with its distance."""
+        with self._lock:
+            candidates: Set[K] = set()
+            for table, band in zip(self._tables, self._band_values(value)):
+                candidates.update(table.get(band, ()))
+            best: Optional[Tuple[K, int]] = None
+            for key in candidates:
+                distance = hamming_distance(value, self._hashes[key])
+                if distance <= self.max_distance and (best is None or distance < best[1]):
+                    best = (key, distance)
+                    if distance == 0:
+                        break
+            return best
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def _band_values(self, value: int) -> List[int]:
+        return [(value >> shift) & mask for shift, mask in self._bands]
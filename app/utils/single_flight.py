@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Generic, TypeVar
+
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+@dataclass
+class _Call(Generic[V]):
+    task: "asyncio.Future[V]"
+    waiters: int = 0
+
+
+class SingleFlight(Generic[K, V]):
+    """Coalesce concurrent calls that share a key into one in-flight task.
+
+    Every caller for a key awaits the same task, so exceptions propagate to
+    all of them. A caller that is cancelled only detaches itself; the shared
+    task is cancelled once its last caller has gone.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[K, _Call[V]] = {}
+        self._executions = 0
+        self._coalesced = 0
+        self._abandoned = 0
+
+    async def do(self, key: K, fn: Callable[[], Awaitable[V]]) -> V:
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(task=asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _t, key=key, call=call: self._forget(key, call))
+            self._executions += 1
+        else:
+            self._coalesced += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Every caller disconnected; nobody is left to use the result.
+                self._forget(key, call)
+                call.task.cancel()
+                self._abandoned += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "executions": self._executions,
+            "coalesced": self._coalesced,
+            "abandoned": self._abandoned,
+            "in_flight": len(self._calls),
+        }
+
+    def _forget(self, key: K, call: _Call[V]) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import sys
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from threading import RLock
-from typing import Dict, Generic, Optional, Tuple, TypeVar
+from typing import Any, Callable, Dict, Generic, Optional, Set, TypeVar
 
 
 K = TypeVar("K")
@@ -14,36 +16,120 @@ V = TypeVar("V")
 class CacheItem(Generic[V]):
     value: V
     expires_at: float
+    size: int = 0
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate retained bytes of `value`, following containers and object attributes.
+
+    Shared and cyclic references are counted once. This is an estimate for
+    budgeting, not an exact accounting of the allocator.
+    """
+    seen: Set[int] = set()
+    stack = [value]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size = sys.getsizeof(obj, 64)
+        if isinstance(obj, (str, bytes, bytearray, int, float, bool, type(None))):
+            total += size
+            continue
+        nbytes = getattr(obj, "nbytes", None)
+        if isinstance(nbytes, int):
+            # NumPy arrays: getsizeof only covers the buffer when the array owns it.
+            total += max(size, nbytes)
+            continue
+        total += size
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        else:
+            attrs = getattr(obj, "__dict__", None)
+            if attrs is not None:
+                stack.append(attrs)
+    return total
 
 
 class TTLCache(Generic[K, V]):
     """A small in-memory TTL cache.
 
-    This is intentionally simple and keeps all state in-process.
+    All entries share one TTL, so insertion order is expiry order: entries are
+    kept in an `OrderedDict` (re-setting a key moves it to the end) and expiry
+    only ever inspects the oldest end. `set`, `get` and eviction are amortized
+    O(1). With `lru=True`, a second ordering tracks access recency and the
+    least recently used entry is evicted when `max_items` is exceeded;
+    otherwise the oldest entry goes first.
+
+    With `max_bytes`, each entry's size is estimated on `set` (by `sizeof`,
+    default `estimate_size`) and entries are evicted in the same order until
+    the total fits the budget. A single value larger than the budget is not
+    stored at all.
+
+    `version()` increases whenever the contents change (set, expiry or
+    eviction), so callers can cache anything derived from the contents.
     """
 
-    def __init__(self, ttl_seconds: float, max_items: int = 1000) -> None:
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_items: int = 1000,
+        lru: bool = False,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[V], int]] = None,
+    ) -> None:
         self._ttl_seconds = ttl_seconds
         self._max_items = max_items
-        self._data: Dict[K, CacheItem[V]] = {}
+        self._max_bytes = max_bytes
+        self._sizeof = sizeof or estimate_size
+        self._bytes = 0
+        self._rejected = 0
+        self._data: "OrderedDict[K, CacheItem[V]]" = OrderedDict()
+        self._recency: "Optional[OrderedDict[K, None]]" = OrderedDict() if lru else None
         self._lock = RLock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._version = 0
 
-    def set(self, key: K, value: V) -> None:
+    def set(self, key: K, value: V) -> bool:
+        """Store `value`; False if it alone exceeds `max_bytes` (any old value is removed)."""
         now = time.monotonic()
-        item = CacheItem(value=value, expires_at=now + self._ttl_seconds)
+        size = self._sizeof(value) if self._max_bytes is not None else 0
+        item = CacheItem(value=value, expires_at=now + self._ttl_seconds, size=size)
         with self._lock:
+            self._remove_locked(key)
+            if self._max_bytes is not None and size > self._max_bytes:
+                self._rejected += 1
+                return False
             self._data[key] = item
+            self._bytes += size
+            self._version += 1
+            if self._recency is not None:
+                self._recency[key] = None
             self._prune_locked(now)
+        return True
 
     def get(self, key: K) -> Optional[V]:
         now = time.monotonic()
         with self._lock:
             item = self._data.get(key)
             if item is None:
+                self._misses += 1
                 return None
             if item.expires_at <= now:
-                self._data.pop(key, None)
+                self._remove_locked(key)
+                self._expirations += 1
+                self._misses += 1
                 return None
+            if self._recency is not None:
+                self._recency.move_to_end(key)
+            self._hits += 1
             return item.value
 
     def items(self) -> Dict[K, V]:
@@ -52,17 +138,51 @@ class TTLCache(Generic[K, V]):
             self._prune_locked(now)
             return {k: v.value for k, v in self._data.items()}
 
+    def version(self) -> int:
+        now = time.monotonic()
+        with self._lock:
+            self._prune_locked(now)
+            return self._version
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._data),
+                "max_items": self._max_items,
+                "bytes": self._bytes,
+                "max_bytes": self._max_bytes,
+                "rejected": self._rejected,
+                "policy": "lru" if self._recency is not None else "fifo",
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": (self._hits / lookups) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
     def _prune_locked(self, now: float) -> None:
-        expired_keys = [k for k, v in self._data.items() if v.expires_at <= now]
-        for k in expired_keys:
-            self._data.pop(k, None)
-
-        if len(self._data) <= self._max_items:
-            return
-
-        sorted_items: list[Tuple[K, CacheItem[V]]] = sorted(
-            self._data.items(), key=lambda kv: kv[1].expires_at
-        )
-        to_remove = len(self._data) - self._max_items
-        for i in range(to_remove):
-            self._data.pop(sorted_items[i][0], None)
+        while self._data:
+            oldest, item = next(iter(self._data.items()))
+            if item.expires_at > now:
+                break
+            self._remove_locked(oldest)
+            self._expirations += 1
+
+        while len(self._data) > self._max_items or (
+            self._max_bytes is not None and self._bytes > self._max_bytes
+        ):
+            order = self._recency if self._recency is not None else self._data
+            self._remove_locked(next(iter(order)))
+            self._evictions += 1
+
+    def _remove_locked(self, key: K) -> None:
+        item = self._data.pop(key, None)
+        if item is not None:
+            self._bytes -= item.size
+            self._version += 1
+        if self._recency is not None:
+            self._recency.pop(key, None)
@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import AsyncIterator, BinaryIO, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from python_multipart import MultipartParser
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import parse_options_header
+
+
+@dataclass(frozen=True)
+class UploadTooLarge(Exception):
+    limit: int
+    field: str = ""
+
+
+@dataclass(frozen=True)
+class UnsupportedUploadType(Exception):
+    field: str
+
+
+class InvalidMultipart(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class FilePartLimits:
+    max_bytes: int
+    content_types: Sequence[str]
+
+
+class SpooledUpload:
+    """An uploaded part held in a size-capped spool.
+
+    Parts up to `memory_limit` bytes stay in memory; larger ones are written to
+    a temporary file as they arrive. Size and SHA-256 are computed on the way
+    in, so nothing downstream needs to re-read the payload to hash it.
+    `open()` returns an independent reader each time, which lets several
+    consumers stream the same part concurrently.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        content_type: str,
+        size: int,
+        sha256: str,
+        data: Optional[bytes] = None,
+        path: Optional[str] = None,
+    ) -> None:
+        self.filename = filename
+        self.content_type = content_type
+        self.size = size
+        self.sha256 = sha256
+        self._data = data
+        self._path = path
+
+    @property
+    def in_memory(self) -> bool:
+        return self._path is None
+
+    def open(self) -> BinaryIO:
+        if self._path is not None:
+            return open(self._path, "rb")
+        return io.BytesIO(self._data or b"")
+
+    async def read_bytes(self) -> bytes:
+        if self._path is None:
+            return self._data or b""
+        return await asyncio.to_thread(self._read_file)
+
+    def close(self) -> None:
+        path, self._path = self._path, None
+        self._data = None
+        if path is not None:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    def _read_file(self) -> bytes:
+        assert self._path is not None
+        with open(self._path, "rb") as fh:
+            return fh.read()
+
+
+class _SpoolWriter:
+    """Accumulates one part: running size cap, SHA-256, spill to disk above `memory_limit`.
+
+    `write` runs inside the parser callbacks and only touches memory; disk
+    I/O happens in `flush` and `finish`, on a worker thread.
+    """
+
+    def __init__(self, field: str, max_bytes: int, memory_limit: int) -> None:
+        self.field = field
+        self.max_bytes = max_bytes
+        self.memory_limit = memory_limit
+        self.size = 0
+        self._digest = hashlib.sha256()
+        self._buffer = bytearray()
+        self._spill: Optional[BinaryIO] = None
+
+    def write(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise UploadTooLarge(self.max_bytes, self.field)
+        self._digest.update(chunk)
+        self._buffer.extend(chunk)
+
+    async def flush(self) -> None:
+        """Move buffered bytes to the spill file once the part outgrows memory."""
+        if self._buffer and (self._spill is not None or len(self._buffer) > self.memory_limit):
+            await asyncio.to_thread(self._spill_buffer)
+
+    async def finish(self, filename: str, content_type: str) -> SpooledUpload:
+        path = None
+        await self.flush()
+        if self._spill is not None:
+            await asyncio.to_thread(self._spill.close)
+            path = self._spill.name
+            self._spill = None
+        return SpooledUpload(
+            filename=filename,
+            content_type=content_type,
+            size=self.size,
+            sha256=self._digest.hexdigest(),
+            data=None if path else bytes(self._buffer),
+            path=path,
+        )
+
+    def _spill_buffer(self) -> None:
+        if self._spill is None:
+            self._spill = tempfile.NamedTemporaryFile(prefix="agriai-upload-", delete=False)
+        self._spill.write(self._buffer)
+        self._buffer = bytearray()
+
+    def discard(self) -> None:
+        self._buffer = bytearray()
+        if self._spill is not None:
+            self._spill.close()
+            os.unlink(self._spill.name)
+            self._spill = None
+
+
+class _Part:
+    def __init__(self) -> None:
+        self.headers: Dict[bytes, bytes] = {}
+        self.header_field = bytearray()
+        self.header_value = bytearray()
+        self.name = ""
+        self.filename: Optional[str] = None
+        self.content_type = ""
+        self.field: Optional[bytearray] = None
+        self.file: Optional[_SpoolWriter] = None
+
+
+async def read_multipart(
+    content_type: str,
+    stream: AsyncIterator[bytes],
+    files: Mapping[str, FilePartLimits],
+    max_field_bytes: int,
+    memory_limit: int,
+) -> Tuple[Dict[str, str], Dict[str, SpooledUpload]]:
+    """Parse a multipart/form-data body straight from the request stream.
+
+    File parts named in `files` are checked against their allowed content
+    types as soon as their headers arrive and spooled with a running size cap
+    and incremental SHA-256, so an oversized or unsupported part is refused
+    before the rest of the body is read and each part is stored exactly once.
+    Other file parts are skipped; text fields are capped at `max_field_bytes`.
+    Returns (fields, files); on error every part spooled so far is closed.
+    """
+    mime, params = parse_options_header(content_type)
+    boundary = params.get(b"boundary")
+    if mime != b"multipart/form-data" or not boundary:
+        raise InvalidMultipart("Expected a multipart/form-data body with a boundary.")
+
+    fields: Dict[str, str] = {}
+    spooled: Dict[str, SpooledUpload] = {}
+    # File parts the parser finished during the current chunk, finalized after it
+    # since finishing may touch disk.
+    ended: List[_Part] = []
+    part = _Part()
+
+    def on_part_begin() -> None:
+        nonlocal part
+        part = _Part()
+
+    def on_header_field(data: bytes, start: int, end: int) -> None:
+        part.header_field.extend(data[start:end])
+
+    def on_header_value(data: bytes, start: int, end: int) -> None:
+        part.header_value.extend(data[start:end])
+
+    def on_header_end() -> None:
+        part.headers[bytes(part.header_field).lower()] = bytes(part.header_value)
+        part.header_field.clear()
+        part.header_value.clear()
+
+    def on_headers_finished() -> None:
+        _, disposition = parse_options_header(part.headers.get(b"content-disposition", b""))
+        part.name = disposition.get(b"name", b"").decode("utf-8", errors="replace")
+        filename = disposition.get(b"filename")
+        if filename is None:
+            part.field = bytearray()
+            return
+        part.filename = filename.decode("utf-8", errors="replace")
+        part.content_type = part.headers.get(b"content-type", b"").decode("latin-1").strip()
+        limits = files.get(part.name)
+        if limits is None:
+            return
+        if part.content_type and part.content_type not in limits.content_types:
+            raise UnsupportedUploadType(part.name)
+        part.file = _SpoolWriter(part.name, limits.max_bytes, memory_limit)
+
+    def on_part_data(data: bytes, start: int, end: int) -> None:
+        if part.file is not None:
+            part.file.write(data[start:end])
+        elif part.field is not None:
+            if len(part.field) + (end - start) > max_field_bytes:
+                raise UploadTooLarge(max_field_bytes, part.name)
+            part.field.extend(data[start:end])
+
+    def on_part_end() -> None:
+        if part.field is not None:
+            fields[part.name] = part.field.decode("utf-8", errors="replace")
+        elif part.file is not None:
+            ended.append(part)
+
+    async def finish_ended() -> None:
+        while ended:
+            # Stays in `ended` until finished, so an error meanwhile still discards it.
+            done = ended[0]
+            writer = done.file
+            assert writer is not None
+            # Browsers send an empty, unnamed part for a file input left blank.
+            if not done.filename and writer.size == 0:
+                writer.discard()
+            else:
+                previous = spooled.pop(done.name, None)
+                if previous is not None:
+                    previous.close()
+                spooled[done.name] = await writer.finish(
+                    filename=done.filename or done.name,
+                    content_type=done.content_type or "application/octet-stream",
+                )
+            done.file = None
+            ended.pop(0)
+
+    parser = MultipartParser(
+        boundary,
+        callbacks={
+            "on_part_begin": on_part_begin,
+            "on_header_field": on_header_field,
+            "on_header_value": on_header_value,
+            "on_header_end": on_header_end,
+            "on_headers_finished": on_headers_finished,
+            "on_part_data": on_part_data,
+            "on_part_end": on_part_end,
+        },
+    )
+    try:
+        async for chunk in stream:
+            if chunk:
+                parser.write(chunk)
+                await finish_ended()
+                if part.file is not None:
+                    await part.file.flush()
+        parser.finalize()
+        await finish_ended()
+        if part.file is not None:
+            # The body ended inside a file part.
+            raise InvalidMultipart("Multipart body is truncated.")
+    except MultipartParseError as exc:
+        _discard([part, *ended], spooled)
+        raise InvalidMultipart(str(exc)) from exc
+    except BaseException:
+        _discard([part, *ended], spooled)
+        raise
+    return fields, spooled
+
+
+def _discard(parts: List[_Part], spooled: Dict[str, SpooledUpload]) -> None:
+    for part in parts:
+        if part.file is not None:
+            part.file.discard()
+    for upload in spooled.values():
+        upload.close()
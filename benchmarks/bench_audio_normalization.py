@@ -0,0 +1,73 @@
+"""Upload size and processing time of audio normalization on representative clips.
+
+Synthesizes WhatsApp-style voice notes (stereo 44.1/48 kHz PCM WAV with
+leading and trailing room-noise silence) and runs them through the
+normalizer: decode, downmix, resample to 16 kHz, energy-VAD silence trim.
+
+    python -m benchmarks.bench_audio_normalization --repeat 5
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import time
+import wave
+
+import numpy as np
+
+from app.services.audio_preprocessing import audio_normalizer
+
+
+def synthetic_voice_note(rate: int, channels: int, lead_s: float, speech_s: float, tail_s: float, seed: int) -> bytes:
+    rng = np.random.default_rng(seed)
+    speech_t = np.arange(int(speech_s * rate)) / rate
+    # Syllable-rate amplitude envelope over a few formant-like tones.
+    envelope = np.clip(np.sin(2 * np.pi * 4 * speech_t), 0, None) ** 0.5
+    voiced = sum(np.sin(2 * np.pi * f * speech_t) for f in (180, 720, 1150, 2400)) / 4
+    speech = 0.5 * envelope * voiced
+
+    silence = lambda s: 0.002 * rng.standard_normal(int(s * rate))  # noqa: E731
+    mono = np.concatenate([silence(lead_s), speech + 0.002 * rng.standard_normal(speech.size), silence(tail_s)])
+    stereo = np.stack([mono, 0.9 * mono], axis=1)
+    pcm = (np.clip(stereo, -1, 1) * 32767).astype("<i2")
+
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(pcm[:, :channels].tobytes())
+    return buf.getvalue()
+
+
+CLIPS = [
+    ("48k stereo, 2s + 8s + 3s", dict(rate=48000, channels=2, lead_s=2.0, speech_s=8.0, tail_s=3.0)),
+    ("44.1k stereo, 1s + 20s + 4s", dict(rate=44100, channels=2, lead_s=1.0, speech_s=20.0, tail_s=4.0)),
+    ("48k stereo, 5s + 60s + 10s", dict(rate=48000, channels=2, lead_s=5.0, speech_s=60.0, tail_s=10.0)),
+    ("16k mono, 0.5s + 15s + 0.5s", dict(rate=16000, channels=1, lead_s=0.5, speech_s=15.0, tail_s=0.5)),
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'clip':32} {'in KB':>9} {'out KB':>9} {'ratio':>7} {'in s':>7} {'out s':>7} {'ms':>8}")
+    for i, (name, params) in enumerate(CLIPS):
+        raw = synthetic_voice_note(seed=i, **params)
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = audio_normalizer.normalize(io.BytesIO(raw))
+            timings.append(time.perf_counter() - start)
+        assert result is not None
+        out = result.to_wav_bytes()
+        print(
+            f"{name:32} {len(raw) / 1024:9.0f} {len(out) / 1024:9.0f} {len(raw) / len(out):6.1f}x "
+            f"{result.original_seconds:7.1f} {result.duration_seconds:7.1f} {1000 * min(timings):8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
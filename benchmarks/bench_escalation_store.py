@@ -0,0 +1,82 @@
+"""Write throughput and read latency of the SQLite escalation store as it grows.
+
+Escalations are written through the store's batched writer. At each checkpoint
+the queue is flushed and `get` (random id), `list_all` and the officer
+dashboard's summary page (50 pending cases, deep cursor) latencies are
+measured. Uses a temporary database unless `--db` is given.
+
+    python -m benchmarks.bench_escalation_store --rows 1000000 --checkpoints 10000 100000 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Callable, List
+
+
+def timed_ms(fn: Callable[[], object], repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--checkpoints", type=int, nargs="+", default=[1_000, 10_000, 100_000, 200_000])
+    parser.add_argument("--db", default=None)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.TemporaryDirectory()
+    os.environ["ESCALATION_STORE_BACKEND"] = "sqlite"
+    os.environ["ESCALATION_DB_PATH"] = args.db or os.path.join(tmpdir.name, "escalations.db")
+
+    from app.schemas.chat import ChatConfidence, ChatResponse
+    from app.services.escalation_store import EscalationFilter, SqliteEscalationStore, escalation_store
+
+    assert isinstance(escalation_store, SqliteEscalationStore)
+    response = ChatResponse(
+        response_text="Possible leaf blight; confirm with a local officer before spraying.",
+        confidence=ChatConfidence.LOW,
+        citations=[],
+        escalate=True,
+        reason="Low confidence",
+        audio_output_url="",
+    )
+    context = {
+        "inputs": {"text": "My tomato leaves have brown spots with yellow rings " * 4, "text_language": "en"},
+        "timestamp": "2026-01-01T00:00:00+00:00",
+    }
+
+    pending = EscalationFilter(verified=False)
+    print(f"{'rows':>9}  {'writes/s':>9}  {'get p50 ms':>10}  {'get p95 ms':>10}  {'list ms':>8}  {'page ms':>8}")
+    written = 0
+    for checkpoint in sorted(c for c in args.checkpoints if c <= args.rows):
+        start = time.perf_counter()
+        for i in range(written, checkpoint):
+            escalation_store.add(f"esc-{i}", context, response)
+        escalation_store.close()  # flush; the writer restarts on the next write
+        rate = (checkpoint - written) / (time.perf_counter() - start)
+        written = checkpoint
+
+        gets = timed_ms(lambda: escalation_store.get(f"esc-{random.randrange(written)}"), 500)
+        gets.sort()
+        lists = timed_ms(escalation_store.list_all, 5)
+        _, cursor = escalation_store.list_summaries(pending, limit=written // 2)
+        pages = timed_ms(lambda: escalation_store.list_summaries(pending, limit=50, cursor=cursor), 20)
+        print(
+            f"{written:>9}  {rate:>9.0f}  {statistics.median(gets):>10.3f}  "
+            f"{gets[int(len(gets) * 0.95)]:>10.3f}  {statistics.median(lists):>8.1f}  {statistics.median(pages):>8.2f}"
+        )
+    tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
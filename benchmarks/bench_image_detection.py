@@ -0,0 +1,128 @@
+"""Throughput and latency of the ONNX crop disease detector on CPU.
+
+Runs the real detector path (off-loop decoding, micro-batching, thread pool,
+NumPy preprocessing) with concurrent 12 MP requests. Without `--model`, a
+small test classifier (conv -> global pool -> dense -> softmax) is generated
+with the `onnx` package.
+Requires `onnxruntime` and `Pillow`.
+
+    python -m benchmarks.bench_image_detection --requests 256 --concurrency 32
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import io
+import os
+import statistics
+import tempfile
+import time
+from typing import List
+
+import numpy as np
+
+
+def build_test_model(path: str, input_size: int = 224, classes: int = 10) -> None:
+    import onnx
+    from onnx import TensorProto, helper, numpy_helper
+
+    rng = np.random.default_rng(0)
+    conv_w = rng.standard_normal((16, 3, 3, 3)).astype(np.float32) * 0.1
+    dense_w = rng.standard_normal((16, classes)).astype(np.float32) * 0.1
+    dense_b = np.zeros(classes, dtype=np.float32)
+    graph = helper.make_graph(
+        [
+            helper.make_node("Conv", ["input", "conv_w"], ["conv"], strides=[2, 2], pads=[1, 1, 1, 1]),
+            helper.make_node("Relu", ["conv"], ["relu"]),
+            helper.make_node("GlobalAveragePool", ["relu"], ["pool"]),
+            helper.make_node("Flatten", ["pool"], ["flat"]),
+            helper.make_node("Gemm", ["flat", "dense_w", "dense_b"], ["logits"]),
+            helper.make_node("Softmax", ["logits"], ["probs"], axis=1),
+        ],
+        "crop_disease_test",
+        [helper.make_tensor_value_info("input", TensorProto.FLOAT, ["batch", 3, input_size, input_size])],
+        [helper.make_tensor_value_info("probs", TensorProto.FLOAT, ["batch", classes])],
+        initializer=[
+            numpy_helper.from_array(conv_w, "conv_w"),
+            numpy_helper.from_array(dense_w, "dense_w"),
+            numpy_helper.from_array(dense_b, "dense_b"),
+        ],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    onnx.save(model, path)
+
+
+def synthetic_photo(seed: int, width: int = 4000, height: int = 3000) -> bytes:
+    from PIL import Image
+
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width]
+    base = np.stack([x / width, y / height, np.full_like(x, 0.5, dtype=float)], axis=-1)
+    noise = rng.random((height, width, 3)) * 0.2
+    pixels = (np.clip(base + noise, 0, 1) * 255).astype(np.uint8)
+    buf = io.BytesIO()
+    Image.fromarray(pixels).save(buf, format="JPEG", quality=85)
+    return buf.getvalue()
+
+
+def as_upload(data: bytes, filename: str):
+    from app.utils.uploads import SpooledUpload
+
+    return SpooledUpload(filename, "image/jpeg", len(data), hashlib.sha256(data).hexdigest(), data=data)
+
+
+async def run(requests: int, concurrency: int, images: List[bytes]) -> List[float]:
+    from app.services.image_detection import crop_disease_detector
+
+    await crop_disease_detector.start()
+    await crop_disease_detector.detect(as_upload(images[0], "warmup.jpg"))
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await crop_disease_detector.detect(as_upload(images[i % len(images)], f"{i}.jpg"))
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    print(f"batching: {crop_disease_detector.stats()['batching']}")
+    await crop_disease_detector.aclose()
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--requests", type=int, default=256)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.TemporaryDirectory()
+    model_path = args.model or os.path.join(tmpdir.name, "crop_disease_test.onnx")
+    if args.model is None:
+        build_test_model(model_path)
+
+    os.environ["DETECTOR_MODEL_PATH"] = model_path
+    os.environ["DETECTOR_BATCH_MAX_SIZE"] = str(args.batch_size)
+    os.environ["DETECTOR_WORKERS"] = str(args.workers)
+    images = [synthetic_photo(seed) for seed in range(8)]
+
+    start = time.perf_counter()
+    latencies = asyncio.run(run(args.requests, args.concurrency, images))
+    elapsed = time.perf_counter() - start
+
+    ordered = sorted(latencies)
+    p95 = ordered[max(0, int(0.95 * len(ordered)) - 1)]
+    print(f"requests={args.requests} concurrency={args.concurrency} batch_size={args.batch_size} workers={args.workers}")
+    print(f"throughput: {args.requests / elapsed:.1f} img/s")
+    print(f"latency: p50={statistics.median(latencies) * 1000:.1f} ms  p95={p95 * 1000:.1f} ms")
+    tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
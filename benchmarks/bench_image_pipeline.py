@@ -0,0 +1,108 @@
+"""Event-loop blocking and peak memory of image decoding, on-loop vs pipeline.
+
+`inline` materializes the upload as bytes and fully decodes and resizes it on
+the event loop, as a naive handler would. `pipeline` uses the off-loop image
+pipeline with draft-mode JPEG decoding. Each mode runs in a fresh process so
+peak RSS is comparable. Requires `Pillow`.
+
+    python -m benchmarks.bench_image_pipeline --images 16 --concurrency 4
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import multiprocessing
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+import numpy as np
+
+from benchmarks.bench_image_detection import as_upload, synthetic_photo
+
+SIZE = 224
+
+
+def inline_prepare(data: bytes) -> np.ndarray:
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as img:
+        rgb = img.convert("RGB")
+    return np.asarray(rgb.resize((SIZE, SIZE), Image.BILINEAR), dtype=np.uint8)
+
+
+async def measure(mode: str, photos: List[bytes], concurrency: int) -> Dict[str, float]:
+    from app.services.image_pipeline import image_pipeline
+
+    lags: List[float] = []
+    stop = asyncio.Event()
+
+    async def ticker() -> None:
+        loop = asyncio.get_running_loop()
+        while not stop.is_set():
+            expected = loop.time() + 0.005
+            await asyncio.sleep(0.005)
+            lags.append(max(0.0, loop.time() - expected))
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(data: bytes) -> None:
+        async with semaphore:
+            upload = as_upload(data, "photo.jpg")
+            if mode == "inline":
+                inline_prepare(await upload.read_bytes())
+            else:
+                await image_pipeline.prepare(upload, SIZE)
+            upload.close()
+
+    tick = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await asyncio.gather(*(one(data) for data in photos))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await tick
+    await image_pipeline.aclose()
+    return {"elapsed": elapsed, "max_lag": max(lags, default=0.0), "total_lag": sum(lags)}
+
+
+def peak_rss_kb() -> int:
+    # VmHWM resets on exec; ru_maxrss would inherit the parent's peak on Linux.
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_mode(mode: str, distinct: List[bytes], count: int, concurrency: int) -> Dict[str, float]:
+    photos = [distinct[i % len(distinct)] for i in range(count)]
+    baseline = peak_rss_kb()
+    result = asyncio.run(measure(mode, photos, concurrency))
+    result["peak_rss_growth_mb"] = (peak_rss_kb() - baseline) / 1024
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", type=int, default=16)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    distinct = [synthetic_photo(seed) for seed in range(2)]
+    for mode in ("inline", "pipeline"):
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            r = pool.submit(run_mode, mode, distinct, args.images, args.concurrency).result()
+        print(
+            f"{mode:>8}: {args.images / r['elapsed']:.1f} img/s  "
+            f"max loop stall {r['max_lag'] * 1000:.0f} ms  total stall {r['total_lag'] * 1000:.0f} ms  "
+            f"peak RSS +{r['peak_rss_growth_mb']:.0f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
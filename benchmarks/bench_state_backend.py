@@ -0,0 +1,97 @@
+"""Rate-limit counters and the answer cache across worker processes, per state backend.
+
+Starts `--workers` processes (as uvicorn `--workers` would), each with its own
+import of the app. Every worker counts `--hits` rate-limit hits on one shared
+key and writes `--keys` cache entries; after a barrier each worker looks up
+the entries written by the next worker. With `memory` every worker sees only
+its own counts and entries; with `sqlite` the final count is workers x hits
+and every cross-worker lookup hits.
+
+    python -m benchmarks.bench_state_backend --workers 4 --hits 5000
+"""
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+from typing import Any, Dict
+
+
+def worker(backend: str, path: str, index: int, workers: int, hits: int, keys: int, barrier: Any, results: Any) -> None:
+    os.environ["STATE_BACKEND"] = backend
+    os.environ["STATE_DB_PATH"] = path
+    from app.services.state_backend import state_backend
+
+    cache = state_backend.cache("bench", ttl_seconds=3600, max_items=keys * workers)
+    barrier.wait()
+
+    start = time.perf_counter()
+    count = 0
+    for _ in range(hits):
+        count = state_backend.incr("rate:bench", 3600)
+    incr_us = (time.perf_counter() - start) / hits * 1e6
+
+    start = time.perf_counter()
+    for i in range(keys):
+        cache.set(f"{index}:{i}", {"response_text": f"answer {i}", "confidence": "High"})
+    set_us = (time.perf_counter() - start) / keys * 1e6
+    barrier.wait()
+
+    neighbour = (index + 1) % workers
+    start = time.perf_counter()
+    found = sum(cache.get(f"{neighbour}:{i}") is not None for i in range(keys))
+    get_us = (time.perf_counter() - start) / keys * 1e6
+    barrier.wait()
+    # One more hit from a single worker reads the total without a separate API.
+    final = state_backend.incr("rate:bench", 3600) - 1 if index == 0 else 0
+
+    results.put({"count": count, "final": final, "found": found, "incr_us": incr_us, "set_us": set_us, "get_us": get_us})
+
+
+def run(backend: str, workers: int, hits: int, keys: int) -> Dict[str, float]:
+    ctx = multiprocessing.get_context("spawn")
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    with tempfile.TemporaryDirectory() as tmp:
+        procs = [
+            ctx.Process(
+                target=worker,
+                args=(backend, os.path.join(tmp, "state.db"), i, workers, hits, keys, barrier, results),
+            )
+            for i in range(workers)
+        ]
+        for proc in procs:
+            proc.start()
+        rows = [results.get() for _ in procs]
+        for proc in procs:
+            proc.join()
+    return {
+        "final": max(row["final"] for row in rows),
+        "found": sum(row["found"] for row in rows) / (keys * workers),
+        "incr_us": sum(row["incr_us"] for row in rows) / workers,
+        "set_us": sum(row["set_us"] for row in rows) / workers,
+        "get_us": sum(row["get_us"] for row in rows) / workers,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--hits", type=int, default=2000)
+    parser.add_argument("--keys", type=int, default=500)
+    args = parser.parse_args()
+
+    expected = args.workers * args.hits
+    print(f"{'backend':>8}  {'count':>8}  {'expected':>8}  {'shared hits':>11}  {'incr us':>8}  {'set us':>7}  {'get us':>7}")
+    for backend in ("memory", "sqlite"):
+        r = run(backend, args.workers, args.hits, args.keys)
+        print(
+            f"{backend:>8}  {r['final']:>8}  {expected:>8}  {r['found']:>10.0%}  "
+            f"{r['incr_us']:>8.1f}  {r['set_us']:>7.1f}  {r['get_us']:>7.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
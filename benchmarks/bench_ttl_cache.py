@@ -0,0 +1,97 @@
+"""Per-operation cost of TTLCache set/get as the cache grows to 100k entries.
+
+Compares the current OrderedDict-based cache (FIFO and LRU) with the previous
+implementation, which scanned every entry on each `set` and sorted the whole
+dict once over `max_items`. Each `set` runs against a full cache, so every
+insert also evicts.
+
+    python -m benchmarks.bench_ttl_cache --sizes 1000 10000 100000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from dataclasses import dataclass
+from threading import RLock
+from typing import Any, Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+
+from app.utils.ttl_cache import TTLCache
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+@dataclass(frozen=True)
+class _Item(Generic[V]):
+    value: V
+    expires_at: float
+
+
+class LegacyTTLCache(Generic[K, V]):
+    """The pre-rewrite implementation, kept here for comparison only."""
+
+    def __init__(self, ttl_seconds: float, max_items: int = 1000) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_items = max_items
+        self._data: Dict[K, _Item[V]] = {}
+        self._lock = RLock()
+
+    def set(self, key: K, value: V) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._data[key] = _Item(value=value, expires_at=now + self._ttl_seconds)
+            expired = [k for k, v in self._data.items() if v.expires_at <= now]
+            for k in expired:
+                self._data.pop(k, None)
+            if len(self._data) <= self._max_items:
+                return
+            ordered: List[Tuple[K, _Item[V]]] = sorted(self._data.items(), key=lambda kv: kv[1].expires_at)
+            for i in range(len(self._data) - self._max_items):
+                self._data.pop(ordered[i][0], None)
+
+    def get(self, key: K) -> Optional[V]:
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item.expires_at <= now:
+                return None
+            return item.value
+
+
+def per_op_us(fn: Callable[[int], Any], ops: int, offset: int) -> float:
+    start = time.perf_counter()
+    for i in range(ops):
+        fn(offset + i)
+    return (time.perf_counter() - start) / ops * 1e6
+
+
+def measure(factory: Callable[[int], Any], size: int, ops: int) -> Tuple[float, float]:
+    cache = factory(size)
+    for i in range(size):
+        cache.set(i, i)
+    set_us = per_op_us(lambda i: cache.set(i, i), ops, size)
+    get_us = per_op_us(lambda i: cache.get(i), ops, size)
+    return set_us, get_us
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--ops", type=int, default=20_000)
+    parser.add_argument("--legacy-ops", type=int, default=50, help="fewer ops: the legacy set is O(n log n)")
+    args = parser.parse_args()
+
+    variants: Dict[str, Tuple[Callable[[int], Any], int]] = {
+        "fifo": (lambda n: TTLCache(ttl_seconds=3600, max_items=n), args.ops),
+        "lru": (lambda n: TTLCache(ttl_seconds=3600, max_items=n, lru=True), args.ops),
+        "legacy": (lambda n: LegacyTTLCache(ttl_seconds=3600, max_items=n), args.legacy_ops),
+    }
+    print(f"{'entries':>8}  {'variant':>7}  {'set (us)':>10}  {'get (us)':>10}")
+    for size in args.sizes:
+        for name, (factory, ops) in variants.items():
+            set_us, get_us = measure(factory, size, ops)
+            print(f"{size:>8}  {name:>7}  {set_us:>10.2f}  {get_us:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Lookup latency and match quality of the verified-answer MinHash LSH index.
+
+Indexes `--entries` synthetic farmer questions (random words from an
+agricultural vocabulary), then times lookups of four kinds: exact repeats,
+restyled repeats (case, punctuation, spacing), indexed questions with one word
+swapped for another, and unrelated questions. A lookup matches as in
+`app/services/verified_answers.py`: estimated similarity at least
+`VERIFIED_ANSWERS_MIN_SIMILARITY` and the same content words. Reports p50/p99
+latency including signature computation and the fraction matched; only the
+first two kinds should match.
+
+    python -m benchmarks.bench_verified_answers --entries 100000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Callable, Dict, List
+
+from app.core.config import get_settings
+from app.services.verified_answers import _content_words
+from app.utils.minhash import MinHasher, MinHashLSHIndex
+
+VOCABULARY = (
+    "tomato wheat rice cotton maize chilli onion potato mustard sugarcane groundnut soybean brinjal okra "
+    "leaves leaf stem root fruit flower seed field plants crop nursery soil water rain drip canal "
+    "yellow brown black white spots curl wilting rot borer aphids whitefly thrips mites jassids fungus blight "
+    "spray apply dose urea dap potash neem compost manure pesticide fungicide sowing harvest irrigation "
+    "how what when which much many should can is are my the in on for per acre days week kg litre"
+).split()
+
+
+def question(rng: random.Random) -> str:
+    words = [rng.choice(VOCABULARY) for _ in range(rng.randint(8, 18))]
+    return " ".join(words).capitalize() + "?"
+
+
+def restyle(rng: random.Random, text: str) -> str:
+    """The same question typed differently: case, punctuation and spacing."""
+    words = text.rstrip("?").lower().split()
+    return "  ".join(words) + rng.choice(("", " ?", "??", "."))
+
+
+def swap_word(rng: random.Random, text: str) -> str:
+    """A different question sharing all but one word, e.g. another crop."""
+    words = text.split()
+    i = rng.randrange(len(words))
+    words[i] = rng.choice([word for word in VOCABULARY if word != words[i].lower().rstrip("?")])
+    return " ".join(words)
+
+
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=2_000)
+    args = parser.parse_args()
+
+    settings = get_settings()
+    rng = random.Random(7)
+    hasher = MinHasher(num_perm=settings.verified_answers_num_perm, shingle_size=settings.verified_answers_shingle_size)
+    index: MinHashLSHIndex[int] = MinHashLSHIndex(
+        num_perm=settings.verified_answers_num_perm, bands=settings.verified_answers_bands
+    )
+
+    questions = [question(rng) for _ in range(args.entries)]
+    contents = [_content_words(text) for text in questions]
+    start = time.perf_counter()
+    for i, text in enumerate(questions):
+        index.add(i, hasher.signature(text))
+    build = time.perf_counter() - start
+    print(f"indexed {args.entries} questions in {build:.1f} s ({build / args.entries * 1e6:.0f} us each)")
+
+    kinds: Dict[str, Callable[[], str]] = {
+        "exact": lambda: rng.choice(questions),
+        "restyle": lambda: restyle(rng, rng.choice(questions)),
+        "swap word": lambda: swap_word(rng, rng.choice(questions)),
+        "unrelated": lambda: question(rng),
+    }
+    threshold = settings.verified_answers_min_similarity
+    print(f"{'lookup':>10}  {'matched':>8}  {'p50 us':>7}  {'p99 us':>7}")
+    for name, make in kinds.items():
+        samples: List[float] = []
+        matched = 0
+        for _ in range(args.lookups):
+            text = make()
+            start = time.perf_counter()
+            content = _content_words(text)
+            found = any(contents[i] == content for i, _ in index.candidates(hasher.signature(text), threshold))
+            samples.append((time.perf_counter() - start) * 1e6)
+            matched += found
+        print(
+            f"{name:>10}  {matched / args.lookups:>8.1%}  "
+            f"{percentile(samples, 0.5):>7.0f}  {percentile(samples, 0.99):>7.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
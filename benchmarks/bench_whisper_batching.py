@@ -0,0 +1,71 @@
+"""Throughput of batched vs unbatched local Whisper transcription on CPU.
+
+Requires `openai-whisper` and `ffmpeg`. Uses synthetic speech-band audio, so
+transcripts are meaningless; besides timing, only whether batched and
+unbatched transcripts agree is of interest (both apply the same temperature
+fallback, so they should).
+
+    python -m benchmarks.bench_whisper_batching --model tiny --clips 16 --batch-size 8
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import time
+import wave
+
+import numpy as np
+
+from app.services import whisper_worker
+
+
+def synthetic_clip(seconds: float, seed: int) -> bytes:
+    rng = np.random.default_rng(seed)
+    sr = whisper_worker.SAMPLE_RATE
+    t = np.arange(int(seconds * sr)) / sr
+    freqs = rng.uniform(120, 400, size=3)
+    signal = sum(np.sin(2 * np.pi * f * t) for f in freqs) / 3
+    signal = signal * (0.5 + 0.5 * np.sin(2 * np.pi * 3 * t)) + 0.02 * rng.standard_normal(t.size)
+    pcm = (np.clip(signal, -1, 1) * 32767).astype(np.int16)
+
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sr)
+        w.writeframes(pcm.tobytes())
+    return buf.getvalue()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="tiny")
+    parser.add_argument("--clips", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--batch-size", type=int, default=8)
+    args = parser.parse_args()
+
+    clips = [synthetic_clip(args.seconds, seed) for seed in range(args.clips)]
+    whisper_worker.init_worker(args.model)
+    whisper_worker.transcribe(clips[0])  # warm-up
+
+    start = time.perf_counter()
+    single = [whisper_worker.transcribe(clip) for clip in clips]
+    unbatched = time.perf_counter() - start
+
+    start = time.perf_counter()
+    together = []
+    for i in range(0, len(clips), args.batch_size):
+        together.extend(whisper_worker.transcribe_batch(clips[i : i + args.batch_size]))
+    batched = time.perf_counter() - start
+    differ = sum(a["text"] != b["text"] for a, b in zip(single, together))
+
+    print(f"model={args.model} clips={args.clips} clip_seconds={args.seconds} batch_size={args.batch_size}")
+    print(f"unbatched: {unbatched:.2f}s total, {args.clips / unbatched:.2f} clips/s")
+    print(f"batched:   {batched:.2f}s total, {args.clips / batched:.2f} clips/s")
+    print(f"speedup:   {unbatched / batched:.2f}x")
+    print(f"transcripts differing between paths: {differ}/{args.clips}")
+
+
+if __name__ == "__main__":
+    main()
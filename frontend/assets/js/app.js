@@ -406,6 +406,11 @@ function initOfficerDashboardPage() {
   const infoEl = document.getElementById("officerDashboardInfo");
   const listEl = document.getElementById("escalationsList");
   const refreshBtn = document.getElementById("refreshEscalationsBtn");
+  const loadMoreEl = document.getElementById("loadMoreEscalations");
+  const loadMoreBtn = document.getElementById("loadMoreEscalationsBtn");
+
+  const PAGE_SIZE = 20;
+  let nextCursor = null;
 
   const pendingEl = document.getElementById("pendingEscalations");
   const resolvedEl = document.getElementById("resolvedEscalations");
@@ -419,7 +424,13 @@ function initOfficerDashboardPage() {
 
   function setPendingCount(next) {
     pendingCount = next;
-    if (pendingEl) pendingEl.textContent = String(pendingCount);
+    // With more pages on the server, the loaded count is a lower bound.
+    if (pendingEl) pendingEl.textContent = `${pendingCount}${nextCursor ? "+" : ""}`;
+  }
+
+  function setNextCursor(cursor) {
+    nextCursor = cursor || null;
+    if (loadMoreEl) setHidden(loadMoreEl, !nextCursor);
   }
 
   function setInfo(message) {
@@ -460,19 +471,36 @@ function initOfficerDashboardPage() {
   setInfo("");
   setResolvedCount(0);
 
-  function pickOriginalQuery(context) {
-    const inputs = context && typeof context === "object" ? context.inputs : null;
-    const text = inputs && typeof inputs.text === "string" ? inputs.text : "";
-    const transcript = inputs && typeof inputs.audio_transcript === "string" ? inputs.audio_transcript : "";
-    const imageName = inputs && typeof inputs.image_filename === "string" ? inputs.image_filename : "";
+  function pickOriginalQuery(summary) {
+    const preview = typeof summary.query_preview === "string" ? summary.query_preview : "";
+    const imageName = typeof summary.image_filename === "string" ? summary.image_filename : "";
 
     const parts = [];
-    if (text) parts.push({ label: "Text", value: text });
-    if (transcript) parts.push({ label: "Audio transcript", value: transcript });
+    if (preview) parts.push({ label: "Query", value: summary.query_truncated ? `${preview}…` : preview });
     if (imageName) parts.push({ label: "Image", value: imageName });
     return parts;
   }
 
+  function pickFullQuery(context) {
+    const inputs = context && typeof context === "object" ? context.inputs : null;
+    const text = inputs && typeof inputs.text === "string" ? inputs.text : "";
+    const transcript = inputs && typeof inputs.audio_transcript === "string" ? inputs.audio_transcript : "";
+    return text || transcript;
+  }
+
+  async function fetchEscalation(id) {
+    const { accessToken } = getTokenInfo();
+    const res = await fetch(`${API_BASE_URL}/api/v1/officer/escalations/${encodeURIComponent(id)}`, {
+      headers: {
+        Authorization: `Bearer ${accessToken}`,
+      },
+    });
+    if (!res.ok) {
+      throw new Error(await parseErrorMessage(res, "Failed to load the full case."));
+    }
+    return res.json();
+  }
+
   function el(tag, className, text) {
     const node = document.createElement(tag);
     if (className) node.className = className;
@@ -494,24 +522,42 @@ function initOfficerDashboardPage() {
 
     const queryBox = el("section", "case-box");
     queryBox.appendChild(el("div", "case-box__title", "Original farmer query"));
-    const queryParts = pickOriginalQuery(record.context);
+    const queryParts = pickOriginalQuery(record);
     if (queryParts.length === 0) {
       queryBox.appendChild(el("div", "muted", "No text/audio/image details available."));
     } else {
       queryParts.forEach((p) => {
         const row = el("div", "case-row");
         row.appendChild(el("div", "case-row__label", p.label));
-        row.appendChild(el("div", "case-row__value", p.value));
+        const value = el("div", "case-row__value", p.value);
+        row.appendChild(value);
         queryBox.appendChild(row);
+
+        if (p.label === "Query" && record.query_truncated) {
+          const moreBtn = el("button", "btn btn--ghost", "Show full query");
+          moreBtn.type = "button";
+          moreBtn.addEventListener("click", async () => {
+            moreBtn.disabled = true;
+            try {
+              const full = await fetchEscalation(record.id);
+              value.textContent = pickFullQuery(full.context) || p.value;
+              moreBtn.remove();
+            } catch (error) {
+              setDashError(error.message);
+              moreBtn.disabled = false;
+            }
+          });
+          queryBox.appendChild(moreBtn);
+        }
       });
     }
     grid.appendChild(queryBox);
 
     const aiBox = el("section", "case-box");
     aiBox.appendChild(el("div", "case-box__title", "AI response"));
-    const aiText = record.ai_response && record.ai_response.response_text ? record.ai_response.response_text : "";
+    const aiText = record.ai_response_text || "";
     aiBox.appendChild(el("div", "case-box__body", aiText));
-    const reason = record.ai_response && record.ai_response.reason ? record.ai_response.reason : "";
+    const reason = record.reason || "";
     if (reason) {
       const reasonRow = el("div", "case-row");
       reasonRow.appendChild(el("div", "case-row__label", "Escalation reason"));
@@ -586,6 +632,7 @@ function initOfficerDashboardPage() {
         .filter(Boolean);
 
       // Disable form and show loading state
+      card.dataset.submitting = "true";
       submitBtn.disabled = true;
       const prev = submitBtn.textContent;
       submitBtn.textContent = "Submitting…";
@@ -620,6 +667,7 @@ function initOfficerDashboardPage() {
           const msg = await parseErrorMessage(res, "Failed to submit officer response. Please try again.");
           setDashError(msg);
           // Re-enable form on error
+          delete card.dataset.submitting;
           submitBtn.disabled = false;
           submitBtn.textContent = prev;
           textarea.disabled = false;
@@ -648,6 +696,7 @@ function initOfficerDashboardPage() {
         console.error("Officer response error:", error);
         setDashError("Unable to connect to the server. Please check your internet connection and try again.");
         // Re-enable form on error
+        delete card.dataset.submitting;
         submitBtn.disabled = false;
         submitBtn.textContent = prev;
         textarea.disabled = false;
@@ -664,10 +713,13 @@ function initOfficerDashboardPage() {
     return card;
   }
 
-  async function loadEscalations() {
+  async function loadEscalations(append) {
     setDashError("");
     setInfo("");
-    clearList();
+    if (!append) {
+      clearList();
+      setNextCursor(null);
+    }
 
     if (isTokenExpired()) {
       redirectToLogin();
@@ -681,13 +733,14 @@ function initOfficerDashboardPage() {
     }
 
     // Show loading state
-    if (refreshBtn) {
-      refreshBtn.disabled = true;
-      refreshBtn.textContent = "Loading…";
+    const busyBtn = append ? loadMoreBtn : refreshBtn;
+    if (busyBtn) {
+      busyBtn.disabled = true;
+      busyBtn.textContent = "Loading…";
     }
-    
+
     // Show loading indicator in the list area
-    if (listEl) {
+    if (listEl && !append) {
       listEl.innerHTML = "";
       const loadingItem = el("div", "muted", "Loading escalations…");
       loadingItem.style.textAlign = "center";
@@ -695,8 +748,12 @@ function initOfficerDashboardPage() {
       listEl.appendChild(loadingItem);
     }
 
+    // Only pending cases are shown; pages are fetched on demand.
+    const params = new URLSearchParams({ verified: "false", limit: String(PAGE_SIZE) });
+    if (append && nextCursor) params.set("cursor", nextCursor);
+
     try {
-      const res = await fetch(`${API_BASE_URL}/api/v1/officer/escalations`, {
+      const res = await fetch(`${API_BASE_URL}/api/v1/officer/escalations/summary?${params}`, {
         headers: {
           Authorization: `Bearer ${accessToken}`,
         },
@@ -716,7 +773,7 @@ function initOfficerDashboardPage() {
       if (!res.ok) {
         const msg = await parseErrorMessage(res, "Failed to load escalations. Please try again.");
         setDashError(msg);
-        if (listEl) {
+        if (listEl && !append) {
           listEl.innerHTML = "";
           listEl.appendChild(el("div", "muted", "Failed to load escalations. Please try refreshing."));
         }
@@ -724,15 +781,15 @@ function initOfficerDashboardPage() {
       }
 
       const items = await res.json();
-      const list = Array.isArray(items) ? items : [];
-      const unresolved = list.filter((it) => !it.verified_response);
-      setPendingCount(unresolved.length);
+      const unresolved = Array.isArray(items) ? items : [];
+      setNextCursor(res.headers.get("X-Next-Cursor"));
+      setPendingCount((append ? pendingCount : 0) + unresolved.length);
 
       if (!listEl) return;
-      
-      listEl.innerHTML = "";
-      
-      if (unresolved.length === 0) {
+
+      if (!append) listEl.innerHTML = "";
+
+      if (pendingCount === 0) {
         listEl.appendChild(el("div", "muted", "No pending escalations. All cases have been resolved."));
         setInfo("All caught up! No pending escalations to review.");
         return;
@@ -741,29 +798,133 @@ function initOfficerDashboardPage() {
       unresolved.forEach((rec) => {
         listEl.appendChild(renderEscalationCard(rec));
       });
-      
-      if (unresolved.length === 1) {
-        setInfo(`Found 1 pending escalation to review.`);
+
+      const more = nextCursor ? " Load more to see older cases." : "";
+      if (pendingCount === 1) {
+        setInfo(`Found 1 pending escalation to review.${more}`);
       } else {
-        setInfo(`Found ${unresolved.length} pending escalations to review.`);
+        setInfo(`Found ${pendingCount} pending escalations to review.${more}`);
       }
     } catch (error) {
       console.error("Load escalations error:", error);
       setDashError("Unable to connect to the server. Please check your internet connection and try again.");
-      if (listEl) {
+      if (listEl && !append) {
         listEl.innerHTML = "";
         listEl.appendChild(el("div", "muted", "Unable to load escalations. Please check your connection and try again."));
       }
     } finally {
-      if (refreshBtn) {
-        refreshBtn.disabled = false;
-        refreshBtn.textContent = "Refresh";
+      if (busyBtn) {
+        busyBtn.disabled = false;
+        busyBtn.textContent = append ? "Load more" : "Refresh";
+      }
+    }
+  }
+
+  // Live updates: the stream is server-sent events, read through fetch because
+  // EventSource cannot send the Authorization header.
+  let lastEventId = null;
+  let retryMs = 3000;
+
+  function applyFeedEvent(type, summary) {
+    if (!listEl || !summary || !summary.id) return;
+    const existing = Array.from(listEl.querySelectorAll(".case-card")).find((card) => card.dataset.id === summary.id);
+
+    if (type === "escalation.created") {
+      if (existing || summary.verified) return;
+      if (pendingCount === 0) {
+        listEl.innerHTML = "";
+        setInfo("");
+      }
+      listEl.insertBefore(renderEscalationCard(summary), listEl.firstChild);
+      setPendingCount(pendingCount + 1);
+    } else if (type === "escalation.verified") {
+      // Cases resolved from this page update their own counters on submit.
+      if (!existing || existing.dataset.submitting) return;
+      existing.remove();
+      setResolvedCount(resolvedCount + 1);
+      setPendingCount(Math.max(0, pendingCount - 1));
+    }
+  }
+
+  function handleFeedBlock(block) {
+    let id = null;
+    let type = "message";
+    let data = "";
+    block.split("\n").forEach((line) => {
+      if (!line || line.startsWith(":")) return;
+      const sep = line.indexOf(":");
+      const field = sep === -1 ? line : line.slice(0, sep);
+      const value = sep === -1 ? "" : line.slice(sep + 1).replace(/^ /, "");
+      if (field === "id") id = value;
+      else if (field === "event") type = value;
+      else if (field === "data") data += value;
+      else if (field === "retry") retryMs = Number(value) || retryMs;
+    });
+
+    if (type === "reset") {
+      // Missed changes are no longer available on the server; reload the list.
+      lastEventId = null;
+      loadEscalations(false);
+      return;
+    }
+    if (id) lastEventId = id;
+    if (!data) return;
+    try {
+      applyFeedEvent(type, JSON.parse(data));
+    } catch (error) {
+      console.warn("Ignoring malformed escalation event:", error);
+    }
+  }
+
+  async function readFeed(body) {
+    const reader = body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = "";
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) return;
+      buffer += value.replace(/\r\n?/g, "\n");
+      let boundary;
+      while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+        handleFeedBlock(buffer.slice(0, boundary));
+        buffer = buffer.slice(boundary + 2);
+      }
+    }
+  }
+
+  async function streamEscalations() {
+    for (;;) {
+      if (isTokenExpired()) {
+        redirectToLogin();
+        return;
+      }
+      const { accessToken } = getTokenInfo();
+      if (!accessToken) {
+        redirectToLogin();
+        return;
+      }
+
+      const headers = { Authorization: `Bearer ${accessToken}` };
+      // Resume after the last seen event so a reconnect only receives what was missed.
+      if (lastEventId) headers["Last-Event-ID"] = lastEventId;
+      try {
+        const res = await fetch(`${API_BASE_URL}/api/v1/officer/escalations/stream`, { headers });
+        if (res.status === 401) {
+          redirectToLogin();
+          return;
+        }
+        if (res.status === 403) return;
+        if (res.ok && res.body) await readFeed(res.body);
+      } catch (error) {
+        console.warn("Escalation feed disconnected:", error);
       }
+      await new Promise((resolve) => setTimeout(resolve, retryMs));
     }
   }
 
-  if (refreshBtn) refreshBtn.addEventListener("click", loadEscalations);
-  loadEscalations();
+  if (refreshBtn) refreshBtn.addEventListener("click", () => loadEscalations(false));
+  if (loadMoreBtn) loadMoreBtn.addEventListener("click", () => loadEscalations(true));
+  streamEscalations();
+  loadEscalations(false);
 }
 
 function initLoginPage() {
@@ -0,0 +1,100 @@
+"""Multi-worker behaviour of the state backends.
+
+Workers are separate processes, each importing the app on its own, as uvicorn
+`--workers` would start them.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import sqlite3
+import time
+from typing import Any, Dict
+
+WORKERS = 3
+HITS = 200
+KEYS = 50
+
+
+def worker(backend: str, path: str, index: int, barrier: Any, results: Any) -> None:
+    os.environ["STATE_BACKEND"] = backend
+    os.environ["STATE_DB_PATH"] = path
+    from app.services.state_backend import state_backend
+
+    cache = state_backend.cache("test", ttl_seconds=3600, max_items=KEYS * WORKERS)
+    barrier.wait()
+    for _ in range(HITS):
+        state_backend.incr("rate:test", 3600)
+    for i in range(KEYS):
+        cache.set(f"{index}:{i}", {"response_text": f"answer {i}"})
+    barrier.wait()
+    neighbour = (index + 1) % WORKERS
+    found = sum(cache.get(f"{neighbour}:{i}") is not None for i in range(KEYS))
+    barrier.wait()
+    # One more hit from a single worker reads the total.
+    final = state_backend.incr("rate:test", 3600) - 1 if index == 0 else 0
+    results.put({"final": final, "found": found})
+
+
+def run(backend: str, tmp_path: Any) -> Dict[str, float]:
+    ctx = multiprocessing.get_context("spawn")
+    barrier = ctx.Barrier(WORKERS)
+    results = ctx.Queue()
+    path = str(tmp_path / "state.db")
+    procs = [ctx.Process(target=worker, args=(backend, path, i, barrier, results)) for i in range(WORKERS)]
+    for proc in procs:
+        proc.start()
+    rows = [results.get(timeout=60) for _ in procs]
+    for proc in procs:
+        proc.join()
+    return {
+        "final": max(row["final"] for row in rows),
+        "found": sum(row["found"] for row in rows) / (KEYS * WORKERS),
+    }
+
+
+def test_sqlite_backend_shares_counters_and_cache_across_workers(tmp_path) -> None:
+    result = run("sqlite", tmp_path)
+
+    assert result["final"] == WORKERS * HITS
+    assert result["found"] == 1.0
+
+
+def test_memory_backend_is_per_worker(tmp_path) -> None:
+    result = run("memory", tmp_path)
+
+    assert result["final"] == HITS
+    assert result["found"] == 0.0
+
+
+def test_sqlite_backend_fails_open_when_the_database_is_locked_or_unavailable(tmp_path, monkeypatch) -> None:
+    from app.services import state_backend as module
+
+    monkeypatch.setattr(module.settings, "state_db_busy_timeout_ms", 50)
+    backend = module.SqliteStateBackend(str(tmp_path / "state.db"))
+    cache = backend.cache("answers", ttl_seconds=60, max_items=10)
+    assert backend.incr("rate:test", 60) == 1
+
+    blocker = sqlite3.connect(str(tmp_path / "state.db"), isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+    try:
+        start = time.monotonic()
+        assert backend.incr("rate:test", 60) == 0
+        cache.set("question", {"response_text": "answer"})
+        assert time.monotonic() - start < 1.0
+    finally:
+        blocker.execute("ROLLBACK")
+        blocker.close()
+
+    assert backend.stats()["errors"] == 2
+    assert cache.get("question") is None
+    assert backend.incr("rate:test", 60) == 2
+
+    def unavailable() -> sqlite3.Connection:
+        raise sqlite3.OperationalError("unable to open database file")
+
+    # Metrics stay available while the database is not.
+    monkeypatch.setattr(backend, "connection", unavailable)
+    assert backend.stats()["counters"] is None
+    assert cache.stats()["entries"] is None
+    assert backend.stats()["errors"] == 5